@@ -6,10 +6,24 @@ import numpy as np
 import time
 import os
 import tempfile
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import sys
 import re
+import hashlib
+import itertools
+import shutil
+import json
+import sqlite3
+import zlib
+import argparse
+import collections
+import io
+import traceback
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager, redirect_stdout
+
+LINOLS_HOME = os.path.join(os.path.expanduser('~'), '.linols')
 
 
 class DifferencesDialog(tk.Toplevel):
@@ -39,21 +53,328 @@ class DifferencesDialog(tk.Toplevel):
 
     def on_double_click(self, event):
         item = self.treeview.selection()[0]
-        row_index = int(self.treeview.item(item, "text"))
-        col_index = 0
-        self.text_widget.mark_set("insert", f"{row_index}.{col_index}")
-        self.text_widget.see(f"{row_index}.{col_index}")
+        difference = self.differences[self.treeview.index(item)]
+        start_index, _ = self.text_widget.cell_index.cell_to_index(difference[2], difference[3])
+        self.text_widget.mark_set("insert", start_index)
+        self.text_widget.see(start_index)
         self.text_widget.focus_set()
         LinOLS.sync_2d_to_text()
 
 
 
+class VariantsDialog(tk.Toplevel):
+    def __init__(self, parent, comparison, text_widget):
+        super().__init__(parent)
+        self.title("Variant Differences")
+        self.parent = parent
+        self.geometry("900x500")
+        self.comparison = comparison
+        self.text_widget = text_widget
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        names = [os.path.basename(name) for name in self.comparison.names]
+
+        self.stats_treeview = ttk.Treeview(self, height=min(len(names), 8))
+        self.stats_treeview["columns"] = ("changed", "runs", "increased", "decreased", "max_delta", "mean_delta")
+        self.stats_treeview.heading("#0", text="Variant")
+        self.stats_treeview.heading("changed", text="Changed Values")
+        self.stats_treeview.heading("runs", text="Runs")
+        self.stats_treeview.heading("increased", text="Increased")
+        self.stats_treeview.heading("decreased", text="Decreased")
+        self.stats_treeview.heading("max_delta", text="Max |Delta|")
+        self.stats_treeview.heading("mean_delta", text="Mean Delta")
+        for index, name in enumerate(names):
+            stats = self.comparison.variant_stats[index]
+            self.stats_treeview.insert("", index, text=f"V{index + 1} {name}", values=(
+                stats['changed'], stats['runs'], stats['increased'], stats['decreased'], stats['max_delta'], f"{stats['mean_delta']:.1f}"))
+        self.stats_treeview.pack(fill=tk.X)
+
+        variant_columns = tuple(f"v{index + 1}" for index in range(len(names)))
+        self.treeview = ttk.Treeview(self)
+        self.treeview["columns"] = ("length", "variants", "max_delta") + variant_columns
+        self.treeview.heading("#0", text="Offset")
+        self.treeview.heading("length", text="Length")
+        self.treeview.heading("variants", text="Variants")
+        self.treeview.heading("max_delta", text="Max |Delta|")
+        self.treeview.column("#0", width=90)
+        self.treeview.column("length", width=60)
+        self.treeview.column("variants", width=120)
+        self.treeview.column("max_delta", width=80)
+        for index, column in enumerate(variant_columns):
+            self.treeview.heading(column, text=f"V{index + 1}")
+            self.treeview.column(column, width=60)
+
+        for run in range(len(self.comparison.run_offsets)):
+            mask = self.comparison.run_variants[:, run]
+            means = ["" if not changed else f"{mean:+.0f}" for changed, mean in zip(mask, self.comparison.run_mean[:, run])]
+            self.treeview.insert("", run, text=f"{self.comparison.run_offsets[run]:08X}", values=(
+                self.comparison.run_lengths[run],
+                ",".join(str(variant + 1) for variant in np.flatnonzero(mask)),
+                self.comparison.run_max[:, run].max(),
+                *means))
+
+        scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.treeview.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.treeview.config(yscrollcommand=scrollbar.set)
+        self.treeview.bind("<Double-1>", self.on_double_click)
+        self.treeview.pack(expand=True, fill=tk.BOTH)
+
+    def on_double_click(self, event):
+        item = self.treeview.selection()[0]
+        offset = int(self.comparison.run_offsets[self.treeview.index(item)])
+        start_index, _ = self.text_widget.cell_index.offset_to_index(offset)
+        self.text_widget.mark_set("insert", start_index)
+        self.text_widget.see(start_index)
+        self.text_widget.focus_set()
+        LinOLS.sync_2d_to_text()
+
+
+class DatalogColumnsDialog(tk.Toplevel):
+    def __init__(self, parent, columns):
+        super().__init__(parent)
+        self.title("Datalog Columns")
+        self.parent = parent
+        self.columns = columns
+        self.result = None
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.comboboxes = []
+        for row, label in enumerate(("X axis (columns)", "Y axis (rows)", "Value (optional)")):
+            tk.Label(self, text=label).grid(row=row, column=0, padx=5, pady=2, sticky=tk.W)
+            combobox = ttk.Combobox(self, values=([""] if row == 2 else []) + self.columns, state="readonly", width=30)
+            combobox.grid(row=row, column=1, padx=5, pady=2)
+            if row < len(self.columns):
+                combobox.current(row + (1 if row == 2 else 0))
+            self.comboboxes.append(combobox)
+
+        tk.Button(self, text="OK", command=self.on_ok).grid(row=3, column=0, columnspan=2, pady=5)
+
+    def on_ok(self):
+        names = [combobox.get() for combobox in self.comboboxes]
+        if not names[0] or not names[1]:
+            messagebox.showerror("Error", "Please select the X and Y axis columns.", parent=self)
+            return
+        self.result = [self.columns.index(name) if name else None for name in names]
+        self.destroy()
+
+
+class CatalogDialog(tk.Toplevel):
+    def __init__(self, parent, catalog, open_document):
+        super().__init__(parent)
+        self.title("Tune Catalog")
+        self.parent = parent
+        self.geometry("1000x450")
+        self.catalog = catalog
+        self.open_document = open_document
+        self.results = []
+
+        self.create_widgets()
+        self.search()
+
+    def create_widgets(self):
+        search_frame = tk.Frame(self)
+        search_frame.pack(fill=tk.X, padx=5, pady=5)
+        self.entries = {}
+        for column, (key, label) in enumerate((("vehicle", "Vehicle:"), ("modification", "Modification:"), ("digest", "Hash:"))):
+            tk.Label(search_frame, text=label).grid(row=0, column=column * 2, padx=5)
+            entry = tk.Entry(search_frame, width=20)
+            entry.grid(row=0, column=column * 2 + 1)
+            entry.bind('<Return>', lambda event: self.search())
+            self.entries[key] = entry
+        tk.Button(search_frame, text="Search", command=self.search).grid(row=0, column=6, padx=5)
+        self.status_label = tk.Label(search_frame, text="")
+        self.status_label.grid(row=0, column=7, padx=5)
+
+        self.treeview = ttk.Treeview(self)
+        self.treeview["columns"] = ("manufacturer", "model", "modification", "size", "copies", "saved", "path")
+        self.treeview.heading("#0", text="Hash")
+        self.treeview.heading("manufacturer", text="Manufacturer")
+        self.treeview.heading("model", text="Model")
+        self.treeview.heading("modification", text="Modification")
+        self.treeview.heading("size", text="Size")
+        self.treeview.heading("copies", text="Copies")
+        self.treeview.heading("saved", text="Saved")
+        self.treeview.heading("path", text="Path")
+        self.treeview.column("#0", width=110)
+        for column, width in (("manufacturer", 100), ("model", 100), ("modification", 110), ("size", 70), ("copies", 50), ("saved", 120), ("path", 300)):
+            self.treeview.column(column, width=width)
+
+        scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.treeview.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.treeview.config(yscrollcommand=scrollbar.set)
+        self.treeview.bind("<Double-1>", self.on_double_click)
+        self.treeview.pack(expand=True, fill=tk.BOTH)
+
+    def search(self):
+        start_time = time.perf_counter()
+        self.results = self.catalog.search(**{key: entry.get().strip() for key, entry in self.entries.items()})
+        elapsed = (time.perf_counter() - start_time) * 1000
+
+        self.treeview.delete(*self.treeview.get_children())
+        for index, result in enumerate(self.results):
+            self.treeview.insert("", index, text=result['digest'][:12], values=(
+                result['manufacturer'] or "", result['model'] or "", result['modification'] or "", result['size'], len(result['paths']),
+                time.strftime("%Y-%m-%d %H:%M", time.localtime(result['saved_at'])), result['paths'][0]))
+        self.status_label.config(text=f"{len(self.results)} images ({elapsed:.1f} ms)")
+
+    def on_double_click(self, event):
+        item = self.treeview.selection()[0]
+        paths = [path for path in self.results[self.treeview.index(item)]['paths'] if os.path.exists(path)]
+        if not paths:
+            messagebox.showerror("Error", "No copy of this image exists on disk anymore.", parent=self)
+            return
+        self.open_document(paths[0])
+
+
+class LayoutDialog(tk.Toplevel):
+    def __init__(self, parent, candidates, apply_layout):
+        super().__init__(parent)
+        self.title("Layout Suggestions")
+        self.parent = parent
+        self.geometry("520x220")
+        self.candidates = candidates
+        self.apply_layout = apply_layout
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.treeview = ttk.Treeview(self)
+        self.treeview["columns"] = ("columns", "stride", "correlation", "roughness")
+        self.treeview.heading("#0", text="Display Mode")
+        self.treeview.heading("columns", text="Columns")
+        self.treeview.heading("stride", text="Row Stride (values)")
+        self.treeview.heading("correlation", text="Correlation")
+        self.treeview.heading("roughness", text="Roughness")
+        for index, candidate in enumerate(self.candidates):
+            self.treeview.insert("", index, text=candidate['mode'], values=(
+                candidate['columns'], candidate['stride'], f"{candidate['correlation']:.2f}", f"{candidate['roughness']:.3f}"))
+
+        self.treeview.bind("<Double-1>", self.on_double_click)
+        self.treeview.pack(expand=True, fill=tk.BOTH)
+        tk.Label(self, text="Double-click a suggestion to apply it.").pack()
+
+    def on_double_click(self, event):
+        item = self.treeview.selection()[0]
+        candidate = self.candidates[self.treeview.index(item)]
+        self.apply_layout(candidate['mode'], candidate['columns'])
+
+
+class UnitsDialog(tk.Toplevel):
+    def __init__(self, parent, conversions, apply_conversions):
+        super().__init__(parent)
+        self.title("Physical Units")
+        self.parent = parent
+        self.conversions = conversions
+        self.apply_conversions = apply_conversions
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.entries = {}
+        for row, (kind, label) in enumerate((('map', "Map values:"), ('x', "X axis:"), ('y', "Y axis:"))):
+            tk.Label(self, text=label).grid(row=row, column=0, padx=5, pady=2, sticky=tk.W)
+            entry = tk.Entry(self, width=40)
+            entry.grid(row=row, column=1, padx=5, pady=2)
+            if self.conversions[kind] is not None:
+                entry.insert(0, self.conversions[kind].spec)
+            self.entries[kind] = entry
+        tk.Label(self, text="e.g. raw*0.75-48 [°C], raw/100 [bar], rational:a,b,c,d, table:0=0.5;1000=1.2", fg="gray").grid(
+            row=3, column=0, columnspan=2, padx=5, sticky=tk.W)
+        tk.Button(self, text="Apply", command=self.on_apply).grid(row=4, column=1, pady=5, sticky=tk.E)
+
+    def on_apply(self):
+        if self.apply_conversions({kind: entry.get() for kind, entry in self.entries.items()}):
+            self.destroy()
+
+
+class MirrorsDialog(tk.Toplevel):
+    def __init__(self, parent, groups, data, jump_to_offset):
+        super().__init__(parent)
+        self.title("Mirrored Maps")
+        self.parent = parent
+        self.geometry("560x260")
+        self.groups = groups
+        self.data = data
+        self.jump_to_offset = jump_to_offset
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.treeview = ttk.Treeview(self)
+        self.treeview["columns"] = ("length", "copies", "status")
+        self.treeview.heading("#0", text="Offsets")
+        self.treeview.heading("length", text="Length")
+        self.treeview.heading("copies", text="Copies")
+        self.treeview.heading("status", text="Status")
+        self.treeview.column("#0", width=260)
+        for index, (offsets, length) in enumerate(self.groups):
+            first = self.data[offsets[0]:offsets[0] + length]
+            differing = max(int(np.count_nonzero(self.data[offset:offset + length] != first)) for offset in offsets)
+            self.treeview.insert("", index, text=", ".join(f"0x{offset:X}" for offset in offsets), values=(
+                length, len(offsets), "identical" if not differing else f"{differing} bytes differ"))
+
+        self.treeview.bind("<Double-1>", self.on_double_click)
+        self.treeview.pack(expand=True, fill=tk.BOTH)
+        tk.Label(self, text="Double-click a group to jump to its first copy.").pack()
+
+    def on_double_click(self, event):
+        item = self.treeview.selection()[0]
+        offsets, length = self.groups[self.treeview.index(item)]
+        self.jump_to_offset(offsets[0])
+
+
+class ScriptConsole(tk.Toplevel):
+    def __init__(self, parent, run_script):
+        super().__init__(parent)
+        self.title("Script Console")
+        self.geometry("700x500")
+        self.run_script = run_script
+
+        self.create_widgets()
+
+    def create_widgets(self):
+        self.input_text = tk.Text(self, height=14, bg="#333333", fg="white", insertbackground="white", font=("Inconsolata", 10), undo=True)
+        self.input_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.input_text.bind('<Control-Return>', lambda event: self.run() or "break")
+
+        buttons_frame = tk.Frame(self)
+        buttons_frame.pack(fill=tk.X, padx=5)
+        tk.Button(buttons_frame, text="Run (Ctrl+Enter)", command=self.run, bg="#444", fg="white").pack(side=tk.LEFT)
+        tk.Button(buttons_frame, text="Open Script", command=self.open_script, bg="#444", fg="white").pack(side=tk.LEFT, padx=5)
+        tk.Button(buttons_frame, text="Clear Output", command=lambda: self.output_text.delete(1.0, tk.END), bg="#444", fg="white").pack(side=tk.LEFT)
+
+        self.output_text = tk.Text(self, height=10, bg="#222222", fg="white", font=("Inconsolata", 10))
+        self.output_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.output_text.insert(tk.END, "Names: np, original, u8, u16le, u16be, maps, define_map, selection, journal\n")
+
+    def run(self, source=None, filename='<console>'):
+        if source is None:
+            source = self.input_text.get(1.0, 'end-1c')
+        self.output_text.insert(tk.END, self.run_script(source, filename))
+        self.output_text.see(tk.END)
+
+    def open_script(self):
+        file_path = filedialog.askopenfilename(parent=self, filetypes=[("Python Scripts", "*.py"), ("All Files", "**")])
+        if file_path:
+            with open(file_path, 'r') as script_file:
+                source = script_file.read()
+            self.input_text.delete(1.0, tk.END)
+            self.input_text.insert(tk.END, source)
+            self.run(source, file_path)
+
+
 class HighlightText(tk.Text):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.original_values = {}
+        self.cell_index = CellIndex()
         self.tag_configure("changed_red", foreground="#ed7d80")
         self.tag_configure("changed_blue", foreground="#65a1e6")
+        self.tag_configure("highlight", background="gold2")
+        self.tag_configure("invalid", background="#6b2a2a")
         self.bind("<Key>", self.validate_input)
         self.bind("<FocusOut>", self.focus_out_handler)
 
@@ -82,12 +403,8 @@ class HighlightText(tk.Text):
             return
         self.master.focus_set()
 
-    def set_original_values(self, row_index, values):
-        self.original_values[row_index] = values
-
     def highlight_changed_value(self, row_index, col_index, current_value, original_value):
-        start_index = f"{row_index + 1}.{col_index * 6}"
-        end_index = f"{row_index + 1}.{col_index * 6 + 5}"
+        start_index, end_index = self.cell_index.cell_to_index(row_index, col_index)
 
         if original_value < current_value:
             self.tag_add("changed_red", start_index, end_index)
@@ -99,23 +416,2313 @@ class HighlightText(tk.Text):
             self.tag_remove("changed_red", start_index, end_index)
             self.tag_remove("changed_blue", start_index, end_index)
 
-    def batch_highlight_changed_values(self, changes):
-        if not self.original_values:
+
+class StripCanvas(tk.Canvas):
+    def __init__(self, master, on_jump, width=24, **kwargs):
+        super().__init__(master, width=width, bg="#333333", bd=0, highlightthickness=0, **kwargs)
+        self.on_jump = on_jump
+        self.length = 0
+        self.itemsize = 1
+        self.blocks = 0
+        self.photo = tk.PhotoImage(width=1, height=1)
+        self.photo_item = self.create_image(0, 0, image=self.photo, anchor=tk.NW)
+        self.marker = self.create_line(0, 0, 0, 0, fill="gold2")
+
+        self.bind("<Configure>", lambda event: self.refresh())
+        self.bind("<Button-1>", self.on_click)
+        self.bind("<B1-Motion>", self.on_click)
+
+    def refresh(self):
+        pass
+
+    def clear(self):
+        self.length = 0
+        self.blocks = 0
+        self.photo = tk.PhotoImage(width=1, height=1)
+        self.itemconfig(self.photo_item, image=self.photo)
+        self.coords(self.marker, 0, 0, 0, 0)
+
+    def block_of(self, element):
+        return ((element + 1) * self.blocks - 1) // max(self.length, 1)
+
+    def element_of(self, block):
+        return block * self.length // max(self.blocks, 1)
+
+    def draw(self, colors):
+        width = self.winfo_width()
+        pixels = np.repeat(colors[:, np.newaxis, :], width, axis=1)
+        self.photo = tk.PhotoImage(data=f"P6 {width} {len(colors)} 255 ".encode() + pixels.tobytes(), format='PPM')
+        self.itemconfig(self.photo_item, image=self.photo)
+
+    def put_block(self, block, color):
+        self.photo.put("#%02x%02x%02x" % tuple(color), to=(0, block, self.winfo_width(), block + 1))
+
+    def show_cursor(self, offset):
+        if not self.blocks:
+            return
+        y = self.block_of(offset // self.itemsize)
+        self.coords(self.marker, 0, y, self.winfo_width(), y)
+        self.tag_raise(self.marker)
+
+    def on_click(self, event):
+        if not self.blocks:
+            return
+        y = min(max(event.y, 0), self.blocks - 1)
+        self.on_jump(self.element_of(y) * self.itemsize)
+
+
+class DifferenceMinimap(StripCanvas):
+    COLORS = np.array([[0x44, 0x44, 0x44], [0xed, 0x7d, 0x80], [0x65, 0xa1, 0xe6], [0xb4, 0x8e, 0xe0]], dtype=np.uint8)
+
+    def __init__(self, master, on_jump, width=24, **kwargs):
+        super().__init__(master, on_jump, width=width, **kwargs)
+        self.current = None
+        self.reference = None
+        self.states = np.zeros(0, dtype=np.uint8)
+
+    def show(self, current, reference):
+        self.current = current
+        self.reference = reference
+        self.length = len(current)
+        self.itemsize = current.dtype.itemsize
+        self.refresh()
+
+    def compute_states(self, first_block, last_block):
+        start = self.element_of(first_block)
+        end = self.element_of(last_block + 1)
+        common_end = min(end, len(self.reference))
+
+        current = self.current[start:common_end]
+        reference = self.reference[start:common_end]
+        changed = np.flatnonzero(current != reference)
+        block_ids = ((changed + start + 1) * self.blocks - 1) // self.length - first_block
+        increased = current[changed] > reference[changed]
+
+        count = last_block - first_block + 1
+        states = (np.bincount(block_ids[increased], minlength=count) > 0).astype(np.uint8)
+        states |= (np.bincount(block_ids[~increased], minlength=count) > 0).astype(np.uint8) << 1
+        return states
+
+    def refresh(self):
+        height = self.winfo_height()
+        if self.current is None or not self.length or height < 2:
+            return
+
+        self.blocks = height
+        self.states = self.compute_states(0, self.blocks - 1)
+        self.draw(self.COLORS[self.states])
+
+    def update_range(self, offset, length):
+        if self.current is None or not self.blocks:
+            return
+
+        first_block = self.block_of(offset // self.itemsize)
+        last_block = min(self.block_of((offset + length - 1) // self.itemsize), self.blocks - 1)
+        states = self.compute_states(first_block, last_block)
+        for block in np.flatnonzero(states != self.states[first_block:last_block + 1]).tolist():
+            self.put_block(first_block + block, self.COLORS[states[block]])
+        self.states[first_block:last_block + 1] = states
+
+
+class OverviewStrip(StripCanvas):
+    COLORS = np.array([[0x2a, 0x2a, 0x2a], [0x8a, 0x6a, 0xc8], [0x4c, 0xc2, 0x7a]], dtype=np.float64)
+
+    def __init__(self, master, on_jump, width=16, **kwargs):
+        super().__init__(master, on_jump, width=width, **kwargs)
+        self.overview = None
+
+    def show(self, overview):
+        self.overview = overview
+        self.length = overview.length
+        self.refresh()
+
+    def refresh(self):
+        height = self.winfo_height()
+        if self.overview is None or not self.length or height < 2:
+            return
+
+        self.blocks = height
+        block_ids = np.minimum(self.element_of(np.arange(height)) // self.overview.block_size, len(self.overview.classes) - 1)
+        brightness = 0.35 + 0.65 * self.overview.entropy[block_ids, np.newaxis] / 8
+        self.draw((self.COLORS[self.overview.classes[block_ids]] * brightness).astype(np.uint8))
+
+
+class HeatmapCanvas(tk.Canvas):
+    VALUE_STOPS = np.array([[0x44, 0x01, 0x54], [0x3b, 0x52, 0x8b], [0x21, 0x91, 0x8c], [0x5e, 0xc9, 0x62], [0xfd, 0xe7, 0x25]], dtype=np.float64)
+    DELTA_STOPS = np.array([[0x21, 0x66, 0xac], [0xf7, 0xf7, 0xf7], [0xb2, 0x18, 0x2b]], dtype=np.float64)
+
+    def __init__(self, master, on_cell, width=400, height=400, **kwargs):
+        super().__init__(master, width=width, height=height, bg="#333333", bd=0, highlightthickness=0, **kwargs)
+        self.on_cell = on_cell
+        self.value_lut = self.lookup_table(self.VALUE_STOPS)
+        self.delta_lut = self.lookup_table(self.DELTA_STOPS)
+        self.mode = 'value'
+        self.values = None
+        self.original = None
+        self.cell_size = (1, 1)
+        self.photo = tk.PhotoImage(width=1, height=1)
+        self.photo_item = self.create_image(0, 0, image=self.photo, anchor=tk.NW)
+
+        self.bind("<Configure>", lambda event: self.refresh())
+        self.bind("<Button-1>", self.on_click)
+
+    @staticmethod
+    def lookup_table(stops):
+        positions = np.linspace(0, 255, len(stops))
+        return np.stack([np.interp(np.arange(256), positions, stops[:, channel]) for channel in range(3)], axis=1).astype(np.uint8)
+
+    def show(self, values, original):
+        self.values = values
+        self.original = original
+        self.refresh()
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.refresh()
+
+    def colors(self):
+        if self.mode == 'delta':
+            delta = self.values - self.original
+            scale = np.abs(delta).max() or 1
+            return self.delta_lut[np.rint(127.5 + 127.5 * delta / scale).astype(np.intp)]
+
+        low, high = self.values.min(), self.values.max()
+        return self.value_lut[np.rint(255 * (self.values - low) / ((high - low) or 1)).astype(np.intp)]
+
+    def refresh(self):
+        width, height = self.winfo_width(), self.winfo_height()
+        if self.values is None or not self.values.size or width < 2 or height < 2:
             return
 
-        for current_value, original_value, row_index, col_index in changes:
-            self.highlight_changed_value(row_index, col_index, current_value, original_value)
+        rows, columns = self.values.shape
+        self.cell_size = (max(height // rows, 1), max(width // columns, 1))
+        pixels = np.repeat(np.repeat(self.colors(), self.cell_size[0], axis=0), self.cell_size[1], axis=1)
+        self.photo = tk.PhotoImage(data=f"P6 {pixels.shape[1]} {pixels.shape[0]} 255 ".encode() + pixels.tobytes(), format='PPM')
+        self.itemconfig(self.photo_item, image=self.photo)
+
+    def on_click(self, event):
+        if self.values is None:
+            return
+        i, j = event.y // self.cell_size[0], event.x // self.cell_size[1]
+        if i < self.values.shape[0] and j < self.values.shape[1]:
+            self.on_cell(i, j)
+
+
+class ImageBuffer:
+    PAGE_SIZE = 4096
+    BACKUP_COUNT = 3
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.data = np.fromfile(file_path, dtype=np.uint8)
+        self.original = self.data.copy()
+        self.undo_stack = []
+        self.redo_stack = []
+        self.pending = []
+        self.transaction_depth = 0
+        self.listeners = []
+        self.write_hooks = []
+        self.dirty_pages = set()
+        self.version = 0
+
+    def __len__(self):
+        return len(self.data)
+
+    def read(self, offset, count, dtype='u1', original=False):
+        source = self.original if original else self.data
+        itemsize = np.dtype(dtype).itemsize
+        end = min(len(source), offset + count * itemsize)
+        end -= (end - offset) % itemsize
+        return source[offset:max(offset, end)].view(dtype)
+
+    def write(self, offset, values, dtype='u1'):
+        itemsize = np.dtype(dtype).itemsize
+        values = np.asarray(values)[:max(0, (len(self.data) - offset) // itemsize)]
+        new = values.astype(dtype).view(np.uint8)
+        old = self.data[offset:offset + len(new)].copy()
+        if np.array_equal(old, new):
+            return
+        self.data[offset:offset + len(new)] = new
+        with self.transaction():
+            self.pending.append((offset, old, new.copy()))
+            for hook in self.write_hooks:
+                hook(offset, new)
+
+    @contextmanager
+    def transaction(self):
+        self.transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0 and self.pending:
+                entries, self.pending = self.pending, []
+                self.undo_stack.append(entries)
+                self.redo_stack.clear()
+                self.notify(entries)
+
+    def undo(self):
+        if not self.undo_stack:
+            return False
+        entries = self.undo_stack.pop()
+        for offset, old, new in reversed(entries):
+            self.data[offset:offset + len(old)] = old
+        self.redo_stack.append(entries)
+        self.notify(entries)
+        return True
+
+    def redo(self):
+        if not self.redo_stack:
+            return False
+        entries = self.redo_stack.pop()
+        for offset, old, new in entries:
+            self.data[offset:offset + len(new)] = new
+        self.undo_stack.append(entries)
+        self.notify(entries)
+        return True
+
+    def notify(self, entries):
+        for offset, old, new in entries:
+            self.dirty_pages.update(range(offset // self.PAGE_SIZE, (offset + len(new) - 1) // self.PAGE_SIZE + 1))
+        self.version += 1
+        spans = sorted((offset, offset + len(new)) for offset, old, new in entries)
+        runs = [list(spans[0])]
+        for start, end in spans[1:]:
+            if start <= runs[-1][1] + self.PAGE_SIZE:
+                runs[-1][1] = max(runs[-1][1], end)
+            else:
+                runs.append([start, end])
+        for start, end in runs:
+            for listener in self.listeners:
+                listener(start, end - start)
+
+    def dirty_runs(self):
+        pages = np.array(sorted(self.dirty_pages), dtype=np.int64)
+        if not len(pages):
+            return []
+        breaks = np.flatnonzero(np.diff(pages) != 1) + 1
+        return [(int(run[0]) * self.PAGE_SIZE, min((int(run[-1]) + 1) * self.PAGE_SIZE, len(self.data)))
+                for run in np.split(pages, breaks)]
+
+    def save(self, file_path=None, atomic=False, backups=BACKUP_COUNT):
+        file_path = file_path or self.file_path
+        in_place = (not atomic and os.path.abspath(file_path) == os.path.abspath(self.file_path)
+                    and os.path.exists(file_path) and os.path.getsize(file_path) == len(self.data))
+
+        if in_place:
+            if not self.dirty_pages:
+                return
+            self.rotate_backups(file_path, backups)
+            mapped = np.memmap(file_path, dtype=np.uint8, mode='r+', shape=(len(self.data),))
+            for start, end in self.dirty_runs():
+                mapped[start:end] = self.data[start:end]
+            mapped.flush()
+            del mapped
+        else:
+            directory = os.path.dirname(os.path.abspath(file_path))
+            with tempfile.NamedTemporaryFile(dir=directory, prefix=".LinOLS_save_", delete=False) as temp_file:
+                try:
+                    temp_file.write(self.data.tobytes())
+                    temp_file.flush()
+                    os.fsync(temp_file.fileno())
+                    if os.path.exists(file_path):
+                        shutil.copymode(file_path, temp_file.name)
+                    else:
+                        umask = os.umask(0)
+                        os.umask(umask)
+                        os.chmod(temp_file.name, 0o666 & ~umask)
+                except BaseException:
+                    os.unlink(temp_file.name)
+                    raise
+            if os.path.exists(file_path):
+                self.rotate_backups(file_path, backups)
+            os.replace(temp_file.name, file_path)
+
+        self.file_path = file_path
+        self.dirty_pages.clear()
+
+    @staticmethod
+    def rotate_backups(file_path, backups):
+        if backups <= 0 or not os.path.exists(file_path):
+            return
+        for index in range(backups - 1, 0, -1):
+            if os.path.exists(f"{file_path}.bak{index}"):
+                os.replace(f"{file_path}.bak{index}", f"{file_path}.bak{index + 1}")
+        shutil.copy2(file_path, f"{file_path}.bak1")
+
+    def is_modified(self):
+        return not np.array_equal(self.data, self.original)
+
+    def words(self, byte_order='<'):
+        return self.data[:len(self.data) // 2 * 2].view(byte_order + 'u2')
+
+
+class EditJournal:
+    MAGIC = b'LOJRNL01'
+    HEADER = struct.Struct('<8s16sQH')
+    RECORD = struct.Struct('<QI')
+    COMPACT_SIZE = 1 << 20
+
+    def __init__(self, image):
+        self.image = image
+        self.buffer = []
+        self.handle = None
+        self.written = 0
+        self.compacted = 0
+        self.base_digest = TunePatch.digest(image.data)
+
+    @staticmethod
+    def directory():
+        return os.path.join(LINOLS_HOME, 'journal')
+
+    @classmethod
+    def path_for(cls, file_path):
+        name = hashlib.blake2b(os.path.abspath(file_path).encode(), digest_size=8).hexdigest()
+        return os.path.join(cls.directory(), name + '.journal')
+
+    @property
+    def path(self):
+        return self.path_for(self.image.file_path)
+
+    def header(self):
+        file_path = os.path.abspath(self.image.file_path).encode()
+        return self.HEADER.pack(self.MAGIC, self.base_digest, len(self.image.data), len(file_path)) + file_path
+
+    def record(self, offset, length):
+        if self.handle is None:
+            os.makedirs(self.directory(), exist_ok=True)
+            if os.path.exists(self.path):
+                self.rotate(self.path)
+            self.handle = open(self.path, 'wb')
+            self.handle.write(self.header())
+            self.written = self.handle.tell()
+        self.buffer.append(self.RECORD.pack(offset, length) + self.image.data[offset:offset + length].tobytes())
+
+    def flush(self):
+        if not self.buffer or self.handle is None:
+            return
+        records, self.buffer = b''.join(self.buffer), []
+        self.handle.write(records)
+        self.handle.flush()
+        os.fsync(self.handle.fileno())
+        self.written += len(records)
+        if self.written > self.COMPACT_SIZE + 2 * self.compacted:
+            self.compact()
+
+    def compact(self):
+        self.buffer = []
+        temp_path = self.path + '.tmp'
+        with open(temp_path, 'wb') as handle:
+            handle.write(self.header())
+            for start, end in self.image.dirty_runs():
+                handle.write(self.RECORD.pack(start, end - start) + self.image.data[start:end].tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        self.handle.close()
+        os.replace(temp_path, self.path)
+        self.handle = open(self.path, 'ab')
+        self.written = self.compacted = self.handle.tell()
+
+    def reset(self, old_path=None, digest=None):
+        self.close()
+        for path in {self.path, self.path_for(old_path or self.image.file_path)}:
+            if os.path.exists(path):
+                os.unlink(path)
+        self.base_digest = digest or TunePatch.digest(self.image.data)
+
+    def close(self):
+        if self.handle is not None:
+            self.flush()
+            self.handle.close()
+            self.handle = None
+
+    def discard(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    @classmethod
+    def read(cls, journal_path):
+        with open(journal_path, 'rb') as handle:
+            content = handle.read()
+        if len(content) < cls.HEADER.size:
+            raise ValueError("Journal is truncated.")
+        magic, base_digest, size, path_length = cls.HEADER.unpack_from(content)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a LinOLS journal.")
+        position = cls.HEADER.size + path_length
+        file_path = content[cls.HEADER.size:position].decode()
+
+        records = []
+        while position + cls.RECORD.size <= len(content):
+            offset, length = cls.RECORD.unpack_from(content, position)
+            position += cls.RECORD.size
+            if position + length > len(content) or offset + length > size:
+                break
+            records.append((offset, np.frombuffer(content, dtype=np.uint8, count=length, offset=position)))
+            position += length
+        return file_path, base_digest, size, records
+
+    @classmethod
+    def recover(cls, journal_path):
+        file_path, base_digest, size, records = cls.read(journal_path)
+        if not os.path.exists(file_path) or os.path.getsize(file_path) != size:
+            raise ValueError(f"{file_path} no longer exists or has changed size.")
+        base = np.fromfile(file_path, dtype=np.uint8)
+        if TunePatch.digest(base) != base_digest:
+            raise ValueError(f"{file_path} was modified after the journal was written.")
+
+        recovered = base.copy()
+        for offset, values in records:
+            recovered[offset:offset + len(values)] = values
+        return file_path, TunePatch.create(base, recovered)
+
+    @staticmethod
+    def rotate(journal_path):
+        rotated = f"{journal_path[:-len('.journal')]}-{time.time_ns()}.journal"
+        os.replace(journal_path, rotated)
+        return rotated
+
+    @classmethod
+    def pending(cls):
+        if not os.path.isdir(cls.directory()):
+            return []
+        return sorted(os.path.join(cls.directory(), name) for name in os.listdir(cls.directory()) if name.endswith('.journal'))
+
+    @staticmethod
+    def remove_stale_files(directories, age=60):
+        now = time.time()
+        for directory in directories:
+            try:
+                names = os.listdir(directory)
+            except OSError:
+                continue
+            for name in names:
+                path = os.path.join(directory, name)
+                if name.startswith(('LinOLS_temp_', '.LinOLS_save_')) or name.endswith('.journal.tmp'):
+                    try:
+                        if now - os.path.getmtime(path) > age:
+                            os.unlink(path)
+                    except OSError:
+                        pass
+
+
+class ReferenceImage:
+    def __init__(self, path):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode='r')
+        self.run_starts = np.zeros(0, dtype=np.int64)
+        self.run_ends = np.zeros(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.data)
+
+    @staticmethod
+    def references_dir():
+        return os.path.join(LINOLS_HOME, 'references')
+
+    @classmethod
+    def load_index(cls):
+        index_path = os.path.join(cls.references_dir(), 'index.json')
+        if not os.path.exists(index_path):
+            return {}
+        with open(index_path, 'r') as index_file:
+            return json.load(index_file)
+
+    @classmethod
+    def save_index(cls, index):
+        os.makedirs(cls.references_dir(), exist_ok=True)
+        index_path = os.path.join(cls.references_dir(), 'index.json')
+        with open(index_path + '.tmp', 'w') as index_file:
+            json.dump(index, index_file, indent=1)
+        os.replace(index_path + '.tmp', index_path)
+
+    @classmethod
+    def store(cls, file_path):
+        data = np.fromfile(file_path, dtype=np.uint8)
+        if not len(data):
+            raise ValueError("Reference image is empty.")
+
+        stored_path = os.path.join(cls.references_dir(), hashlib.blake2b(data, digest_size=16).hexdigest() + '.bin')
+        if not os.path.exists(stored_path):
+            os.makedirs(cls.references_dir(), exist_ok=True)
+            data.tofile(stored_path + '.tmp')
+            os.replace(stored_path + '.tmp', stored_path)
+        return cls(stored_path)
+
+    @classmethod
+    def for_image(cls, image_path):
+        stored_path = cls.load_index().get(os.path.abspath(image_path))
+        if stored_path and os.path.exists(stored_path):
+            return cls(stored_path)
+        return None
+
+    def remember(self, image_path):
+        index = self.load_index()
+        index[os.path.abspath(image_path)] = self.path
+        self.save_index(index)
+
+    @classmethod
+    def forget(cls, image_path):
+        index = cls.load_index()
+        if index.pop(os.path.abspath(image_path), None):
+            cls.save_index(index)
+
+    def read(self, offset, count, dtype='u1'):
+        itemsize = np.dtype(dtype).itemsize
+        end = min(len(self.data), offset + count * itemsize)
+        end -= (end - offset) % itemsize
+        return self.data[offset:max(offset, end)].view(dtype)
+
+    def changed_runs(self, data, start, end):
+        common_end = min(end, len(self.data))
+        changed = np.flatnonzero(data[start:common_end] != self.data[start:common_end])
+        if end > len(self.data):
+            changed = np.concatenate([changed, np.arange(max(start, len(self.data)), end) - start])
+        if not len(changed):
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+        breaks = np.flatnonzero(np.diff(changed) != 1) + 1
+        starts = changed[np.concatenate([[0], breaks])] + start
+        ends = changed[np.concatenate([breaks - 1, [len(changed) - 1]])] + start + 1
+        return starts.astype(np.int64), ends.astype(np.int64)
+
+    def build_runs(self, data):
+        self.run_starts, self.run_ends = self.changed_runs(data, 0, len(data))
+
+    def update_runs(self, data, offset, length):
+        low = max(offset - 1, 0)
+        high = min(offset + length + 1, len(data))
+        first = np.searchsorted(self.run_ends, low, 'left')
+        last = np.searchsorted(self.run_starts, high, 'right')
+        if first < last:
+            low = min(low, int(self.run_starts[first]))
+            high = max(high, int(self.run_ends[last - 1]))
+
+        starts, ends = self.changed_runs(data, low, high)
+        self.run_starts = np.concatenate([self.run_starts[:first], starts, self.run_starts[last:]])
+        self.run_ends = np.concatenate([self.run_ends[:first], ends, self.run_ends[last:]])
+
+    def changed_bytes(self):
+        return int((self.run_ends - self.run_starts).sum())
+
+    def next_run(self, offset):
+        index = np.searchsorted(self.run_starts, offset, 'right')
+        return int(self.run_starts[index]) if index < len(self.run_starts) else None
+
+    def previous_run(self, offset):
+        index = np.searchsorted(self.run_starts, offset, 'left') - 1
+        return int(self.run_starts[index]) if index >= 0 else None
+
+
+class MapDefinition:
+    def __init__(self, name, offset, rows, columns, dtype='<u2'):
+        self.name = name
+        self.offset = offset
+        self.rows = rows
+        self.columns = columns
+        self.dtype = np.dtype(dtype)
+
+    @property
+    def nbytes(self):
+        return self.rows * self.columns * self.dtype.itemsize
+
+    def view(self, data):
+        if self.offset < 0 or self.offset + self.nbytes > len(data):
+            raise ValueError(f"Map {self.name} does not fit in the image.")
+        return data[self.offset:self.offset + self.nbytes].view(self.dtype).reshape(self.rows, self.columns)
+
+
+class Document:
+    def __init__(self, file_path):
+        self.image = ImageBuffer(file_path)
+        self.caches = {}
+        self.maps = {}
+        self.script = None
+        self.reference = None
+        self.journal = EditJournal(self.image)
+        self.parent_digest = self.journal.base_digest.hex()
+        self.mirrors = None
+        self.last_used = 0
+        self.current_offset = 0
+        self.num_columns = 15
+        self.display_mode = 'dec16_lh'
+        self.text_view = 0.0
+
+    @property
+    def path(self):
+        return self.image.file_path
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def cache(self, key, value, nbytes):
+        self.caches[key] = (value, nbytes)
+
+    def cached(self, key):
+        entry = self.caches.get(key)
+        return entry[0] if entry else None
+
+    def cache_size(self):
+        return sum(nbytes for value, nbytes in self.caches.values())
+
+    def evict_caches(self):
+        size = self.cache_size()
+        self.caches.clear()
+        return size
+
+
+class Workspace:
+    MEMORY_BUDGET = 256 * 1024 * 1024
+
+    def __init__(self, memory_budget=MEMORY_BUDGET):
+        self.documents = []
+        self.active = None
+        self.memory_budget = memory_budget
+        self.clock = itertools.count(1)
+
+    def find(self, file_path):
+        for document in self.documents:
+            if os.path.abspath(document.path) == os.path.abspath(file_path):
+                return document
+        return None
+
+    def add(self, document):
+        self.documents.append(document)
+        return document
+
+    def remove(self, document):
+        self.documents.remove(document)
+        if document is self.active:
+            self.active = None
+
+    def activate(self, document):
+        self.active = document
+        document.last_used = next(self.clock)
+        self.enforce_budget()
+
+    def cache_size(self):
+        return sum(document.cache_size() for document in self.documents)
+
+    def enforce_budget(self):
+        total = self.cache_size()
+        inactive = sorted((document for document in self.documents if document is not self.active), key=lambda document: document.last_used)
+        for document in inactive:
+            if total <= self.memory_budget:
+                break
+            total -= document.evict_caches()
+        return total
+
+
+class ScriptSession:
+    def __init__(self, document):
+        self.document = document
+        self.namespace = {'np': np, '__name__': '__linols__'}
+        self.new_maps = {}
+
+    def define_map(self, name, offset, rows, columns, dtype='<u2'):
+        definition = MapDefinition(name, offset, rows, columns, dtype)
+        self.namespace['maps'][name] = definition.view(self.namespace['u8'])
+        self.new_maps[name] = definition
+        return self.namespace['maps'][name]
+
+    def bind(self, work, selection):
+        image = self.document.image
+        even = len(work) // 2 * 2
+        original = image.original.view()
+        original.flags.writeable = False
+        self.namespace.pop('image', None)
+        self.namespace.update({
+            'original': original,
+            'u8': work,
+            'u16le': work[:even].view('<u2'),
+            'u16be': work[:even].view('>u2'),
+            'maps': {name: definition.view(work) for name, definition in self.document.maps.items()},
+            'define_map': self.define_map,
+            'selection': slice(*selection) if selection else None,
+            'journal': tuple(image.undo_stack),
+        })
+
+    def run(self, source, filename='<console>', selection=None):
+        image = self.document.image
+        work = image.data.copy()
+        output = io.StringIO()
+        self.new_maps = {}
+        with redirect_stdout(output):
+            try:
+                self.bind(work, selection)
+                exec(compile(source, filename, 'exec'), self.namespace)
+            except (Exception, SystemExit):
+                traceback.print_exc(file=output)
+                return output.getvalue() + "Script failed, no changes applied.\n", 0
+        self.document.maps.update(self.new_maps)
+        return output.getvalue(), self.commit(work)
+
+    def commit(self, work):
+        image = self.document.image
+        changed = np.flatnonzero(work != image.data)
+        if not len(changed):
+            return 0
+
+        breaks = np.flatnonzero(np.diff(changed) != 1) + 1
+        with image.transaction():
+            for run in np.split(changed, breaks):
+                image.write(int(run[0]), work[run[0]:run[-1] + 1])
+        return len(changed)
+
+
+class VariantComparison:
+    def __init__(self, stock, variants, names, dtype='<u2'):
+        self.names = names
+        self.dtype = dtype
+        itemsize = np.dtype(dtype).itemsize
+        images = [stock] + list(variants)
+        length = max(len(image) for image in images) // itemsize * itemsize
+
+        self.stack = np.zeros((len(images), length), dtype=np.uint8)
+        for row, image in enumerate(images):
+            self.stack[row, :min(len(image), length)] = image[:length]
+        values = self.stack.view(dtype)
+
+        changed_positions = np.flatnonzero((values[1:] != values[0]).any(axis=0))
+        deltas = values[1:, changed_positions].astype(np.int64) - values[0, changed_positions]
+        variant_changed = deltas != 0
+        abs_deltas = np.abs(deltas)
+
+        run_starts = np.flatnonzero(np.diff(changed_positions, prepend=-2) != 1)
+        self.run_offsets = changed_positions[run_starts] * itemsize
+        self.run_lengths = np.diff(np.append(run_starts, len(changed_positions)))
+
+        if len(run_starts):
+            self.run_variants = np.logical_or.reduceat(variant_changed, run_starts, axis=1)
+            self.run_max = np.maximum.reduceat(abs_deltas, run_starts, axis=1)
+            self.run_mean = np.add.reduceat(deltas, run_starts, axis=1) / np.maximum(np.add.reduceat(variant_changed, run_starts, axis=1), 1)
+        else:
+            self.run_variants = np.zeros((len(variants), 0), dtype=bool)
+            self.run_max = np.zeros((len(variants), 0), dtype=np.int64)
+            self.run_mean = np.zeros((len(variants), 0))
+
+        changed_counts = variant_changed.sum(axis=1)
+        self.variant_stats = [{
+            'changed': int(changed_counts[variant]),
+            'runs': int(self.run_variants[variant].sum()),
+            'increased': int((deltas[variant] > 0).sum()),
+            'decreased': int((deltas[variant] < 0).sum()),
+            'max_delta': int(abs_deltas[variant].max()) if len(changed_positions) else 0,
+            'mean_delta': float(deltas[variant].sum() / max(changed_counts[variant], 1)),
+        } for variant in range(len(variants))]
+
+
+class StructureOverview:
+    BLOCK_SIZE = 512
+    CHUNK_BLOCKS = 4096
+    SMOOTH_LIMIT = 2048
+    CLASSES = ('padding', 'code', 'data')
+
+    def __init__(self, entropy, smoothness, classes, block_size, length):
+        self.entropy = entropy
+        self.smoothness = smoothness
+        self.classes = classes
+        self.block_size = block_size
+        self.length = length
+
+    @classmethod
+    def compute(cls, data, block_size=BLOCK_SIZE):
+        block_count = -(-len(data) // block_size)
+        padded = np.zeros(block_count * block_size, dtype=np.uint8)
+        padded[:len(data)] = data
+        blocks = padded.reshape(block_count, block_size)
+
+        entropy = np.empty(block_count)
+        smoothness = np.empty(block_count)
+        for start in range(0, block_count, cls.CHUNK_BLOCKS):
+            chunk = blocks[start:start + cls.CHUNK_BLOCKS]
+            ids = (np.arange(len(chunk))[:, np.newaxis] * 256 + chunk).ravel()
+            probabilities = np.bincount(ids, minlength=len(chunk) * 256).reshape(len(chunk), 256) / block_size
+            entropy[start:start + len(chunk)] = np.maximum(-(probabilities * np.log2(np.where(probabilities > 0, probabilities, 1))).sum(axis=1), 0)
+
+            little = np.abs(np.diff(chunk.view('<u2').astype(np.int32), axis=1)).mean(axis=1)
+            big = np.abs(np.diff(chunk.view('>u2').astype(np.int32), axis=1)).mean(axis=1)
+            smoothness[start:start + len(chunk)] = np.minimum(little, big)
+
+        classes = np.ones(block_count, dtype=np.uint8)
+        classes[smoothness < cls.SMOOTH_LIMIT] = 2
+        classes[entropy < 1.0] = 0
+        return cls(entropy, smoothness, classes, block_size, len(data))
+
+    @classmethod
+    def load_or_compute(cls, data):
+        cache_dir = os.path.join(LINOLS_HOME, 'cache')
+        cache_path = os.path.join(cache_dir, hashlib.blake2b(data, digest_size=16).hexdigest() + '.overview.npz')
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cached:
+                return cls(cached['entropy'], cached['smoothness'], cached['classes'], int(cached['block_size']), len(data))
+
+        overview = cls.compute(data)
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, 'wb') as cache_file:
+            np.savez(cache_file, entropy=overview.entropy, smoothness=overview.smoothness,
+                     classes=overview.classes, block_size=overview.block_size)
+        return overview
+
+    def block_at(self, offset):
+        if not len(self.classes):
+            return None
+        block = min(offset // self.block_size, len(self.classes) - 1)
+        return self.CLASSES[self.classes[block]], float(self.entropy[block]), float(self.smoothness[block])
+
+    def find_next(self, offset, class_name):
+        block = offset // self.block_size + 1
+        candidates = np.flatnonzero(self.classes[block:] == self.CLASSES.index(class_name))
+        if not len(candidates):
+            return None
+        return int(block + candidates[0]) * self.block_size
+
+
+class FingerprintIndex:
+    BLOCK_SIZE = 4096
+    MULTIPLIERS = np.random.default_rng(0x11705).integers(1, 2 ** 63, BLOCK_SIZE // 8, dtype=np.uint64) | np.uint64(1)
+    IDENTIFIER_PATTERN = re.compile(rb'[0-9A-Z][0-9A-Za-z_.\-/]{7,31}')
+    MAX_IDENTIFIERS = 64
+    CANDIDATES = 20
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS files (id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime INTEGER, block_count INTEGER);
+        CREATE TABLE IF NOT EXISTS blocks (hash INTEGER, file_id INTEGER);
+        CREATE INDEX IF NOT EXISTS blocks_hash ON blocks (hash);
+        CREATE INDEX IF NOT EXISTS blocks_file ON blocks (file_id);
+        CREATE TABLE IF NOT EXISTS identifiers (value TEXT, file_id INTEGER);
+        CREATE INDEX IF NOT EXISTS identifiers_value ON identifiers (value);
+        CREATE INDEX IF NOT EXISTS identifiers_file ON identifiers (file_id);
+        CREATE TABLE IF NOT EXISTS maps (file_id INTEGER, name TEXT, map_offset INTEGER, map_rows INTEGER, map_columns INTEGER, dtype TEXT, PRIMARY KEY (file_id, name));
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(LINOLS_HOME, 'fingerprints.sqlite')
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    @classmethod
+    def block_hashes(cls, data):
+        count = len(data) // cls.BLOCK_SIZE
+        blocks = data[:count * cls.BLOCK_SIZE].reshape(count, cls.BLOCK_SIZE)
+        informative = blocks.min(axis=1) != blocks.max(axis=1)
+        hashes = (blocks[informative].view(np.uint64) * cls.MULTIPLIERS).sum(axis=1, dtype=np.uint64)
+        hashes ^= hashes >> np.uint64(31)
+        return np.unique(hashes.view(np.int64))
+
+    @classmethod
+    def identifiers(cls, data):
+        found = []
+        for match in cls.IDENTIFIER_PATTERN.finditer(data.tobytes()):
+            value = match.group().decode('ascii')
+            if sum(character.isdigit() for character in value) >= 4 and value not in found:
+                found.append(value)
+                if len(found) == cls.MAX_IDENTIFIERS:
+                    break
+        return found
+
+    @classmethod
+    def fingerprint(cls, file_path):
+        data = np.fromfile(file_path, dtype=np.uint8)
+        return cls.block_hashes(data), cls.identifiers(data)
+
+    def index_paths(self, paths, workers=None):
+        known = {path: (size, mtime) for path, size, mtime in self.connection.execute("SELECT path, size, mtime FROM files")}
+        pending = []
+        for path in map(os.path.abspath, paths):
+            stat = os.stat(path)
+            if known.get(path) != (stat.st_size, stat.st_mtime_ns):
+                pending.append((path, stat.st_size, stat.st_mtime_ns))
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            results = pool.map(lambda entry: (entry, self.fingerprint(entry[0])), pending)
+            with self.connection:
+                for (path, size, mtime), (hashes, identifiers) in results:
+                    self.forget(path)
+                    file_id = self.connection.execute("INSERT INTO files (path, size, mtime, block_count) VALUES (?, ?, ?, ?)",
+                                                      (path, size, mtime, len(hashes))).lastrowid
+                    self.connection.executemany("INSERT INTO blocks (hash, file_id) VALUES (?, ?)", ((int(value), file_id) for value in hashes))
+                    self.connection.executemany("INSERT INTO identifiers (value, file_id) VALUES (?, ?)", ((value, file_id) for value in identifiers))
+        return len(pending), len(known)
+
+    def index_directory(self, directory, workers=None):
+        paths = [os.path.join(folder, name) for folder, _, names in os.walk(directory) for name in names if name.lower().endswith('.bin')]
+        with self.connection:
+            for (path,) in self.connection.execute("SELECT path FROM files WHERE path LIKE ?", (os.path.abspath(directory) + os.sep + '%',)).fetchall():
+                if not os.path.exists(path):
+                    self.forget(path)
+        return self.index_paths(paths, workers)
+
+    def forget(self, path):
+        row = self.connection.execute("SELECT id FROM files WHERE path = ?", (path,)).fetchone()
+        if row:
+            for table in ('blocks', 'identifiers', 'maps'):
+                self.connection.execute(f"DELETE FROM {table} WHERE file_id = ?", row)
+            self.connection.execute("DELETE FROM files WHERE id = ?", row)
+
+    def identify(self, data, limit=5):
+        hashes = self.block_hashes(data)
+        identifiers = self.identifiers(data)
+        self.connection.execute("CREATE TEMP TABLE IF NOT EXISTS query_blocks (hash INTEGER PRIMARY KEY)")
+        self.connection.execute("DELETE FROM query_blocks")
+        self.connection.executemany("INSERT INTO query_blocks (hash) VALUES (?)", ((int(value),) for value in hashes))
+
+        shared_blocks = dict(self.connection.execute(
+            "SELECT blocks.file_id, COUNT(*) FROM blocks JOIN query_blocks ON blocks.hash = query_blocks.hash "
+            "GROUP BY blocks.file_id ORDER BY COUNT(*) DESC LIMIT ?", (self.CANDIDATES,)))
+        shared_identifiers = {}
+        if identifiers:
+            placeholders = ','.join('?' * len(identifiers))
+            for file_id, value in self.connection.execute(f"SELECT file_id, value FROM identifiers WHERE value IN ({placeholders})", identifiers):
+                shared_identifiers.setdefault(file_id, []).append(value)
+
+        matches = []
+        for file_id in set(shared_blocks) | set(shared_identifiers):
+            path, block_count = self.connection.execute("SELECT path, block_count FROM files WHERE id = ?", (file_id,)).fetchone()
+            shared = shared_blocks.get(file_id, 0)
+            matches.append({'path': path, 'shared_blocks': shared, 'score': shared / max(len(hashes), block_count, 1),
+                            'identifiers': shared_identifiers.get(file_id, [])})
+        matches.sort(key=lambda match: (match['score'], len(match['identifiers'])), reverse=True)
+        return matches[:limit]
+
+    def store_maps(self, path, maps):
+        row = self.connection.execute("SELECT id FROM files WHERE path = ?", (os.path.abspath(path),)).fetchone()
+        if not row:
+            raise ValueError(f"{os.path.basename(path)} is not in the fingerprint library.")
+        with self.connection:
+            self.connection.executemany("INSERT OR REPLACE INTO maps (file_id, name, map_offset, map_rows, map_columns, dtype) VALUES (?, ?, ?, ?, ?, ?)",
+                                        ((row[0], definition.name, definition.offset, definition.rows, definition.columns, definition.dtype.str)
+                                         for definition in maps.values()))
+
+    def load_maps(self, path):
+        rows = self.connection.execute("SELECT name, map_offset, map_rows, map_columns, dtype FROM maps JOIN files ON files.id = maps.file_id "
+                                       "WHERE files.path = ?", (path,))
+        return {name: MapDefinition(name, offset, map_rows, map_columns, dtype) for name, offset, map_rows, map_columns, dtype in rows}
+
+
+class TuneCatalog:
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS images (digest TEXT PRIMARY KEY, size INTEGER, first_seen REAL);
+        CREATE TABLE IF NOT EXISTS tunes (id INTEGER PRIMARY KEY, path TEXT UNIQUE, digest TEXT COLLATE NOCASE,
+                                          manufacturer TEXT COLLATE NOCASE, model TEXT COLLATE NOCASE, modification TEXT COLLATE NOCASE,
+                                          parent_digest TEXT COLLATE NOCASE, stock_digest TEXT COLLATE NOCASE, saved_at REAL);
+        CREATE INDEX IF NOT EXISTS tunes_digest ON tunes (digest);
+        CREATE INDEX IF NOT EXISTS tunes_vehicle ON tunes (manufacturer, model);
+        CREATE INDEX IF NOT EXISTS tunes_model ON tunes (model);
+        CREATE INDEX IF NOT EXISTS tunes_modification ON tunes (modification);
+        CREATE INDEX IF NOT EXISTS tunes_parent ON tunes (parent_digest);
+        CREATE INDEX IF NOT EXISTS tunes_stock ON tunes (stock_digest);
+    """
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(LINOLS_HOME, 'catalog.sqlite')
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.connection = sqlite3.connect(self.db_path)
+        self.connection.executescript(self.SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+    def record(self, path, data, manufacturer=None, model=None, modification=None, parent_digest=None, stock_digest=None, digest=None):
+        path = os.path.abspath(path)
+        digest = digest or self.digest(data)
+        previous = self.connection.execute("SELECT manufacturer, model, modification, parent_digest, stock_digest FROM tunes WHERE path = ?", (path,)).fetchone()
+        if previous:
+            manufacturer = manufacturer or previous[0]
+            model = model or previous[1]
+            modification = modification or previous[2]
+            parent_digest = parent_digest or previous[3]
+            stock_digest = stock_digest or previous[4]
+        if parent_digest == digest:
+            parent_digest = None
+
+        duplicates = [row[0] for row in self.connection.execute("SELECT path FROM tunes WHERE digest = ? AND path != ?", (digest, path))]
+        with self.connection:
+            self.connection.execute("INSERT OR IGNORE INTO images (digest, size, first_seen) VALUES (?, ?, ?)", (digest, len(data), time.time()))
+            self.connection.execute("INSERT OR REPLACE INTO tunes (path, digest, manufacturer, model, modification, parent_digest, stock_digest, saved_at) "
+                                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                    (path, digest, manufacturer, model, modification, parent_digest, stock_digest, time.time()))
+        return digest, duplicates
+
+    def search(self, vehicle="", modification="", digest="", limit=500):
+        clauses = []
+        parameters = []
+        for word in vehicle.split():
+            clauses.append("(manufacturer LIKE ? OR model LIKE ?)")
+            parameters += [word + '%', word + '%']
+        if modification:
+            clauses.append("modification LIKE ?")
+            parameters.append(modification + '%')
+        if digest:
+            clauses.append("(tunes.digest LIKE ? OR parent_digest LIKE ? OR stock_digest LIKE ?)")
+            parameters += [digest.lower() + '%'] * 3
+
+        where = ("WHERE " + " AND ".join(clauses)) if clauses else ""
+        rows = self.connection.execute(
+            f"SELECT tunes.digest, images.size, manufacturer, model, modification, path, parent_digest, stock_digest, saved_at "
+            f"FROM tunes JOIN images ON images.digest = tunes.digest {where} ORDER BY saved_at DESC LIMIT ?", parameters + [limit])
+
+        results = {}
+        for digest, size, manufacturer, model, modification, path, parent_digest, stock_digest, saved_at in rows:
+            entry = results.setdefault(digest, {'digest': digest, 'size': size, 'manufacturer': manufacturer, 'model': model,
+                                                'modification': modification, 'parent_digest': parent_digest,
+                                                'stock_digest': stock_digest, 'saved_at': saved_at, 'paths': []})
+            entry['paths'].append(path)
+        return list(results.values())
+
+    def prune(self):
+        with self.connection:
+            for (path,) in self.connection.execute("SELECT path FROM tunes").fetchall():
+                if not os.path.exists(path):
+                    self.connection.execute("DELETE FROM tunes WHERE path = ?", (path,))
+            self.connection.execute("DELETE FROM images WHERE digest NOT IN (SELECT digest FROM tunes)")
+
+
+class TunePatch:
+    MAGIC = b'LOPATCH1'
+    HEADER = struct.Struct('<8s16s16sQI')
+    MERGE_GAP = 8
+
+    def __init__(self, stock_digest, target_digest, size, offsets, lengths, original, new):
+        self.stock_digest = stock_digest
+        self.target_digest = target_digest
+        self.size = size
+        self.offsets = offsets
+        self.lengths = lengths
+        self.original = original
+        self.new = new
+
+    @staticmethod
+    def digest(data):
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    @staticmethod
+    def run_indices(offsets, lengths):
+        total = int(lengths.sum())
+        run_starts = np.cumsum(lengths) - lengths
+        return np.repeat(offsets - run_starts, lengths) + np.arange(total, dtype=np.int64)
+
+    @classmethod
+    def create(cls, stock, modified):
+        if len(stock) != len(modified):
+            raise ValueError("Stock and modified images must have the same size.")
+
+        changed = np.flatnonzero(stock != modified)
+        if len(changed):
+            breaks = np.flatnonzero(np.diff(changed) > cls.MERGE_GAP) + 1
+            offsets = changed[np.concatenate([[0], breaks])].astype(np.uint64)
+            lengths = (changed[np.concatenate([breaks - 1, [len(changed) - 1]])] + 1 - offsets.astype(np.int64)).astype(np.uint32)
+        else:
+            offsets = np.zeros(0, dtype=np.uint64)
+            lengths = np.zeros(0, dtype=np.uint32)
+
+        indices = cls.run_indices(offsets.astype(np.int64), lengths.astype(np.int64))
+        return cls(cls.digest(stock), cls.digest(modified), len(stock), offsets, lengths, stock[indices], modified[indices])
+
+    def to_bytes(self):
+        payload = self.offsets.tobytes() + self.lengths.tobytes() + self.original.tobytes() + self.new.tobytes()
+        return self.HEADER.pack(self.MAGIC, self.stock_digest, self.target_digest, self.size, len(self.offsets)) + zlib.compress(payload, 9)
+
+    @classmethod
+    def from_bytes(cls, data):
+        if len(data) < cls.HEADER.size:
+            raise ValueError("Not a LinOLS patch file.")
+        magic, stock_digest, target_digest, size, run_count = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a LinOLS patch file.")
+
+        payload = zlib.decompress(data[cls.HEADER.size:])
+        offsets = np.frombuffer(payload, dtype=np.uint64, count=run_count)
+        lengths = np.frombuffer(payload, dtype=np.uint32, count=run_count, offset=run_count * 8)
+        total = int(lengths.sum(dtype=np.int64))
+        original = np.frombuffer(payload, dtype=np.uint8, count=total, offset=run_count * 12)
+        new = np.frombuffer(payload, dtype=np.uint8, count=total, offset=run_count * 12 + total)
+        if len(payload) != run_count * 12 + 2 * total or (total and int(offsets.max()) + int(lengths.max()) > size):
+            raise ValueError("Patch file is corrupt.")
+        return cls(stock_digest, target_digest, size, offsets, lengths, original, new)
+
+    def save(self, file_path):
+        with open(file_path, 'wb') as patch_file:
+            patch_file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, file_path):
+        with open(file_path, 'rb') as patch_file:
+            return cls.from_bytes(patch_file.read())
+
+    @property
+    def changed_bytes(self):
+        return int(np.count_nonzero(self.original != self.new))
+
+    def indices(self):
+        return self.run_indices(self.offsets.astype(np.int64), self.lengths.astype(np.int64))
+
+    def check(self, data, force=False):
+        if len(data) != self.size:
+            raise ValueError(f"Image size {len(data)} does not match the patch ({self.size} bytes).")
+        if self.digest(data) == self.target_digest:
+            raise ValueError("The patch is already applied to this image.")
+        if self.digest(data) != self.stock_digest:
+            if not force:
+                raise ValueError("Image does not match the stock image of this patch.")
+            if not np.array_equal(data[self.indices()], self.original):
+                raise ValueError("Image differs from the patch's stock bytes in the patched regions.")
+
+    def apply(self, data, force=False):
+        self.check(data, force)
+        patched = data.copy()
+        patched[self.indices()] = self.new
+        return patched
+
+    def runs(self):
+        boundaries = np.concatenate([[0], np.cumsum(self.lengths, dtype=np.int64)])
+        for index, offset in enumerate(self.offsets.tolist()):
+            yield offset, self.new[boundaries[index]:boundaries[index + 1]]
+
+    @staticmethod
+    def write_image(data, output_path):
+        try:
+            data.tofile(output_path + '.tmp')
+        except BaseException:
+            if os.path.exists(output_path + '.tmp'):
+                os.unlink(output_path + '.tmp')
+            raise
+        os.replace(output_path + '.tmp', output_path)
+
+    @classmethod
+    def main(cls, arguments):
+        parser = argparse.ArgumentParser(prog="LinOLS.py patch", description="Create and apply LinOLS tune patches.")
+        commands = parser.add_subparsers(dest="command", required=True)
+        create = commands.add_parser("create", help="create a patch from a stock and a modified image")
+        create.add_argument("stock")
+        create.add_argument("modified")
+        create.add_argument("patch")
+        apply = commands.add_parser("apply", help="apply a patch to one or more images")
+        apply.add_argument("patch")
+        apply.add_argument("images", nargs="+")
+        apply.add_argument("--in-place", action="store_true", help="overwrite the images instead of writing *_patched.bin")
+        apply.add_argument("--force", action="store_true", help="apply when the stock hash differs but the patched bytes match")
+        options = parser.parse_args(arguments)
+
+        if options.command == "create":
+            start_time = time.perf_counter()
+            patch = cls.create(np.fromfile(options.stock, dtype=np.uint8), np.fromfile(options.modified, dtype=np.uint8))
+            patch.save(options.patch)
+            print(f"{options.patch}: {len(patch.offsets)} runs, {patch.changed_bytes} bytes changed, "
+                  f"{os.path.getsize(options.patch)} bytes ({(time.perf_counter() - start_time) * 1000:.1f} ms)")
+            return 0
+
+        try:
+            patch = cls.load(options.patch)
+        except (OSError, ValueError, zlib.error, struct.error) as e:
+            print(f"{options.patch}: cannot read patch: {e}", file=sys.stderr)
+            return 1
+        failures = 0
+        for image_path in options.images:
+            start_time = time.perf_counter()
+            try:
+                patched = patch.apply(np.fromfile(image_path, dtype=np.uint8), options.force)
+                output_path = image_path if options.in_place else os.path.splitext(image_path)[0] + "_patched.bin"
+                cls.write_image(patched, output_path)
+                print(f"{image_path} -> {output_path} ({(time.perf_counter() - start_time) * 1000:.1f} ms)")
+            except (OSError, ValueError) as e:
+                failures += 1
+                print(f"{image_path}: {e}", file=sys.stderr)
+        return 1 if failures else 0
+
+
+class LayoutAnalyzer:
+    DECODINGS = (('dec16_lh', '<u2'), ('dec16_hl', '>u2'), ('dec8', 'u1'))
+    MIN_STRIDE = 2
+    MAX_STRIDE = 256
+
+    @staticmethod
+    def roughness(values):
+        values = values.astype(np.float64)
+        spread = values.max() - values.min()
+        if len(values) < 3 or not spread:
+            return 1.0
+        return float(np.abs(np.diff(values)).mean() / spread)
+
+    @classmethod
+    def autocorrelation(cls, values):
+        centered = values.astype(np.float64) - values.mean()
+        size = 1 << int(2 * len(centered) - 1).bit_length()
+        spectrum = np.fft.rfft(centered, size)
+        correlation = np.fft.irfft(spectrum * np.conj(spectrum), size)[:len(centered)]
+        if correlation[0] <= 0:
+            return np.zeros(len(centered))
+        return correlation / correlation[0] * len(centered) / np.maximum(len(centered) - np.arange(len(centered)), 1)
+
+    @classmethod
+    def strides(cls, values, top=5):
+        max_stride = min(cls.MAX_STRIDE, (len(values) - 1) // 3)
+        if max_stride <= cls.MIN_STRIDE:
+            return []
+
+        correlation = cls.autocorrelation(np.diff(values.astype(np.float64)))[:max_stride + 2]
+        lags = np.arange(cls.MIN_STRIDE, max_stride + 1)
+        peaks = lags[(correlation[lags] > correlation[lags - 1]) & (correlation[lags] >= correlation[lags + 1]) & (correlation[lags] > 0.1)]
+        ranked = sorted(peaks.tolist(), key=lambda lag: correlation[lag], reverse=True)
+
+        strides = []
+        for lag in ranked:
+            if not any(lag % stride == 0 and correlation[lag] <= correlation[stride] + 0.1 for stride, score in strides):
+                strides.append((lag, float(correlation[lag])))
+        return strides[:top]
+
+    @classmethod
+    def decode(cls, data, value_type):
+        itemsize = np.dtype(value_type).itemsize
+        return data[:len(data) // itemsize * itemsize].view(value_type)
+
+    @classmethod
+    def analyze(cls, data, top=5):
+        if len(data) < 4:
+            return []
+        roughness, mode, value_type = min((cls.roughness(cls.decode(data, value_type)), mode, value_type) for mode, value_type in cls.DECODINGS)
+        itemsize = np.dtype(value_type).itemsize
+
+        candidates = []
+        for stride, correlation in cls.strides(cls.decode(data, value_type)):
+            columns = stride if itemsize == 2 else stride // 2
+            if columns < 1 or (itemsize == 1 and stride % 2):
+                continue
+            candidates.append({'mode': mode, 'columns': columns, 'stride': stride, 'correlation': correlation,
+                               'roughness': roughness, 'score': correlation * (1 - roughness)})
+        return candidates[:top]
+
+
+class MirrorIndex:
+    WINDOW = 64
+    ANCHOR_MODULUS = 32
+    GAP = 256
+    MIN_LENGTH = 128
+    MAX_COPIES = 8
+    MATCH_RUN = 8
+    MISMATCH_RATIO = 8
+    CHUNK = 1 << 20
+    BASE = np.uint64(0x100000001B3)
+    BASE_INVERSE = np.uint64(pow(0x100000001B3, -1, 1 << 64))
+
+    def __init__(self, data):
+        self.data = data
+        self.positions, self.hashes = self.anchors(data, 0, len(data) - self.WINDOW + 1)
+        self.flat = np.sort(self.window_hashes(np.repeat(np.arange(256, dtype=np.uint8), self.WINDOW))[::self.WINDOW])
+        self.stale = False
+        self.groups = self.find_groups()
+
+    @classmethod
+    def window_hashes(cls, data):
+        count = len(data)
+        powers = np.full(count, cls.BASE, dtype=np.uint64)
+        powers[0] = 1
+        powers = np.cumprod(powers)
+        inverse = np.full(count - cls.WINDOW + 1, cls.BASE_INVERSE, dtype=np.uint64)
+        inverse[0] = 1
+        inverse = np.cumprod(inverse)
+        prefix = np.concatenate([[np.uint64(0)], np.cumsum(data.astype(np.uint64) * powers[::-1], dtype=np.uint64)])
+        return (prefix[cls.WINDOW:] - prefix[:-cls.WINDOW]) * inverse[::-1]
+
+    @classmethod
+    def anchors(cls, data, first, last):
+        first, last = max(first, 0), min(last, len(data) - cls.WINDOW + 1)
+        positions, hashes = [np.zeros(0, dtype=np.int64)], [np.zeros(0, dtype=np.uint64)]
+        for start in range(first, last, cls.CHUNK):
+            end = min(start + cls.CHUNK, last)
+            chunk = cls.window_hashes(data[start:end + cls.WINDOW - 1])
+            selected = np.flatnonzero((chunk >> np.uint64(40)) % np.uint64(cls.ANCHOR_MODULUS) == 0)
+            positions.append(selected + start)
+            hashes.append(chunk[selected])
+        return np.concatenate(positions), np.concatenate(hashes)
+
+    @staticmethod
+    def matching_length(left, right):
+        mismatch = np.flatnonzero(left != right)
+        return int(mismatch[0]) if len(mismatch) else len(left)
+
+    @classmethod
+    def similar_length(cls, left, right):
+        equal = left == right
+        length = cls.matching_length(left, right)
+        if len(equal) < cls.MATCH_RUN:
+            return length
+        ends = np.flatnonzero(np.convolve(equal, np.ones(cls.MATCH_RUN, dtype=np.int64), 'valid') == cls.MATCH_RUN) + cls.MATCH_RUN
+        ends = ends[np.cumsum(~equal)[ends - 1] * cls.MISMATCH_RATIO <= ends]
+        return max(length, int(ends[-1])) if len(ends) else length
+
+    def find_groups(self):
+        usable = np.flatnonzero(self.flat[np.searchsorted(self.flat, self.hashes).clip(max=len(self.flat) - 1)] != self.hashes)
+        order = usable[np.argsort(self.hashes[usable])]
+        if not len(order):
+            return []
+        sorted_hashes = self.hashes[order]
+        starts = np.flatnonzero(np.concatenate([[True], sorted_hashes[1:] != sorted_hashes[:-1]]))
+        sizes = np.diff(np.append(starts, len(order)))
+        owner = np.repeat(np.arange(len(starts)), sizes)
+        positions = self.positions[order]
+        anchors = np.minimum.reduceat(positions, starts)[owner]
+        members = ((sizes > 1) & (sizes <= self.MAX_COPIES))[owner] & (positions != anchors)
+        anchors, deltas = anchors[members], positions[members] - anchors[members]
+        if not len(anchors):
+            return []
+
+        order = np.lexsort((anchors, deltas))
+        anchors, deltas = anchors[order], deltas[order]
+        breaks = np.flatnonzero((np.diff(deltas) != 0) | (np.diff(anchors) > self.GAP)) + 1
+        regions = {}
+        for run_anchors, run_deltas in zip(np.split(anchors, breaks), np.split(deltas, breaks)):
+            start, end, delta = int(run_anchors[0]), int(run_anchors[-1]) + self.WINDOW, int(run_deltas[0])
+            if end - start <= delta:
+                regions.setdefault((start, end), []).append(delta)
+
+        groups = []
+        for (start, end), deltas in sorted(regions.items()):
+            copies = []
+            for delta in sorted(deltas):
+                if start + delta - (copies[-1] if copies else start) >= end - start:
+                    copies.append(start + delta)
+            members = [start] + copies
+            gaps = [following - previous - (end - start) for previous, following in zip(members, members[1:])]
+            extent = min(self.GAP, start)
+            before = min([self.similar_length(self.data[start - extent:start][::-1], self.data[copy - extent:copy][::-1]) for copy in copies] + gaps)
+            extent = min(self.GAP, len(self.data) - copies[-1] - (end - start))
+            after = min([self.similar_length(self.data[end:end + extent], self.data[copy + end - start:copy + end - start + extent]) for copy in copies] +
+                        [gap - before for gap in gaps])
+            if end - start + before + after >= self.MIN_LENGTH:
+                groups.append(([start - before] + [copy - before for copy in copies], end - start + before + after))
+        return groups
+
+    def update(self, data, offset, length):
+        self.data = data
+        first, last = offset - self.WINDOW + 1, offset + length
+        low, high = np.searchsorted(self.positions, [first, last])
+        positions, hashes = self.anchors(data, first, last)
+        if not np.array_equal(positions, self.positions[low:high]) or not np.array_equal(hashes, self.hashes[low:high]):
+            self.positions = np.concatenate([self.positions[:low], positions, self.positions[high:]])
+            self.hashes = np.concatenate([self.hashes[:low], hashes, self.hashes[high:]])
+            self.stale = True
+
+    def current_groups(self):
+        if self.stale:
+            self.groups = self.find_groups()
+            self.stale = False
+        return self.groups
+
+    def linked_writes(self, offset, length):
+        for offsets, size in self.groups:
+            for start in offsets:
+                low, high = max(offset, start), min(offset + length, start + size)
+                if low < high:
+                    for other in offsets:
+                        if other != start:
+                            yield other + low - start, low - offset, high - offset
+                    break
+
+
+class DatalogReader:
+    CHUNK_ROWS = 65536
+
+    def __init__(self, file_path, channels=None):
+        self.file_path = file_path
+        self.binary = channels is not None
+        self.channels = channels
+
+        if self.binary:
+            self.columns = [f"ch{index}" for index in range(channels)]
+        else:
+            with open(file_path, 'r', errors='replace') as log_file:
+                header = log_file.readline()
+            self.delimiter = max((';', '\t', ','), key=header.count)
+            self.columns = [name.strip().strip('"') for name in header.rstrip('\r\n').split(self.delimiter)]
+
+    def iter_chunks(self, usecols):
+        if self.binary:
+            record_size = self.channels * 4
+            with open(self.file_path, 'rb') as log_file:
+                while True:
+                    chunk = log_file.read(self.CHUNK_ROWS * record_size)
+                    if len(chunk) < record_size:
+                        break
+                    records = np.frombuffer(chunk[:len(chunk) // record_size * record_size], dtype='<f4').reshape(-1, self.channels)
+                    yield records[:, usecols].astype(np.float64)
+        else:
+            with open(self.file_path, 'r', errors='replace') as log_file:
+                log_file.readline()
+                while True:
+                    lines = list(itertools.islice(log_file, self.CHUNK_ROWS))
+                    if not lines:
+                        break
+                    yield self.parse_lines(lines, usecols)
+
+    def parse_lines(self, lines, usecols):
+        try:
+            return np.loadtxt(lines, delimiter=self.delimiter, usecols=usecols, ndmin=2)
+        except ValueError:
+            rows = []
+            for line in lines:
+                fields = line.split(self.delimiter)
+                try:
+                    rows.append([float(fields[column]) for column in usecols])
+                except (IndexError, ValueError):
+                    continue
+            return np.array(rows, dtype=np.float64).reshape(-1, len(usecols))
+
+
+class HitTrace:
+    def __init__(self, x_axis, y_axis, x_conversion=None, y_conversion=None):
+        self.x_axis = np.asarray(x_axis if x_conversion is None else x_conversion.to_physical(x_axis), dtype=np.float64)
+        self.y_axis = np.asarray(y_axis if y_conversion is None else y_conversion.to_physical(y_axis), dtype=np.float64)
+        shape = (len(self.y_axis), len(self.x_axis))
+        self.counts = np.zeros(shape, dtype=np.int64)
+        self.sums = np.zeros(shape)
+        self.squares = np.zeros(shape)
+        self.minimums = np.full(shape, np.inf)
+        self.maximums = np.full(shape, -np.inf)
+        self.samples = 0
+
+    @staticmethod
+    def nearest(axis, values):
+        if len(axis) == 1:
+            return np.zeros(len(values), dtype=np.intp)
+        order = np.argsort(axis, kind='stable')
+        breakpoints = axis[order]
+        index = np.clip(np.searchsorted(breakpoints, values), 1, len(breakpoints) - 1)
+        index -= values - breakpoints[index - 1] < breakpoints[index] - values
+        return order[index]
+
+    def add(self, x_values, y_values, values=None):
+        valid = np.isfinite(x_values) & np.isfinite(y_values)
+        if values is not None:
+            valid &= np.isfinite(values)
+            values = values[valid]
+        x_values = x_values[valid]
+        y_values = y_values[valid]
+
+        cells = self.nearest(self.y_axis, y_values) * len(self.x_axis) + self.nearest(self.x_axis, x_values)
+        size = self.counts.size
+        self.counts += np.bincount(cells, minlength=size).reshape(self.counts.shape)
+        self.samples += len(cells)
+        if values is not None:
+            self.sums += np.bincount(cells, weights=values, minlength=size).reshape(self.counts.shape)
+            self.squares += np.bincount(cells, weights=values * values, minlength=size).reshape(self.counts.shape)
+            np.minimum.at(self.minimums.ravel(), cells, values)
+            np.maximum.at(self.maximums.ravel(), cells, values)
+
+    def mean(self):
+        return np.divide(self.sums, self.counts, out=np.full(self.counts.shape, np.nan), where=self.counts > 0)
+
+    def std(self):
+        mean = self.mean()
+        variance = np.divide(self.squares, self.counts, out=np.full(self.counts.shape, np.nan), where=self.counts > 0) - mean * mean
+        return np.sqrt(np.maximum(variance, 0))
+
+    @classmethod
+    def from_log(cls, reader, x_axis, y_axis, x_column, y_column, value_column=None, x_conversion=None, y_conversion=None):
+        trace = cls(x_axis, y_axis, x_conversion, y_conversion)
+        usecols = [x_column, y_column] + ([value_column] if value_column is not None else [])
+        for chunk in reader.iter_chunks(usecols):
+            trace.add(chunk[:, 0], chunk[:, 1], chunk[:, 2] if value_column is not None else None)
+        return trace
+
+
+class MapMath:
+    SMOOTH_KERNEL = np.array([[1, 2, 1], [2, 4, 2], [1, 2, 1]], dtype=np.float64) / 16
+
+    @staticmethod
+    def monotonic(axis):
+        steps = np.diff(np.asarray(axis, dtype=np.float64))
+        return np.all(steps > 0) or np.all(steps < 0)
+
+    @staticmethod
+    def positions(axis, count):
+        axis = np.asarray(axis, dtype=np.float64)
+        if len(axis) == count and count > 1 and MapMath.monotonic(axis):
+            return axis
+        return np.arange(count, dtype=np.float64)
+
+    @staticmethod
+    def interpolate(values, mask, x_axis=None, y_axis=None):
+        rows, columns = np.nonzero(mask)
+        if not len(rows):
+            return values
+        top, bottom, left, right = rows.min(), rows.max(), columns.min(), columns.max()
+        x = MapMath.positions(x_axis if x_axis is not None else [], values.shape[1])
+        y = MapMath.positions(y_axis if y_axis is not None else [], values.shape[0])
+
+        tx = (x[columns] - x[left]) / (x[right] - x[left]) if right > left else np.zeros(len(columns))
+        ty = (y[rows] - y[top]) / (y[bottom] - y[top]) if bottom > top else np.zeros(len(rows))
+        upper = values[top, left] * (1 - tx) + values[top, right] * tx
+        lower = values[bottom, left] * (1 - tx) + values[bottom, right] * tx
+
+        result = values.copy()
+        result[rows, columns] = upper * (1 - ty) + lower * ty
+        return result
+
+    @staticmethod
+    def smooth(values, mask, kernel=SMOOTH_KERNEL):
+        pad = kernel.shape[0] // 2
+        padded = np.pad(values, pad, mode='edge')
+        smoothed = np.zeros_like(values)
+        for i in range(kernel.shape[0]):
+            for j in range(kernel.shape[1]):
+                smoothed += kernel[i, j] * padded[i:i + values.shape[0], j:j + values.shape[1]]
+        return np.where(mask, smoothed, values)
+
+    @staticmethod
+    def clamp(values, mask, low, high):
+        return np.where(mask, np.clip(values, low, high), values)
+
+    @staticmethod
+    def axis_weights(old_axis, new_axis):
+        old_axis = np.asarray(old_axis, dtype=np.float64)
+        new_axis = np.asarray(new_axis, dtype=np.float64)
+        if len(old_axis) == 1:
+            zeros = np.zeros(len(new_axis), dtype=np.intp)
+            return zeros, zeros, np.zeros(len(new_axis))
+
+        order = np.argsort(old_axis, kind='stable')
+        breakpoints = old_axis[order]
+        upper = np.clip(np.searchsorted(breakpoints, new_axis), 1, len(breakpoints) - 1)
+        span = breakpoints[upper] - breakpoints[upper - 1]
+        weights = np.clip(np.divide(new_axis - breakpoints[upper - 1], span, out=np.zeros(len(new_axis)), where=span != 0), 0, 1)
+        return order[upper - 1], order[upper], weights
+
+    @staticmethod
+    def resample(values, old_x, old_y, new_x, new_y):
+        for name, axis in (("old X", old_x), ("old Y", old_y), ("new X", new_x), ("new Y", new_y)):
+            if not MapMath.monotonic(axis):
+                raise ValueError(f"The {name} axis must be strictly increasing or decreasing.")
+        left, right, tx = MapMath.axis_weights(old_x, new_x)
+        top, bottom, ty = MapMath.axis_weights(old_y, new_y)
+        upper = values[top][:, left] * (1 - tx) + values[top][:, right] * tx
+        lower = values[bottom][:, left] * (1 - tx) + values[bottom][:, right] * tx
+        return upper * (1 - ty)[:, np.newaxis] + lower * ty[:, np.newaxis]
+
+
+class SelectionStats:
+    def __init__(self, values, baseline=None):
+        values = np.asarray(values, dtype=np.int64).ravel()
+        self.count = len(values)
+        self.minimum = int(values.min()) if self.count else 0
+        self.maximum = int(values.max()) if self.count else 0
+        self.total = int(values.sum())
+        self.mean = self.total / self.count if self.count else 0.0
+        self.delta = None
+        self.changed = 0
+        if baseline is not None and len(baseline) == self.count:
+            difference = values - np.asarray(baseline, dtype=np.int64).ravel()
+            self.delta = int(difference.sum())
+            self.changed = int(np.count_nonzero(difference))
+
+    def describe(self):
+        if not self.count:
+            return "Selected: 0"
+        text = f"Selected: {self.count}  Min: {self.minimum}  Max: {self.maximum}  Mean: {self.mean:.1f}  Sum: {self.total}"
+        if self.delta is not None:
+            text += f"  \u0394: {self.delta:+d} ({self.changed} changed)"
+        return text
+
+
+class UnitConversion:
+    CACHE_SIZE = 16
+    SHORTHAND = re.compile(r'^raw\s*([*/])\s*([-+]?[\d.]+(?:e[-+]?\d+)?)\s*(?:([-+])\s*([\d.]+(?:e[-+]?\d+)?))?$', re.IGNORECASE)
+
+    def __init__(self, kind, parameters, unit="", spec=""):
+        self.kind = kind
+        self.parameters = parameters
+        self.unit = unit
+        self.spec = spec
+        self.decimals = 3
+        self.forward, self.inverse = self.compile()
+        self.cache = collections.OrderedDict()
+
+    def compile(self):
+        if self.kind == 'linear':
+            factor, offset = self.parameters
+            if not factor:
+                raise ValueError("Linear factor must not be zero.")
+            self.decimals = min(6, max(0, 1 - int(np.floor(np.log10(abs(factor))))))
+            return (lambda raw: raw * factor + offset), (lambda physical: (physical - offset) / factor)
+        if self.kind == 'rational':
+            a, b, c, d = self.parameters
+            if a * d - b * c == 0:
+                raise ValueError("Rational conversion is not invertible.")
+            return (lambda raw: (a * raw + b) / (c * raw + d)), (lambda physical: (d * physical - b) / (a - c * physical))
+        if self.kind == 'table':
+            raw_points, physical_points = (np.asarray(points, dtype=np.float64) for points in self.parameters)
+            order = np.argsort(raw_points)
+            raw_points, physical_points = raw_points[order], physical_points[order]
+            steps = np.diff(physical_points)
+            if len(raw_points) < 2 or np.any(np.diff(raw_points) == 0) or not (np.all(steps > 0) or np.all(steps < 0)):
+                raise ValueError("Table needs at least two points with distinct raw values and strictly monotonic physical values.")
+            inverse_x, inverse_y = (physical_points, raw_points) if steps[0] > 0 else (physical_points[::-1], raw_points[::-1])
+            return (lambda raw: np.interp(raw, raw_points, physical_points)), (lambda physical: np.interp(physical, inverse_x, inverse_y))
+        raise ValueError(f"Unknown conversion '{self.kind}'.")
+
+    @classmethod
+    def parse(cls, text):
+        text = text.strip()
+        unit = ""
+        match = re.search(r'\[(.*)\]$', text)
+        if match:
+            unit = match.group(1).strip()
+            text = text[:match.start()].strip()
+        if not text or text.lower() == 'raw':
+            return None
+
+        spec = f"{text} [{unit}]" if unit else text
+        match = cls.SHORTHAND.match(text.replace(" ", ""))
+        if match:
+            operator, value, sign, offset = match.groups()
+            factor = float(value) if operator == '*' else 1 / float(value)
+            offset = float(offset or 0) * (-1 if sign == '-' else 1)
+            return cls('linear', (factor, offset), unit, spec)
+
+        kind, _, arguments = text.partition(':')
+        kind = kind.strip().lower()
+        if kind == 'table':
+            pairs = [pair.split('=') for pair in arguments.split(';') if pair.strip()]
+            if any(len(pair) != 2 for pair in pairs):
+                raise ValueError("Table points must be written as raw=physical.")
+            return cls('table', ([float(raw) for raw, _ in pairs], [float(physical) for _, physical in pairs]), unit, spec)
+        values = tuple(float(value) for value in arguments.split(',') if value.strip())
+        if (kind, len(values)) not in (('linear', 2), ('rational', 4)):
+            raise ValueError(f"Cannot parse conversion '{text}'.")
+        return cls(kind, values, unit, spec)
+
+    def to_physical(self, raw):
+        raw = np.asarray(raw, dtype=np.float64)
+        key = (raw.shape, raw.tobytes())
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+        physical = self.forward(raw)
+        self.cache[key] = physical
+        if len(self.cache) > self.CACHE_SIZE:
+            self.cache.popitem(last=False)
+        return physical
+
+    def to_raw(self, physical):
+        return np.rint(self.inverse(np.asarray(physical, dtype=np.float64))).astype(np.int64)
+
+    def format(self, raw):
+        return np.char.mod(f'%.{self.decimals}f', self.to_physical(raw)).tolist()
+
+
+class CellIndex:
+    CELL_WIDTHS = {'hex8': 2, 'dec8': 3, 'hex16': 4, 'dec16_lh': 5, 'dec16_hl': 5}
+    CELL_FORMATS = {'hex8': '{:02X}', 'dec8': '{:03}', 'hex16': '{:04X}', 'dec16_lh': '{:05}', 'dec16_hl': '{:05}'}
+    VALUE_TYPES = {'hex8': 'u1', 'dec8': 'u1', 'hex16': '<u2', 'dec16_lh': '<u2', 'dec16_hl': '>u2'}
+
+    def __init__(self, display_mode='dec16_lh', num_columns=15):
+        self.configure(display_mode, num_columns)
+
+    def configure(self, display_mode, num_columns):
+        self.display_mode = display_mode
+        self.num_columns = num_columns
+        self.cell_width = self.CELL_WIDTHS[display_mode]
+        self.cell_stride = self.cell_width + 1
+        self.value_size = 1 if display_mode in ('hex8', 'dec8') else 2
+        self.row_bytes = num_columns * 2
+        self.values_per_row = self.row_bytes // self.value_size
+        self.base = 16 if display_mode in ('hex8', 'hex16') else 10
+        self.value_type = self.VALUE_TYPES[display_mode]
+        self.cell_format = self.CELL_FORMATS[display_mode]
+
+    def offset_to_cell(self, offset):
+        return divmod(offset // self.value_size, self.values_per_row)
+
+    def cell_to_offset(self, row, col):
+        return (row * self.values_per_row + col) * self.value_size
+
+    def cell_to_index(self, row, col):
+        start = col * self.cell_stride
+        return f"{row + 1}.{start}", f"{row + 1}.{start + self.cell_width}"
+
+    def offset_to_index(self, offset):
+        return self.cell_to_index(*self.offset_to_cell(offset))
+
+    def index_to_cell(self, index):
+        line, char = map(int, str(index).split('.'))
+        return line - 1, min(char // self.cell_stride, self.values_per_row - 1)
+
+    def index_to_offset(self, index):
+        return self.cell_to_offset(*self.index_to_cell(index))
+
+    def row_count(self, length):
+        return -(-(length // self.value_size) // self.values_per_row)
+
+    def parse_value(self, text):
+        return int(text, self.base)
+
+    def format_values(self, values):
+        return [self.cell_format.format(value) for value in values.tolist()]
+
+
+class FrameScheduler:
+    FRAME_INTERVAL = 16
+    FRAME_BUDGET = 0.012
+
+    def __init__(self, root, frame_interval=FRAME_INTERVAL, frame_budget=FRAME_BUDGET):
+        self.root = root
+        self.frame_interval = frame_interval
+        self.frame_budget = frame_budget
+        self.views = {}
+        self.dirty = set()
+        self.frame_id = None
+        self.last_frame = 0.0
+        self.frame_times = collections.deque(maxlen=120)
+
+    def register(self, name, callback, priority=0):
+        self.views[name] = (priority, callback)
+
+    def mark_dirty(self, *names):
+        self.dirty.update(name for name in names if name in self.views)
+        if self.dirty and self.frame_id is None:
+            delay = int((self.last_frame + self.frame_interval / 1000 - time.perf_counter()) * 1000)
+            if delay > 0:
+                self.frame_id = self.root.after(delay, self.run_frame)
+            else:
+                self.frame_id = self.root.after_idle(self.run_frame)
+
+    def run_frame(self):
+        self.frame_id = None
+        start_time = self.last_frame = time.perf_counter()
+        for name in sorted(self.dirty, key=lambda name: self.views[name][0]):
+            if time.perf_counter() - start_time > self.frame_budget:
+                break
+            self.dirty.discard(name)
+            self.views[name][1]()
+        self.frame_times.append(time.perf_counter() - start_time)
+        if self.dirty:
+            self.mark_dirty()
+
+    def flush(self):
+        while self.dirty:
+            if self.frame_id is not None:
+                self.root.after_cancel(self.frame_id)
+                self.frame_id = None
+            self.run_frame()
+
+
+class NavigationCursor:
+    def __init__(self, scheduler):
+        self.scheduler = scheduler
+        self.offset = 0
+        self.limit = 0
+
+    def set_limit(self, limit):
+        self.limit = max(0, limit)
+        self.offset = min(self.offset, self.limit)
+
+    def move(self, delta):
+        self.offset = min(max(0, self.offset + delta), self.limit)
+        self.schedule()
+
+    def jump(self, offset):
+        self.offset = min(max(0, offset), self.limit)
+        self.schedule()
+
+    def schedule(self):
+        self.scheduler.mark_dirty('cursor')
+
+
+class EventTrace:
+    TAG = 'LinOLSTrace'
+    EVENTS = ('<KeyPress>', '<KeyRelease>', '<ButtonPress>', '<ButtonRelease>', '<B1-Motion>')
+    COMMAND_CLASSES = ('Button', 'TButton', 'Checkbutton', 'TCheckbutton', 'Radiobutton', 'TRadiobutton', 'Menu', 'Menubutton')
+    DIALOGS = ((filedialog, ('askopenfilename', 'askopenfilenames', 'asksaveasfilename', 'askdirectory')),
+               (simpledialog, ('askstring', 'askinteger', 'askfloat')),
+               (messagebox, ('showinfo', 'showwarning', 'showerror', 'askyesno', 'askyesnocancel', 'askokcancel')),
+               (tk.Misc, ('clipboard_get',)))
+
+    def __init__(self, root, file_path):
+        self.root = root
+        self.file_path = file_path
+        self.trace_file = open(file_path, 'w')
+        self.start_time = time.perf_counter()
+        self.originals = {}
+        self.wrappers = set()
+        for sequence in self.EVENTS:
+            root.bind_class(self.TAG, sequence, self.record_event)
+        root.bind_all('<Map>', lambda event: self.instrument(event.widget), add='+')
+        self.instrument(root)
+        self.patch_dialogs(self.record_dialog)
+
+    def write(self, entry):
+        if self.trace_file.closed:
+            return
+        entry['t'] = round(time.perf_counter() - self.start_time, 4)
+        self.trace_file.write(json.dumps(entry) + "\n")
+
+    def record_event(self, event):
+        if not isinstance(event.widget, tk.Misc) or event.widget.winfo_class() in self.COMMAND_CLASSES:
+            return
+        self.write({'type': str(event.type), 'widget': str(event.widget), 'keysym': event.keysym if str(event.type) in ('KeyPress', 'KeyRelease') else None,
+                    'num': event.num if str(event.type) in ('ButtonPress', 'ButtonRelease') else None, 'x': event.x, 'y': event.y, 'state': event.state})
+
+    def instrument(self, widget):
+        if not isinstance(widget, tk.Misc):
+            return
+        if self.TAG not in widget.bindtags():
+            widget.bindtags((self.TAG,) + widget.bindtags())
+        if isinstance(widget, tk.Menu):
+            self.wrap_menu(widget)
+        elif widget.winfo_class() in self.COMMAND_CLASSES:
+            self.wrap_command(widget)
+        for child in widget.winfo_children():
+            self.instrument(child)
+
+    def wrap_menu(self, menu):
+        postcommand = str(menu.cget('postcommand'))
+        if postcommand and postcommand not in self.wrappers:
+            def post():
+                menu.tk.eval(postcommand)
+                self.wrap_menu(menu)
+            name = menu.register(post)
+            self.wrappers.add(name)
+            menu.configure(postcommand=name)
+
+        last = menu.index('end')
+        for index in range(0 if last is None else last + 1):
+            if menu.type(index) in ('command', 'checkbutton', 'radiobutton'):
+                self.wrap_command(menu, index)
+
+    def wrap_command(self, widget, index=None):
+        try:
+            command = str(widget.cget('command') if index is None else widget.entrycget(index, 'command'))
+        except tk.TclError:
+            return
+        if command in self.wrappers:
+            return
+
+        label = None if index is None else widget.entrycget(index, 'label')
+
+        def invoke():
+            self.write({'type': 'command', 'widget': str(widget), 'label': label})
+            if command:
+                return widget.tk.eval(command)
+
+        name = widget.register(invoke)
+        self.wrappers.add(name)
+        if index is None:
+            widget.configure(command=name)
+        else:
+            widget.entryconfigure(index, command=name)
+
+    def patch_dialogs(self, handler):
+        for module, names in self.DIALOGS:
+            for name in names:
+                original = getattr(module, name)
+                self.originals[(module, name)] = original
+                setattr(module, name, lambda *args, name=name, original=original, **kwargs: handler(name, original, args, kwargs))
+
+    def restore_dialogs(self):
+        for (module, name), original in self.originals.items():
+            setattr(module, name, original)
+        self.originals.clear()
+
+    def record_dialog(self, name, original, args, kwargs):
+        try:
+            result = original(*args, **kwargs)
+        except tk.TclError as e:
+            self.write({'type': 'dialog', 'name': name, 'error': str(e)})
+            raise
+        self.write({'type': 'dialog', 'name': name, 'result': list(result) if isinstance(result, tuple) else result})
+        return result
+
+    def stop(self):
+        for sequence in self.EVENTS:
+            self.root.unbind_class(self.TAG, sequence)
+        self.root.unbind_all('<Map>')
+        self.restore_dialogs()
+        self.trace_file.close()
+
+
+class TraceReplayer:
+    def __init__(self, root, app, file_path, realtime=False):
+        self.root = root
+        self.app = app
+        self.realtime = realtime
+        with open(file_path, 'r') as trace_file:
+            entries = [json.loads(line) for line in trace_file if line.strip()]
+        self.events = [entry for entry in entries if entry['type'] != 'dialog']
+        self.dialog_results = [entry for entry in entries if entry['type'] == 'dialog']
+        self.results = []
+
+    def answer_dialog(self, name, original, args, kwargs):
+        while self.dialog_results:
+            entry = self.dialog_results.pop(0)
+            if entry['name'] == name:
+                if 'error' in entry:
+                    raise tk.TclError(entry['error'])
+                return tuple(entry['result']) if isinstance(entry['result'], list) else entry['result']
+        return None
+
+    def invoke_command(self, widget, label):
+        if label is None:
+            return widget.invoke()
+        last = widget.index('end')
+        for index in range(0 if last is None else last + 1):
+            if widget.type(index) not in ('separator', 'tearoff') and widget.entrycget(index, 'label') == label:
+                return widget.invoke(index)
+        raise KeyError(label)
+
+    def settle(self):
+        self.root.update_idletasks()
+        self.app.scheduler.flush()
+        self.root.update()
+
+    def replay(self):
+        recorder = EventTrace.__new__(EventTrace)
+        recorder.originals = {}
+        recorder.patch_dialogs(self.answer_dialog)
+        try:
+            self.settle()
+            replay_start = time.perf_counter()
+            for index, entry in enumerate(self.events):
+                while self.realtime and time.perf_counter() - replay_start < entry['t']:
+                    self.root.update()
+                    time.sleep(0.001)
+                try:
+                    widget = self.root.nametowidget(entry['widget'])
+                except KeyError:
+                    self.results.append({'index': index, 'type': entry['type'], 'detail': entry['widget'], 'ms': None})
+                    continue
+
+                if entry['type'] == 'command':
+                    start_time = time.perf_counter()
+                    try:
+                        self.invoke_command(widget, entry['label'])
+                    except KeyError:
+                        self.results.append({'index': index, 'type': 'command', 'detail': entry['label'], 'ms': None})
+                        continue
+                    self.settle()
+                    self.results.append({'index': index, 'type': 'command', 'detail': entry['label'] or entry['widget'],
+                                         'ms': (time.perf_counter() - start_time) * 1000})
+                    continue
+
+                options = {'x': entry['x'], 'y': entry['y'], 'state': entry['state']}
+                if entry['keysym']:
+                    options['keysym'] = entry['keysym']
+                    widget.focus_force()
+                if entry['num']:
+                    options['button'] = entry['num']
+                sequence = '<Motion>' if entry['type'] == 'Motion' else f"<{entry['type']}>"
+
+                start_time = time.perf_counter()
+                widget.event_generate(sequence, when='now', **options)
+                self.settle()
+                self.results.append({'index': index, 'type': entry['type'], 'detail': entry['keysym'] or entry['widget'],
+                                     'ms': (time.perf_counter() - start_time) * 1000})
+        finally:
+            recorder.restore_dialogs()
+        return self.results
+
+    @staticmethod
+    def summarize(results):
+        summary = {}
+        for result in results:
+            if result['ms'] is not None:
+                detailed = result['type'].startswith('Key') or result['type'] == 'command'
+                summary.setdefault(f"{result['type']} {result['detail']}" if detailed else result['type'], []).append(result['ms'])
+        return {name: {'count': len(values), 'median': float(np.median(values)), 'p95': float(np.percentile(values, 95)), 'max': float(np.max(values))}
+                for name, values in sorted(summary.items())}
+
+    @staticmethod
+    def compare(baseline, current):
+        lines = []
+        for name, stats in current.items():
+            before = baseline.get(name)
+            if before:
+                change = (stats['median'] - before['median']) / max(before['median'], 1e-6) * 100
+                lines.append(f"{name:40} {before['median']:8.2f} -> {stats['median']:8.2f} ms median ({change:+.0f}%), p95 {before['p95']:.2f} -> {stats['p95']:.2f}")
+            else:
+                lines.append(f"{name:40} {'':8}    {stats['median']:8.2f} ms median (new)")
+        return lines
+
+    @classmethod
+    def main(cls, arguments):
+        parser = argparse.ArgumentParser(prog="LinOLS.py replay",
+                                         description="Replay a recorded LinOLS session and report per-interaction latency. "
+                                                     "Needs an X display; run headless with: xvfb-run -a python LinOLS.py replay trace.jsonl")
+        parser.add_argument("trace")
+        parser.add_argument("--report", help="write the latency summary as JSON")
+        parser.add_argument("--baseline", help="compare against an earlier JSON report")
+        parser.add_argument("--realtime", action="store_true", help="keep the recorded timing between events (needed for press-and-hold auto-skip)")
+        options = parser.parse_args(arguments)
+
+        root = tk.Tk(className='LinOLS')
+        app = LinOLS(root)
+        globals()['LinOLS'] = app
+        results = cls(root, app, options.trace, options.realtime).replay()
+        root.destroy()
+
+        summary = cls.summarize(results)
+        for name, stats in summary.items():
+            print(f"{name:40} n={stats['count']:5} median {stats['median']:8.2f} ms  p95 {stats['p95']:8.2f} ms  max {stats['max']:8.2f} ms")
+        skipped = sum(result['ms'] is None for result in results)
+        if skipped:
+            print(f"{skipped} events skipped (widget or menu entry not found)")
+        if options.report:
+            with open(options.report, 'w') as report_file:
+                json.dump({'summary': summary, 'results': results}, report_file, indent=1)
+        if options.baseline:
+            with open(options.baseline, 'r') as baseline_file:
+                print("\n".join(cls.compare(json.load(baseline_file)['summary'], summary)))
+        return 0
+
+
+class EngineServer:
+    METHODS = ('open', 'close', 'status', 'read', 'extract', 'maps', 'diff', 'identify', 'layout', 'stats', 'overview')
+
+    def __init__(self, socket_path, workers=None, memory_budget=Workspace.MEMORY_BUDGET):
+        self.socket_path = socket_path
+        self.workspace = Workspace(memory_budget)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.mtimes = {}
+        self.pool = ThreadPoolExecutor(max_workers=workers or os.cpu_count())
+        self.methods = {name: getattr(self, 'rpc_' + name) for name in self.METHODS}
+
+    def document(self, path):
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)
+        with self.lock:
+            document = self.workspace.find(path)
+            if document is not None and self.mtimes[path] != mtime:
+                self.workspace.remove(document)
+                document = None
+            if document is None:
+                document = self.workspace.add(Document(path))
+                self.mtimes[path] = mtime
+            self.workspace.activate(document)
+        return document
+
+    def cached(self, document, key, compute, nbytes=0):
+        value = document.cached(key)
+        if value is None:
+            value = compute()
+            with self.lock:
+                document.cache(key, value, nbytes(value) if callable(nbytes) else nbytes)
+                self.workspace.enforce_budget()
+        return value
+
+    def fingerprints(self):
+        if getattr(self.local, 'fingerprints', None) is None:
+            self.local.fingerprints = FingerprintIndex()
+        return self.local.fingerprints
+
+    def rpc_open(self, path):
+        document = self.document(path)
+        digest = self.cached(document, 'digest', lambda: TuneCatalog.digest(document.image.data))
+        return {'path': document.path, 'size': len(document.image), 'digest': digest}
+
+    def rpc_close(self, path):
+        with self.lock:
+            document = self.workspace.find(path)
+            if document is not None:
+                self.workspace.remove(document)
+        return document is not None
+
+    def rpc_status(self):
+        with self.lock:
+            return {'documents': [{'path': document.path, 'size': len(document.image), 'cache_bytes': document.cache_size(),
+                                   'caches': [str(key) for key in document.caches]} for document in self.workspace.documents],
+                    'cache_bytes': self.workspace.cache_size(), 'memory_budget': self.workspace.memory_budget}
+
+    def rpc_read(self, path, offset, count, dtype='<u2'):
+        return self.document(path).image.read(offset, count, dtype).tolist()
+
+    def rpc_maps(self, path):
+        document = self.document(path)
+        maps = self.cached(document, 'maps', lambda: self.fingerprints().load_maps(document.path))
+        return {name: {'offset': definition.offset, 'rows': definition.rows, 'columns': definition.columns, 'dtype': definition.dtype.str}
+                for name, definition in maps.items()}
+
+    def rpc_extract(self, path, name=None, offset=None, rows=None, columns=None, dtype='<u2'):
+        document = self.document(path)
+        if name is not None:
+            maps = self.cached(document, 'maps', lambda: self.fingerprints().load_maps(document.path))
+            if name not in maps:
+                raise ValueError(f"Map {name} is not defined for {document.name}.")
+            definition = maps[name]
+        else:
+            definition = MapDefinition('', offset, rows, columns, dtype)
+        return definition.view(document.image.data).tolist()
+
+    def rpc_diff(self, path, other):
+        document = self.document(path)
+        other_document = self.document(other)
+        if len(document.image) != len(other_document.image):
+            raise ValueError("Images must have the same size.")
+
+        def runs():
+            patch = TunePatch.create(other_document.image.data, document.image.data)
+            return [[offset, length] for offset, length in zip(patch.offsets.tolist(), patch.lengths.tolist())]
+        return self.cached(document, ('diff', other_document.path, self.mtimes[other_document.path]), runs, lambda value: len(value) * 16)
+
+    def rpc_identify(self, path, limit=5):
+        document = self.document(path)
+        return self.cached(document, ('identify', limit), lambda: self.fingerprints().identify(document.image.data, limit))
+
+    def rpc_layout(self, path, offset=0, length=4096):
+        document = self.document(path)
+        offset -= offset % 2
+        return self.cached(document, ('layout', offset, length), lambda: LayoutAnalyzer.analyze(document.image.read(offset, length)))
+
+    def rpc_stats(self, path, offset, count, dtype='<u2', reference=None):
+        document = self.document(path)
+        values = document.image.read(offset, count, dtype)
+        baseline = self.document(reference).image.read(offset, count, dtype) if reference else None
+        stats = SelectionStats(values, baseline)
+        return {'count': stats.count, 'min': stats.minimum, 'max': stats.maximum, 'mean': stats.mean, 'sum': stats.total,
+                'delta': stats.delta, 'changed': stats.changed}
+
+    def rpc_overview(self, path):
+        document = self.document(path)
+
+        def regions():
+            overview = StructureOverview.load_or_compute(document.image.data)
+            starts = np.concatenate([[0], np.flatnonzero(np.diff(overview.classes)) + 1])
+            ends = np.concatenate([starts[1:], [len(overview.classes)]])
+            return [{'class': StructureOverview.CLASSES[overview.classes[start]], 'offset': int(start) * overview.block_size,
+                     'length': int(end - start) * overview.block_size} for start, end in zip(starts, ends)]
+        return self.cached(document, 'overview', regions, lambda value: len(value) * 64)
+
+    def call(self, request):
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict) or request.get('jsonrpc') != '2.0' or not isinstance(request.get('method'), str):
+                return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32600, 'message': "Invalid request."}}
+            method = self.methods.get(request['method'])
+            if method is None:
+                return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32601, 'message': f"Unknown method {request['method']}."}}
+            params = request.get('params', {})
+            result = method(*params) if isinstance(params, list) else method(**params)
+        except TypeError as e:
+            return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32602, 'message': str(e)}}
+        except (OSError, ValueError, KeyError, sqlite3.Error) as e:
+            return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32000, 'message': str(e)}}
+        except Exception as e:
+            traceback.print_exc()
+            return {'jsonrpc': '2.0', 'id': request_id, 'error': {'code': -32603, 'message': f"Internal error: {e}"}}
+        if 'id' not in request:
+            return None
+        return {'jsonrpc': '2.0', 'id': request_id, 'result': result}
+
+    def handle_line(self, line):
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            return {'jsonrpc': '2.0', 'id': None, 'error': {'code': -32700, 'message': f"Parse error: {e}"}}
+        if isinstance(message, list):
+            responses = [response for response in (self.call(request) for request in message) if response is not None]
+            return responses or None
+        return self.call(message)
+
+    def handle_connection(self, connection):
+        write_lock = threading.Lock()
+        pending = []
+
+        def answer(line):
+            response = self.handle_line(line)
+            if response is not None:
+                with write_lock:
+                    stream.write(json.dumps(response).encode() + b'\n')
+                    stream.flush()
+
+        with connection, connection.makefile('rwb') as stream:
+            for line in stream:
+                if not line.strip():
+                    continue
+                pending = [future for future in pending if not future.done()]
+                pending.append(self.pool.submit(answer, line))
+            wait(pending)
+
+    def serve_forever(self):
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        os.makedirs(os.path.dirname(os.path.abspath(self.socket_path)), exist_ok=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        listener.listen()
+        try:
+            while True:
+                connection, _ = listener.accept()
+                threading.Thread(target=self.handle_connection, args=(connection,), daemon=True).start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            listener.close()
+            os.unlink(self.socket_path)
+            self.pool.shutdown(wait=False)
+
+    @classmethod
+    def main(cls, arguments):
+        parser = argparse.ArgumentParser(prog="LinOLS.py serve",
+                                         description="Keep images and analysis caches resident and answer newline-delimited JSON-RPC 2.0 "
+                                                     "requests (single or batch) on a Unix socket. Responses to pipelined requests may arrive out of order; "
+                                                     "match them by id. Methods: " + ", ".join(cls.METHODS))
+        parser.add_argument("--socket", default=os.path.join(LINOLS_HOME, 'engine.sock'))
+        parser.add_argument("--workers", type=int, help="requests handled concurrently across all connections (default: CPU count)")
+        parser.add_argument("--budget", type=int, default=Workspace.MEMORY_BUDGET // (1024 * 1024), help="analysis cache budget in MB")
+        options = parser.parse_args(arguments)
+
+        server = cls(options.socket, options.workers, options.budget * 1024 * 1024)
+        print(f"LinOLS engine listening on {options.socket}")
+        server.serve_forever()
+        return 0
 
 
 class LinOLS:
+    FILL_ROWS = 2000
+
     def __init__(self, root):
         self.root = root
         self.arrow_keys_enabled = True
         self.check_auto_skip_id = None
-        self.arrow_key_state = None
         self.root.title("LinOLS")
         self.file_path = ""
+        self.image = None
+        self.overview = None
+        self.workspace = Workspace()
+        self.background = ThreadPoolExecutor(max_workers=1)
+        self.scheduler = FrameScheduler(root)
+        self.cursor = NavigationCursor(self.scheduler)
+        self.scheduler.register('plot_size', self.update_2d_canvas_size, 0)
+        self.scheduler.register('text', self.display_file, 0)
+        self.scheduler.register('fill', self.fill_text_rows, 0)
+        self.scheduler.register('plot', self.display_line_plot, 1)
+        self.scheduler.register('plot_refresh', lambda: self.display_line_plot(self.plot_offset), 1)
+        self.scheduler.register('changes', self.apply_image_changes, 1)
+        self.scheduler.register('cursor', lambda: self.render_cursor(self.cursor.offset), 2)
+        self.scheduler.register('highlight', self.highlight_visible_rows, 2)
+        self.scheduler.register('buttons', self.update_navigation_buttons, 4)
+        self.scheduler.register('selection', self.update_selection_stats, 5)
+        self.selection_stats = None
+        self.highlighted_rows = None
+        self.filled_rows = np.zeros(0, dtype=bool)
+        self.changed_ranges = []
+        self.copied_source = None
+        self.map_source = None
+        self.catalog_notified = set()
+        self.invalid_rows = set()
         self.current_offset = 0
+        self.plot_offset = 0
+        self.plot_span = 0
+        self.plot_step = 0
         self.num_columns = 15
         self.display_mode = 'dec16_lh'
         screen_width = root.winfo_screenwidth()
@@ -148,7 +2755,13 @@ class LinOLS:
         file_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="File", menu=file_menu)
         file_menu.add_command(label="Open", command=self.open_file)
-        file_menu.add_command(label="Save", command=self.save_file)
+        file_menu.add_command(label="Save", command=self.quick_save, accelerator="Ctrl+S")
+        file_menu.add_command(label="Save As", command=self.save_file)
+        file_menu.add_command(label="Tune catalog", command=self.open_catalog)
+        self.atomic_save = tk.BooleanVar(value=False)
+        self.name_from_vehicle = tk.BooleanVar(value=True)
+        file_menu.add_checkbutton(label="Atomic save (temp file and rename)", variable=self.atomic_save)
+        file_menu.add_checkbutton(label="Name saved files from vehicle data", variable=self.name_from_vehicle)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=root.destroy)
 
@@ -156,10 +2769,38 @@ class LinOLS:
         menu_bar.add_cascade(label="Options", menu=options_menu)
         options_menu.add_command(label="Differences", command=self.compare)
         options_menu.add_command(label="Import file", command=self.import_file)
+        options_menu.add_command(label="Compare variants", command=self.compare_variants)
+        options_menu.add_command(label="Detect layout", command=self.detect_layout)
+        options_menu.add_command(label="Mirrored maps", command=self.show_mirrors)
+        self.link_mirrors = tk.BooleanVar(value=True)
+        options_menu.add_checkbutton(label="Linked editing of mirrored maps", variable=self.link_mirrors)
+        options_menu.add_command(label="Attach reference image", command=self.attach_reference)
+        options_menu.add_command(label="Detach reference image", command=self.detach_reference)
+        options_menu.add_command(label="Next difference", command=lambda: self.jump_to_difference(1), accelerator="F3")
+        options_menu.add_command(label="Previous difference", command=lambda: self.jump_to_difference(-1), accelerator="Shift+F3")
+        options_menu.add_separator()
+        options_menu.add_command(label="Index fingerprint library", command=self.index_library)
+        options_menu.add_command(label="Identify image", command=self.identify_image)
+        options_menu.add_command(label="Save map definitions to library", command=self.store_library_maps)
+        options_menu.add_separator()
+        options_menu.add_command(label="Export patch", command=self.export_patch)
+        options_menu.add_command(label="Apply patch", command=self.apply_patch)
+        options_menu.add_command(label="Apply patch to files", command=self.apply_patch_to_files)
+        options_menu.add_separator()
+        options_menu.add_command(label="Copy selection to binary file", command=self.copy_binary)
+        options_menu.add_command(label="Paste binary file", command=self.paste_binary)
+        options_menu.add_separator()
+        options_menu.add_command(label="Script console", command=self.open_script_console)
+        options_menu.add_command(label="Run script file", command=self.run_script_file)
+
+        self.window_menu = tk.Menu(menu_bar, tearoff=0, postcommand=self.update_window_menu)
+        menu_bar.add_cascade(label="Window", menu=self.window_menu)
+        self.active_document = tk.IntVar(value=-1)
 
         info_menu = tk.Menu(menu_bar, tearoff=0)
         menu_bar.add_cascade(label="Info", menu=info_menu)
         info_menu.add_command(label="About", command=self.show_about_info)
+        info_menu.add_command(label="Record session trace", command=self.toggle_recording)
 
         frame_tab1 = tk.Frame(tab1)
         frame_tab1.grid(row=0, column=0, padx=10, pady=10, sticky=tk.NSEW)
@@ -167,12 +2808,22 @@ class LinOLS:
         self.text_widget = HighlightText(frame_tab1, wrap=tk.NONE, height=31, width=125, bg=self.theme['bg'], fg=self.theme['fg'], bd=0, highlightthickness=0)
         self.text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.text_widget.configure(insertbackground='white', font=("Inconsolata", 10))
-        self.text_widget.configure(undo=True)
+        self.cell_index = self.text_widget.cell_index
+        self.text_widget.bind('<Control-c>', lambda event: self.copy_values(event) or "break")
+        self.text_widget.bind('<Control-v>', lambda event: self.paste_values(event) or "break")
+        self.text_widget.bind('<Control-z>', lambda event: self.undo() or "break")
+        self.text_widget.bind('<Control-y>', lambda event: self.redo() or "break")
 
         scrollbar = tk.Scrollbar(frame_tab1, orient=tk.VERTICAL, command=self.text_widget.yview)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
 
-        self.text_widget.config(yscrollcommand=scrollbar.set)
+        self.text_overview_strip = OverviewStrip(frame_tab1, self.jump_to_offset)
+        self.text_overview_strip.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text_minimap = DifferenceMinimap(frame_tab1, self.jump_to_offset)
+        self.text_minimap.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.text_widget.config(yscrollcommand=lambda *args: (scrollbar.set(*args), self.scheduler.mark_dirty('fill', 'highlight')))
 
         tab1.grid_rowconfigure(0, weight=1)
         tab1.grid_columnconfigure(0, weight=1)
@@ -197,6 +2848,11 @@ class LinOLS:
 
         self.column_entry.bind("<FocusOut>", lambda event: self.apply_columns_auto())
 
+        root.bind('<Control-s>', lambda event: self.quick_save())
+        root.bind('<F3>', lambda event: self.jump_to_difference(1))
+        root.bind('<Shift-F3>', lambda event: self.jump_to_difference(-1))
+        root.bind('<Control-Tab>', lambda event: self.cycle_documents(1) or "break")
+        root.bind('<Control-w>', lambda event: self.close_document())
         root.bind('m', lambda event: self.adjust_columns(1))
         root.bind('w', lambda event: self.adjust_columns(-1))
 
@@ -221,16 +2877,80 @@ class LinOLS:
         self.selected_count_label = tk.Button(display_mode_buttons_frame, text="Selected: 0", bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
         self.selected_count_label.grid(row=2, column=14, sticky=tk.W)
 
+        tk.Button(display_mode_buttons_frame, text="Next Data", command=self.jump_to_next_data, bg=self.theme['btn_bg'], fg=self.theme['btn_fg']).grid(row=2, column=15, sticky=tk.W, padx=1)
+        self.block_info_label = tk.Label(display_mode_buttons_frame, text="", bg=self.theme['bg'], fg=self.theme['fg'])
+        self.block_info_label.grid(row=2, column=16, sticky=tk.W, padx=5)
+
         display_mode_buttons_frame.config(bg=self.theme['bg'])
 
         self.apply_theme(self.theme)
 
-        tab2 = tk.Frame(self.notebook, bg=self.theme['bg'])
-        self.notebook.add(tab2, text="2D")
+        self.tab2 = tk.Frame(self.notebook, bg=self.theme['bg'])
+        self.notebook.add(self.tab2, text="2D")
+        self.tab3 = tk.Frame(self.notebook, bg=self.theme['bg'])
+        self.notebook.add(self.tab3, text="3D")
+        self.tab_builders = {str(self.tab2): self.build_2d_tab, str(self.tab3): self.build_3d_tab}
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self.build_tab(self.notebook.select()))
+
+        self.canvas_line = None
+        self.minimaps = [self.text_minimap]
+        self.overview_strips = [self.text_overview_strip]
+        self.startup_ms = None
+        self.recorder = None
+        self.journal_flush = None
+        self.propagating = False
+        self.mirror_refresh = None
+
+        self.clicked_line = None
+
+        self.notebook.bind("<Configure>", lambda event: self.scheduler.mark_dirty('plot_size'))
 
+        self.auto_skip_interval = 10
+        self.auto_skip_running = False
+        self.auto_skip_start_time = 0
+        self.check_auto_skip_id = None
+
+        self.auto_skip_interval_previous = 10
+        self.auto_skip_running_previous = False
+        self.auto_skip_start_time_previous = 0
+        self.check_auto_skip_id_previous = None
+
+        self.text_widget.bind('<KeyRelease>', self.check_value_changes)
+        self.text_widget.bind('<FocusOut>', lambda event: self.restore_invalid_rows(), add='+')
+
+        root.bind('<Left>', self.navigate_2d_left)
+        root.bind('<Right>', self.navigate_2d_right)
+
+        root.bind('<i>', self.toggle_arrow_keys)
+
+        root.protocol("WM_DELETE_WINDOW", self.exit_application)
+        root.after_idle(self.recover_journals)
+
+        self.notebook.bind("<Enter>", self.on_tab_enter)
+        self.notebook.bind("<Leave>", self.on_tab_leave)
+
+        self.text_widget.bind('<<Selection>>', lambda event: self.scheduler.mark_dirty('selection'))
+
+        self.tabs_widgets = [self.notebook.nametowidget(tab) for tab in self.notebook.tabs()]
+
+    def build_tab(self, tab_name):
+        builder = self.tab_builders.pop(tab_name, None)
+        if builder:
+            builder()
+
+    def build_2d_tab(self):
+        tab2 = self.tab2
         self.canvas_line = tk.Canvas(tab2, bg="#333333", height=400, width=400, relief=tk.SOLID, bd=0, highlightthickness=0)
         self.canvas_line.grid(row=0, column=0, rowspan=1, padx=10, sticky=tk.NSEW)
 
+        self.line_minimap = DifferenceMinimap(tab2, self.jump_to_offset)
+        self.line_minimap.grid(row=0, column=1, sticky=tk.NS)
+        self.minimaps = [self.text_minimap, self.line_minimap]
+
+        self.line_overview_strip = OverviewStrip(tab2, self.jump_to_offset)
+        self.line_overview_strip.grid(row=0, column=2, sticky=tk.NS)
+        self.overview_strips = [self.text_overview_strip, self.line_overview_strip]
+
         self.navigation_buttons_frame = tk.Frame(tab2, bg=self.theme['bg'])
         self.navigation_buttons_frame.grid(row=1, column=0, columnspan=6, pady=5, sticky=tk.W)
         self.button_previous = tk.Button(self.navigation_buttons_frame, text="Previous", command=self.navigate_previous,
@@ -242,16 +2962,30 @@ class LinOLS:
 
         self.load_and_update = tk.Button(self.navigation_buttons_frame, text="Load and Update", command=self.load_and_update, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
         self.load_and_update.grid(row=0, column=2, padx=5)
-        root.update()
         self.value_label = tk.Label(self.navigation_buttons_frame, text="", font=("Arial", 12), bg=self.theme['bg'])
-        self.value_label.grid(row=0, column=3, padx=root.winfo_width() / 2)
+        self.value_label.grid(row=0, column=3, padx=self.root.winfo_width() / 2)
 
         tab2.grid_rowconfigure(0, weight=1)
         tab2.grid_columnconfigure(0, weight=1)
 
-        tab3 = tk.Frame(self.notebook, bg=self.theme['bg'])
-        self.notebook.add(tab3, text="3D")
+        self.clickable_line = self.canvas_line.create_line(0, 0, 0, 0, fill="#bd090e", width=1, tags="clickable_line")
+
+        self.button_next.bind("<Button-1>", self.start_auto_skip)
+        self.button_next.bind("<ButtonRelease-1>", self.stop_auto_skip)
+
+        self.button_previous.bind("<Button-1>", self.start_auto_skip_previous)
+        self.button_previous.bind("<ButtonRelease-1>", self.stop_auto_skip_previous)
+
+        self.update_2d_canvas_size()
+        if self.image:
+            self.show_minimaps([self.line_minimap])
+            if self.overview:
+                self.line_overview_strip.show(self.overview)
+            self.update_navigation_buttons()
+            self.cursor.schedule()
 
+    def build_3d_tab(self):
+        tab3 = self.tab3
         self.boxes = tk.Frame(tab3, bg=self.theme['bg'])
         self.boxes.grid(row=0, column=0, padx=10, pady=10, sticky='nw')
         tab3.grid_columnconfigure(0, weight=1)
@@ -321,11 +3055,14 @@ class LinOLS:
             self.original_Y.append("00000")
 
 
-        self.fig = plt.figure()
-        self.ax = self.fig.add_subplot(111, projection='3d')
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.right_frame)
-        self.canvas_widget = self.canvas.get_tk_widget()
-        self.canvas_widget.pack(fill="both", expand=True)
+        self.heatmap = HeatmapCanvas(self.right_frame, self.select_heatmap_cell)
+        self.heatmap.pack(fill="both", expand=True)
+        self.scheduler.register('heatmap', self.refresh_heatmap, 3)
+        self.scheduler.register('map_selection', self.update_map_stats, 5)
+        self.fig = None
+        self.surface_visible = False
+        self.show_physical = False
+        self.conversions = {'map': None, 'x': None, 'y': None}
 
         self.start_x = None
         self.start_y = None
@@ -373,6 +3110,12 @@ class LinOLS:
         self.copy_selected_button = tk.Button(buttons_frame, text="Copy Selected", command=self.copy_selected_cells, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
         self.copy_selected_button.grid(row=0, column=12, padx=5)
 
+        self.heatmap_mode_button = tk.Button(buttons_frame, text="Delta View", command=self.toggle_heatmap_mode, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.heatmap_mode_button.grid(row=0, column=13, padx=5)
+
+        self.surface_button = tk.Button(buttons_frame, text="3D Surface", command=self.toggle_surface, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.surface_button.grid(row=0, column=14, padx=5)
+
         self.increase_button = tk.Button(buttons_frame, text="+", command=self.increase_selected_text, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
         self.increase_button.grid(row=1, column=0)
 
@@ -401,75 +3144,70 @@ class LinOLS:
         self.percent_entry = tk.Entry(buttons_frame, width=5)
         self.percent_entry.grid(row=1, column=9)
 
-        tab3.grid_rowconfigure(0, weight=1)
-        tab3.grid_columnconfigure(0, weight=1)
+        self.datalog_button = tk.Button(buttons_frame, text="Datalog", command=self.import_datalog, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.datalog_button.grid(row=1, column=10, padx=5)
 
-        self.clickable_line = self.canvas_line.create_line(0, 0, 0, 0, fill="#bd090e", width=1, tags="clickable_line")
+        self.clear_datalog_button = tk.Button(buttons_frame, text="Clear Datalog", command=self.clear_datalog, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.clear_datalog_button.grid(row=1, column=11, padx=5)
+        self.interpolate_button = tk.Button(buttons_frame, text="Interpolate", command=self.interpolate_selection, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.interpolate_button.grid(row=2, column=0, columnspan=2, pady=5)
 
-        self.clicked_line = None
+        self.smooth_button = tk.Button(buttons_frame, text="Smooth", command=self.smooth_selection, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.smooth_button.grid(row=2, column=2, columnspan=2, pady=5)
 
-        self.notebook.bind("<Configure>", lambda event: self.update_2d_canvas_size())
+        self.clamp_button = tk.Button(buttons_frame, text="Clamp", command=self.clamp_selection, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.clamp_button.grid(row=2, column=4, pady=5)
 
-        self.auto_skip_interval = 10
-        self.auto_skip_running = False
-        self.auto_skip_start_time = 0
-        self.check_auto_skip_id = None
+        self.clamp_min_entry = tk.Entry(buttons_frame, width=5)
+        self.clamp_min_entry.grid(row=2, column=5, pady=5)
 
-        self.auto_skip_interval_previous = 10
-        self.auto_skip_running_previous = False
-        self.auto_skip_start_time_previous = 0
-        self.check_auto_skip_id_previous = None
+        self.clamp_max_entry = tk.Entry(buttons_frame, width=5)
+        self.clamp_max_entry.grid(row=2, column=6, pady=5)
 
-        self.button_next.bind("<Button-1>", self.start_auto_skip)
-        self.button_next.bind("<ButtonRelease-1>", self.stop_auto_skip)
+        self.rescale_axes_button = tk.Button(buttons_frame, text="Rescale Axes", command=self.rescale_axes, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.rescale_axes_button.grid(row=2, column=7, columnspan=2, padx=5, pady=5)
 
-        self.button_previous.bind("<Button-1>", self.start_auto_skip_previous)
-        self.button_previous.bind("<ButtonRelease-1>", self.stop_auto_skip_previous)
+        self.units_button = tk.Button(buttons_frame, text="Units", command=self.edit_conversions, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.units_button.grid(row=2, column=9, padx=5, pady=5)
 
-        root.bind('<Left>', self.navigate_2d)
-        root.bind('<Right>', self.navigate_2d)
+        self.physical_button = tk.Button(buttons_frame, text="Physical", command=self.toggle_physical, bg=self.theme['btn_bg'], fg=self.theme['btn_fg'])
+        self.physical_button.grid(row=2, column=10, padx=5, pady=5)
 
-        self.text_widget.bind('<KeyRelease>', self.check_value_changes)
+        self.map_stats_label = tk.Label(buttons_frame, text="Selected: 0", bg=self.theme['bg'], fg=self.theme['fg'])
+        self.map_stats_label.grid(row=2, column=11, columnspan=6, padx=5, sticky=tk.W)
 
-        self.arrow_key_state = None
+        self.hit_trace = None
+        self.entry_highlight_defaults = {option: self.entry_widgets[0][0].cget(option) for option in ("highlightthickness", "highlightbackground", "highlightcolor")}
 
-        root.bind('<Left>', lambda event: self.set_arrow_key_state(event, 'left'))
-        root.bind('<Right>', lambda event: self.set_arrow_key_state(event, 'right'))
-        root.bind('<KeyRelease-Left>', lambda event: self.set_arrow_key_state(event, None))
-        root.bind('<KeyRelease-Right>', lambda event: self.set_arrow_key_state(event, None))
-
-        self.root.after(50, lambda: self.update_on_arrow_key())
-
-        root.bind('<i>', self.toggle_arrow_keys)
-
-        self.update_2d_canvas_size()
-
-        root.protocol("WM_DELETE_WINDOW", self.exit_application)
-
-        self.notebook.bind("<Enter>", self.on_tab_enter)
-        self.notebook.bind("<Leave>", self.on_tab_leave)
-
-        self.text_widget.bind('<ButtonRelease-1>', self.show_selected_number)
-        self.text_widget.bind('<Motion>', self.update_selected_count)
+        tab3.grid_rowconfigure(0, weight=1)
+        tab3.grid_columnconfigure(0, weight=1)
 
-        self.tabs_widgets = []
-        for index in range(len(self.notebook.tabs())):
-            frame = self.notebook.nametowidget(self.notebook.tabs()[index])
-            text_widget = frame.winfo_children()[0]
-            self.tabs_widgets.append(text_widget)
-
-    def show_selected_number(self, event):
-        if self.text_widget.tag_ranges("sel"):
-            selected_text = self.text_widget.get("sel.first", "sel.last")
+        self.refresh_heatmap()
 
+    def update_selection_stats(self):
+        if not self.image or not self.text_widget.tag_ranges("sel"):
+            self.selection_stats = None
+            self.selected_count_label.config(text="Selected: 0")
+            return
 
-    def update_selected_count(self, event):
-        if self.text_widget.tag_ranges("sel"):
-            selected_text = self.text_widget.get("sel.first", "sel.last")
-        else:
-            selected_text = ""
-        selected_count = len(selected_text.split())
-        self.selected_count_label.config(text=f"Selected: {selected_count}")
+        start, end = self.selected_range()
+        document = self.workspace.active
+        key = (start, end, self.cell_index.value_type, self.image.version, document.reference)
+        if self.selection_stats is None or self.selection_stats[0] != key:
+            count = (end - start) // self.cell_index.value_size
+            values = self.image.read(start, count, self.cell_index.value_type)
+            stats = SelectionStats(values, self.read_baseline(start, count, self.cell_index.value_type))
+            self.selection_stats = (key, stats)
+        self.selected_count_label.config(text=self.selection_stats[1].describe())
+
+    def update_map_stats(self):
+        try:
+            values = self.get_map_array()
+        except ValueError:
+            return
+        mask = self.get_selection_mask()
+        stats = SelectionStats(values[mask], self.get_original_array()[mask])
+        self.map_stats_label.config(text=stats.describe())
 
     def extrapolate_values(self):
         try:
@@ -479,7 +3217,7 @@ class LinOLS:
                 for j in range(self.columns):
                     entry = self.entry_widgets[i][j]
                     if entry.cget('bg') == 'lightblue':
-                        selected_numbers.append(int(entry.get()))
+                        selected_numbers.append(self.display_value(entry))
 
             if not selected_numbers:
                 print("No selected numbers")
@@ -490,22 +3228,33 @@ class LinOLS:
                 for j in range(self.columns):
                     entry = self.entry_widgets[i][j]
                     if entry.cget('bg') == 'lightblue':
-                        current_value = int(entry.get())
+                        current_value = self.display_value(entry)
                         new_value = current_value + (highest_value * percentage / 100)
-                        new_value_str = '{:05d}'.format(int(new_value))
-                        entry.delete(0, tk.END)
-                        entry.insert(tk.END, new_value_str)
+                        self.set_display_value(entry, new_value)
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid percentage.")
 
         self.update_3d_view()
 
     def check_difference_3d(self, i, j):
-        current_value = int(self.entry_widgets[i][j].get())
+        current_value = self.raw_value(self.entry_widgets[i][j])
         original_value = int(self.original[i][j])
+        if self.map_source is not None and self.image:
+            offset, values_per_row, value_type = self.map_source
+            value_size = np.dtype(value_type).itemsize
+            baseline = self.read_baseline(offset + (i * values_per_row + j) * value_size, 1, value_type)
+            if len(baseline):
+                original_value = int(baseline[0])
 
         difference = current_value - original_value
-        self.label_diff_3d.config(text=f"Difference: {difference}")
+        text = f"Difference: {difference}"
+        if original_value:
+            text += f" ({difference / original_value * 100:+.1f}%)"
+        if self.hit_trace is not None and i < self.hit_trace.counts.shape[0] and j < self.hit_trace.counts.shape[1]:
+            text += f"  Hits: {self.hit_trace.counts[i, j]}"
+            if self.hit_trace.counts[i, j] and self.hit_trace.sums.any():
+                text += f"  Mean: {self.hit_trace.mean()[i, j]:.1f}"
+        self.label_diff_3d.config(text=text)
 
     def import_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
@@ -513,41 +3262,264 @@ class LinOLS:
             self.compare_files_import(file_path)
 
     def compare_files_import(self, file_path):
-        second_file_values = {}
+        if not self.image:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
 
-        with open(file_path, 'rb') as file:
-            row_index = 0
-            while True:
-                chunk = file.read(self.num_columns * 2)
-                if not chunk:
-                    break
-                if len(chunk) % 2 != 0:
-                    additional_byte = file.read(1)
-                    if not additional_byte:
-                        break
-                    chunk += additional_byte
-
-                line = ' '.join(f"{value:05}" for value in struct.unpack('<' + 'H' * (len(chunk) // 2), chunk))
-                second_file_values[row_index] = line.split()
-                row_index += 1
-
-        self.text_widget.delete('1.0', tk.END)
-        for row_index, values in second_file_values.items():
-            self.text_widget.insert(tk.END, ' '.join(values) + '\n')
-
-        differences = []
-        for row_index, values in second_file_values.items():
-            original_values = self.text_widget.original_values.get(row_index)
-            if original_values:
-                for col_index, (original_value, current_value) in enumerate(zip(original_values, values)):
-                    if original_value != current_value:
-                        differences.append((current_value, original_value, row_index, col_index))
-        if differences:
-            self.text_widget.batch_highlight_changed_values(differences)
+        second_image = np.fromfile(file_path, dtype=np.uint8)
+        self.image.write(0, second_image[:len(self.image)])
+
+    def attach_reference(self):
+        document = self.workspace.active
+        if document is None:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
+
+        file_path = filedialog.askopenfilename(title="Select reference (stock) image", filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
+        if not file_path:
+            return
+
+        try:
+            document.reference = ReferenceImage.store(file_path)
+            document.reference.remember(document.path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Error attaching reference image: {e}")
+            return
+
+        document.reference.build_runs(self.image.data)
+        self.refresh_reference_views()
+        messagebox.showinfo("Reference", f"{len(document.reference.run_starts)} changed runs ({document.reference.changed_bytes()} bytes) against {os.path.basename(file_path)}.")
+
+    def detach_reference(self):
+        document = self.workspace.active
+        if document is None or document.reference is None:
+            return
+
+        ReferenceImage.forget(document.path)
+        document.reference = None
+        self.refresh_reference_views()
+
+    def refresh_reference_views(self):
+        self.text_widget.tag_remove("changed_red", 1.0, tk.END)
+        self.text_widget.tag_remove("changed_blue", 1.0, tk.END)
+        self.highlighted_rows = None
+        self.scheduler.mark_dirty('highlight')
+        self.show_minimaps(self.minimaps)
+        self.scheduler.mark_dirty('plot_refresh')
+
+    def read_baseline(self, offset, count, dtype='u1'):
+        reference = self.workspace.active.reference
+        if reference is None:
+            return self.image.read(offset, count, dtype, original=True)
+        return reference.read(offset, count, dtype)
+
+    def jump_to_difference(self, direction):
+        document = self.workspace.active
+        if document is None or document.reference is None:
+            messagebox.showinfo("Info", "Attach a reference image first.")
+            return
+
+        if direction > 0:
+            offset = document.reference.next_run(self.current_offset)
+        else:
+            offset = document.reference.previous_run(self.current_offset)
+        if offset is None:
+            messagebox.showinfo("Info", "No further differences found.")
+            return
+        self.jump_to_offset(offset)
+
+    def index_library(self):
+        directory = filedialog.askdirectory(title="Select folder with stock images")
+        if not directory:
+            return
+
+        def index():
+            fingerprints = FingerprintIndex()
+            try:
+                return fingerprints.index_directory(directory)
+            finally:
+                fingerprints.close()
+
+        start_time = time.perf_counter()
+        future = self.background.submit(index)
+        self.root.title(f"LinOLS - indexing {directory}...")
+
+        def poll():
+            if not future.done():
+                self.root.after(200, poll)
+                return
+            self.root.title(f"LinOLS - {os.path.basename(self.file_path)}" if self.file_path else "LinOLS")
+            if future.exception():
+                messagebox.showerror("Error", f"Error indexing library: {future.exception()}")
+                return
+            indexed, known = future.result()
+            messagebox.showinfo("Fingerprint Library", f"Indexed {indexed} new or changed files ({known} already known) in {time.perf_counter() - start_time:.1f} s.")
+
+        poll()
+
+    def identify_image(self):
+        document = self.workspace.active
+        if document is None:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
+
+        fingerprints = FingerprintIndex()
+        try:
+            start_time = time.perf_counter()
+            matches = [match for match in fingerprints.identify(self.image.data) if os.path.abspath(match['path']) != os.path.abspath(document.path)]
+            elapsed = (time.perf_counter() - start_time) * 1000
+            if not matches:
+                messagebox.showinfo("Identify", "No known relative found in the fingerprint library.")
+                return
+
+            best = matches[0]
+            maps = fingerprints.load_maps(best['path'])
+        finally:
+            fingerprints.close()
+
+        lines = [f"{os.path.basename(match['path'])}: {match['score']:.0%} blocks shared" for match in matches]
+        if best['identifiers']:
+            lines.append("Shared identifiers: " + ", ".join(best['identifiers'][:5]))
+        lines.append(f"(searched in {elapsed:.0f} ms)")
+        if messagebox.askyesno("Identify", "\n".join(lines) + f"\n\nAttach {os.path.basename(best['path'])} as reference image and load its {len(maps)} map definitions?"):
+            try:
+                document.reference = ReferenceImage.store(best['path'])
+                document.reference.remember(document.path)
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Error", f"Error attaching reference image: {e}")
+                return
+            document.reference.build_runs(self.image.data)
+            document.maps.update(maps)
+            self.refresh_reference_views()
+
+    def store_library_maps(self):
+        document = self.workspace.active
+        if document is None or not document.maps:
+            messagebox.showwarning("Warning", "The open image has no map definitions.")
+            return
+
+        fingerprints = FingerprintIndex()
+        try:
+            fingerprints.index_paths([document.path])
+            fingerprints.store_maps(document.path, document.maps)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", str(e))
+            return
+        finally:
+            fingerprints.close()
+        messagebox.showinfo("Fingerprint Library", f"Stored {len(document.maps)} map definitions for {document.name}.")
+
+    def export_patch(self):
+        document = self.workspace.active
+        if document is None:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
+
+        stock = np.asarray(document.reference.data) if document.reference is not None else self.image.original
+        try:
+            patch = TunePatch.create(stock, self.image.data)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        if not len(patch.offsets):
+            messagebox.showinfo("No Differences", "No differences found.")
+            return
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".lpatch", filetypes=[("LinOLS Patches", "*.lpatch")],
+                                                 initialfile=os.path.splitext(document.name)[0] + ".lpatch")
+        if file_path:
+            patch.save(file_path)
+            messagebox.showinfo("Patch", f"{len(patch.offsets)} runs, {patch.changed_bytes} bytes changed.\nPatch size: {os.path.getsize(file_path)} bytes.")
+
+    def load_patch(self):
+        file_path = filedialog.askopenfilename(filetypes=[("LinOLS Patches", "*.lpatch"), ("All Files", "**")])
+        if not file_path:
+            return None
+        try:
+            return TunePatch.load(file_path)
+        except (OSError, ValueError, zlib.error, struct.error) as e:
+            messagebox.showerror("Error", f"Error reading patch: {e}")
+            return None
+
+    def apply_patch(self):
+        if not self.image:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
+
+        patch = self.load_patch()
+        if patch is None:
+            return
+        try:
+            patch.check(self.image.data)
+        except ValueError as e:
+            if "does not match the stock" not in str(e) or not messagebox.askyesno("Patch", f"{e}\nApply anyway if the patched regions match?"):
+                messagebox.showerror("Error", str(e))
+                return
+            try:
+                patch.check(self.image.data, force=True)
+            except ValueError as e:
+                messagebox.showerror("Error", str(e))
+                return
+
+        start_time = time.perf_counter()
+        with self.image.transaction():
+            for offset, new in patch.runs():
+                self.image.write(offset, new)
+        self.root.title(f"LinOLS - {os.path.basename(self.file_path)} (patch applied in {(time.perf_counter() - start_time) * 1000:.1f} ms)")
+
+    def apply_patch_to_files(self):
+        patch = self.load_patch()
+        if patch is None:
+            return
+        image_paths = filedialog.askopenfilenames(title="Select images to patch", filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
+        if not image_paths:
+            return
+
+        results = []
+        for image_path in image_paths:
+            try:
+                patched = patch.apply(np.fromfile(image_path, dtype=np.uint8))
+                output_path = os.path.splitext(image_path)[0] + "_patched.bin"
+                TunePatch.write_image(patched, output_path)
+                results.append(f"{os.path.basename(image_path)}: OK")
+            except (OSError, ValueError) as e:
+                results.append(f"{os.path.basename(image_path)}: {e}")
+        messagebox.showinfo("Patch", "\n".join(results))
+
+    def detect_layout(self):
+        if not self.image:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
+
+        if self.text_widget.tag_ranges("sel"):
+            start, end = self.selected_range()
+        elif self.plot_span:
+            start, end = self.plot_offset, self.plot_offset + self.plot_span
+        else:
+            start, end = self.current_offset, self.current_offset + 4096
+        start -= start % 2
+        region = self.image.read(start, max(end - start, 0))
+
+        candidates = LayoutAnalyzer.analyze(region)
+        if not candidates:
+            messagebox.showinfo("Layout", "No repeating row structure found in this region.")
+            return
+        dialog = LayoutDialog(self.root, candidates, self.apply_layout)
+        dialog.transient(self.root)
+
+    def apply_layout(self, mode, columns):
+        offset = self.current_offset
+        self.display_mode = mode
+        self.num_columns = columns
+        self.column_entry.delete(0, tk.END)
+        self.column_entry.insert(0, str(columns))
+        self.relayout()
+        self.cursor.jump(offset - offset % self.cell_index.value_size)
 
     def compare(self):
-        with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-            temp_file.write(self.text_widget.get(1.0, tk.END).encode())
+        with tempfile.NamedTemporaryFile(prefix="LinOLS_temp_", delete=False) as temp_file:
+            if self.image:
+                temp_file.write(('\n'.join(self.format_rows(0, self.total_rows - 1)) + '\n').encode())
 
         try:
             self.compare_files(temp_file.name)
@@ -598,6 +3570,30 @@ class LinOLS:
         else:
             messagebox.showerror('Error', 'File is not opened!')
 
+    def compare_variants(self):
+        if self.image:
+            stock = self.image.data
+            dtype = self.cell_index.value_type
+        else:
+            stock_path = filedialog.askopenfilename(title="Select stock file", filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
+            if not stock_path:
+                return
+            stock = np.fromfile(stock_path, dtype=np.uint8)
+            dtype = '<u2'
+
+        variant_paths = filedialog.askopenfilenames(title="Select variants", filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
+        if not variant_paths:
+            return
+
+        variants = [np.fromfile(path, dtype=np.uint8) for path in variant_paths]
+        comparison = VariantComparison(stock, variants, list(variant_paths), dtype)
+        if not len(comparison.run_offsets):
+            messagebox.showinfo("No Differences", "No differences found.")
+            return
+
+        dialog = VariantsDialog(self.root, comparison, self.text_widget)
+        dialog.transient(self.root)
+
     def show_differences_dialog(self, differences):
         dialog = DifferencesDialog(self.root, differences, self.text_widget)
         dialog.transient(self.root)
@@ -607,14 +3603,20 @@ class LinOLS:
     def on_tab_enter(self, event):
         current_tab_index = self.notebook.index(self.notebook.select())
         if current_tab_index < len(self.notebook.tabs()):
-            self.tabs_widgets[current_tab_index].focus_set()
+            frame = self.tabs_widgets[current_tab_index]
+            (frame.winfo_children() or [frame])[0].focus_set()
 
     def on_tab_leave(self, event):
         current_tab_index = self.notebook.index(self.notebook.select())
         if current_tab_index < len(self.notebook.tabs()):
-            self.tabs_widgets[current_tab_index].focus_set()
+            frame = self.tabs_widgets[current_tab_index]
+            (frame.winfo_children() or [frame])[0].focus_set()
 
     def exit_application(self):
+        if self.recorder is not None:
+            self.recorder.stop()
+        for document in self.workspace.documents:
+            document.journal.close()
         sys.exit()
 
     def copy_selected_cells(self):
@@ -703,6 +3705,7 @@ class LinOLS:
                                     entry.config(bg="lightblue")
                                 else:
                                     entry.config(bg="white")
+                    self.scheduler.mark_dirty('map_selection')
 
     def toggle_selection(self, i, j):
         if (i, j) in self.selected_cells:
@@ -711,6 +3714,7 @@ class LinOLS:
         else:
             self.selected_cells.add((i, j))
             self.entry_widgets[i][j].config(bg="lightblue")
+        self.scheduler.mark_dirty('map_selection')
 
     def get_cell_index(self, x, y):
         for i in range(self.rows):
@@ -726,55 +3730,209 @@ class LinOLS:
 
     def increase_selected_text(self):
         try:
-            increase_value = int(self.increase_entry.get())
+            increase_value = self.display_number(self.increase_entry.get())
             for i in range(self.rows):
                 for j in range(self.columns):
                     entry = self.entry_widgets[i][j]
                     if entry.cget('bg') == 'lightblue':
-                        current_value = int(entry.get())
-                        new_value = current_value + increase_value
-                        new_value_str = '{:05d}'.format(new_value)
-                        entry.delete(0, tk.END)
-                        entry.insert(tk.END, new_value_str)
+                        current_value = self.display_value(entry)
+                        self.set_display_value(entry, current_value + increase_value)
                         self.check_difference(event=None, i=i, j=j)
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid number.")
 
         self.update_3d_view()
 
-    def increase_selected_text_per(self):
+    def increase_selected_text_per(self):
+        try:
+            percentage_increase = float(self.per_entry.get()) / 100.0
+            for i in range(self.rows):
+                for j in range(self.columns):
+                    entry = self.entry_widgets[i][j]
+                    if entry.cget('bg') == 'lightblue':
+                        current_value = self.display_value(entry)
+                        increase_value = current_value * percentage_increase
+                        if not self.show_physical:
+                            increase_value = int(increase_value)
+                        self.set_display_value(entry, current_value + increase_value)
+                        self.check_difference(event=None, i=i, j=j)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid percentage.")
+        self.update_3d_view()
+
+    def set_text(self):
+        try:
+            set_text = self.display_number(self.set_entry.get())
+            for i in range(self.rows):
+                for j in range(self.columns):
+                    entry = self.entry_widgets[i][j]
+                    if entry.cget('bg') == 'lightblue':
+                        self.set_display_value(entry, set_text)
+                        self.check_difference(event=None, i=i, j=j)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter a valid number.")
+        self.update_3d_view()
+
+    def conversion_for(self, kind):
+        return self.conversions[kind] if self.show_physical else None
+
+    def display_number(self, text, kind='map'):
+        return int(text) if self.conversion_for(kind) is None else float(text)
+
+    def parse_display(self, text, kind='map'):
+        conversion = self.conversion_for(kind)
+        if conversion is None:
+            return int(text)
+        return int(conversion.to_raw(float(text)))
+
+    def raw_value(self, entry, kind='map'):
+        return self.parse_display(entry.get(), kind)
+
+    def entry_raw_values(self, entries, kind='map'):
+        conversion = self.conversion_for(kind)
+        if conversion is None:
+            return np.array([int(entry.get()) for entry in entries], dtype=np.int64)
+        return conversion.to_raw([float(entry.get()) for entry in entries])
+
+    def cell_texts(self, values, kind='map'):
+        conversion = self.conversion_for(kind)
+        if conversion is None:
+            return ['{:05d}'.format(int(value)) for value in values]
+        return conversion.format(values)
+
+    def cell_text(self, raw, kind='map'):
+        return self.cell_texts([raw], kind)[0]
+
+    def display_value(self, entry, kind='map'):
+        return self.display_number(entry.get(), kind)
+
+    def set_display_value(self, entry, value, kind='map'):
+        conversion = self.conversion_for(kind)
+        raw = int(value) if conversion is None else int(conversion.to_raw(value))
+        entry.delete(0, tk.END)
+        entry.insert(tk.END, self.cell_text(raw, kind))
+
+    def read_grid_raw(self):
+        return (self.get_map_array().astype(np.int64),
+                self.entry_raw_values(self.entry_x_widgets[0], 'x'),
+                self.entry_raw_values(self.entry_y_widgets, 'y'))
+
+    def write_grid_raw(self, values, x_axis, y_axis):
+        texts = self.cell_texts(values.ravel())
+        entries = [entry for row in self.entry_widgets[:self.rows] for entry in row[:self.columns]]
+        for entry_group, group_texts in ((entries, texts), (self.entry_x_widgets[0], self.cell_texts(x_axis, 'x')),
+                                         (self.entry_y_widgets, self.cell_texts(y_axis, 'y'))):
+            for entry, text in zip(entry_group, group_texts):
+                entry.delete(0, tk.END)
+                entry.insert(tk.END, text)
+        units = [self.conversions[kind].unit for kind in ('map', 'x', 'y') if self.show_physical and self.conversions[kind] and self.conversions[kind].unit]
+        self.physical_button.config(text="Raw" if self.show_physical else "Physical")
+        self.label_diff_3d.config(text="Units: " + ", ".join(units) if units else "Difference: ")
+
+    def toggle_physical(self):
+        if not self.show_physical and not any(self.conversions.values()):
+            self.edit_conversions()
+            return
+        try:
+            grid = self.read_grid_raw()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid numbers.")
+            return
+        self.show_physical = not self.show_physical
+        self.write_grid_raw(*grid)
+
+    def edit_conversions(self):
+        dialog = UnitsDialog(self.root, self.conversions, self.set_conversions)
+        dialog.transient(self.root)
+
+    def set_conversions(self, specs):
+        try:
+            conversions = {kind: UnitConversion.parse(spec) for kind, spec in specs.items()}
+            grid = self.read_grid_raw()
+        except (ValueError, ZeroDivisionError) as e:
+            messagebox.showerror("Error", f"Invalid conversion: {e}")
+            return False
+        self.conversions = conversions
+        self.show_physical = any(conversions.values())
+        self.write_grid_raw(*grid)
+        return True
+
+    def get_map_array(self):
+        entries = [entry for row in self.entry_widgets[:self.rows] for entry in row[:self.columns]]
+        return self.entry_raw_values(entries).reshape(self.rows, self.columns).astype(np.float64)
+
+    def get_original_array(self):
+        return np.array([[int(value) for value in row[:self.columns]] for row in self.original[:self.rows]], dtype=np.float64)
+
+    def get_selection_mask(self):
+        return np.array([[entry.cget('bg') == 'lightblue' for entry in row[:self.columns]] for row in self.entry_widgets[:self.rows]], dtype=bool)
+
+    def set_map_array(self, values):
+        values = np.clip(np.rint(values), 0, 65535).astype(np.int64)
+        for i, j in zip(*np.nonzero(values != self.get_map_array())):
+            entry = self.entry_widgets[i][j]
+            entry.delete(0, tk.END)
+            entry.insert(tk.END, self.cell_text(values[i, j]))
+            self.check_difference(event=None, i=i, j=j)
+        self.update_3d_view()
+
+    def apply_map_operation(self, operation):
+        try:
+            values = self.get_map_array()
+            mask = self.get_selection_mask()
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid numbers.")
+            return
+
+        if not mask.any():
+            messagebox.showwarning("Warning", "No cells are selected.")
+            return
+        self.set_map_array(operation(values, mask))
+
+    def interpolate_selection(self):
+        try:
+            x_axis = self.entry_raw_values(self.entry_x_widgets[0][:self.columns], 'x').tolist()
+            y_axis = self.entry_raw_values(self.entry_y_widgets[:self.rows], 'y').tolist()
+        except ValueError:
+            x_axis, y_axis = None, None
+        self.apply_map_operation(lambda values, mask: MapMath.interpolate(values, mask, x_axis, y_axis))
+
+    def smooth_selection(self):
+        self.apply_map_operation(MapMath.smooth)
+
+    def clamp_selection(self):
+        try:
+            low = self.parse_display(self.clamp_min_entry.get()) if self.clamp_min_entry.get() else 0
+            high = self.parse_display(self.clamp_max_entry.get()) if self.clamp_max_entry.get() else 65535
+            low, high = min(low, high), max(low, high)
+        except ValueError:
+            messagebox.showerror("Error", "Please enter valid numbers.")
+            return
+        self.apply_map_operation(lambda values, mask: MapMath.clamp(values, mask, low, high))
+
+    def rescale_axes(self):
         try:
-            percentage_increase = float(self.per_entry.get()) / 100.0
-            for i in range(self.rows):
-                for j in range(self.columns):
-                    entry = self.entry_widgets[i][j]
-                    if entry.cget('bg') == 'lightblue':
-                        current_value = int(entry.get())
-                        increase_value = int(current_value * percentage_increase)
-                        new_value = current_value + increase_value
-                        new_value_str = '{:05d}'.format(new_value)
-                        entry.delete(0, tk.END)
-                        entry.insert(tk.END, new_value_str)
-                        self.check_difference(event=None, i=i, j=j)
+            values = self.get_map_array()
+            old_x = [int(value) for value in self.original_X[0][:self.columns]]
+            old_y = [int(value) for value in self.original_Y[:self.rows]]
+            new_x = self.entry_raw_values(self.entry_x_widgets[0][:self.columns], 'x').tolist()
+            new_y = self.entry_raw_values(self.entry_y_widgets[:self.rows], 'y').tolist()
         except ValueError:
-            messagebox.showerror("Error", "Please enter a valid percentage.")
-        self.update_3d_view()
+            messagebox.showerror("Error", "Please enter valid numbers.")
+            return
 
-    def set_text(self):
         try:
-            set_text = int(self.set_entry.get())
-            for i in range(self.rows):
-                for j in range(self.columns):
-                    entry = self.entry_widgets[i][j]
-                    if entry.cget('bg') == 'lightblue':
-                        new_value = set_text
-                        new_value_str = '{:05d}'.format(new_value)
-                        entry.delete(0, tk.END)
-                        entry.insert(tk.END, new_value_str)
-                        self.check_difference(event=None, i=i, j=j)
-        except ValueError:
-            messagebox.showerror("Error", "Please enter a valid number.")
-        self.update_3d_view()
+            resampled = MapMath.resample(values, old_x, old_y, new_x, new_y)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Cannot rescale: {e}")
+            return
+        for j, value in enumerate(new_x):
+            self.original_X[0][j] = '{:05d}'.format(value)
+            self.check_difference_x(None, j)
+        for i, value in enumerate(new_y):
+            self.original_Y[i] = '{:05d}'.format(value)
+            self.check_difference_y(None, i)
+        self.set_map_array(resampled)
 
     def update_columns_rows(self):
         try:
@@ -789,7 +3947,7 @@ class LinOLS:
             for i in range(len(self.entry_y_widgets), new_rows):
                 entry = tk.Entry(self.y_frame, width=5, font=("Comfortaa", 10))
                 entry.grid(row=i, column=0)
-                entry.insert(tk.END, "00000")
+                entry.insert(tk.END, self.cell_text(0, 'y'))
                 entry.bind('<KeyRelease>', lambda event, i=i: self.check_difference_y(event, i))
                 entry.bind("<B1-Motion>", self.drag_to_select)
                 entry.bind("<ButtonRelease-1>", self.end_interaction)
@@ -809,7 +3967,7 @@ class LinOLS:
             for j in range(len(self.entry_x_widgets[0]), new_columns):
                 entry = tk.Entry(self.x_frame, width=5, font=("Comfortaa", 10))
                 entry.grid(row=0, column=j)
-                entry.insert(tk.END, "00000")
+                entry.insert(tk.END, self.cell_text(0, 'x'))
                 entry.bind('<KeyRelease>', lambda event, j=j: self.check_difference_x(event, j))
                 entry.bind("<ButtonPress-1>", lambda event, i=i: self.start_interaction_y(event, i))
                 entry.bind("<B1-Motion>", self.drag_to_select)
@@ -829,7 +3987,7 @@ class LinOLS:
                 for j in range(new_columns):
                     entry = tk.Entry(self.main_frame, width=5, font=("Comfortaa", 10))
                     entry.grid(row=i, column=j)
-                    entry.insert(tk.END, "00000")
+                    entry.insert(tk.END, self.cell_text(0))
                     entry.bind('<KeyRelease>', lambda event, i=i, j=j: self.check_difference(event, i, j))
                     entry.bind("<ButtonPress-1>", lambda event, i=i, j=j: (
                     self.start_interaction(event, i, j), self.check_difference_3d(i, j)))
@@ -852,7 +4010,7 @@ class LinOLS:
             for j in range(len(row), new_columns):
                 entry = tk.Entry(self.main_frame, width=5, font=("Comfortaa", 10))
                 entry.grid(row=i, column=j)
-                entry.insert(tk.END, "00000")
+                entry.insert(tk.END, self.cell_text(0))
                 entry.bind('<KeyRelease>', lambda event, i=i, j=j: self.check_difference(event, i, j))
                 entry.bind("<ButtonPress-1>", lambda event, i=i, j=j: (self.start_interaction(event, i, j), self.check_difference_3d(i, j)))
                 entry.bind("<B1-Motion>", self.drag_to_select)
@@ -869,57 +4027,154 @@ class LinOLS:
 
     def update_3d_view(self):
         try:
-            x_default = all(entry.get() == "00000" for entry in self.entry_x_widgets[0])
-            y_default = all(entry.get() == "00000" for entry in self.entry_y_widgets)
-
-            if x_default and y_default:
-                x = np.arange(self.columns)
-                y = np.arange(self.rows)
-                x, y = np.meshgrid(x, y)
-
-                values = np.zeros((self.rows, self.columns))
-                for i in range(self.rows):
-                    for j in range(self.columns):
-                        value = float(self.entry_widgets[i][j].get())
-                        values[i][j] = value
-
-                self.ax.clear()
-                surf = self.ax.plot_surface(x, y, values, cmap='viridis', edgecolor='none')
-                self.ax.set_xlabel('X')
-                self.ax.set_ylabel('Y')
-                self.ax.set_zlabel('Value')
-
-                self.ax.set_xticks([])
-                self.ax.set_yticks([])
-
-                self.canvas.draw()
-            else:
-                x = np.arange(self.columns)
-                y = np.arange(self.rows)
-                x, y = np.meshgrid(x, y)
-
-                values = np.zeros((self.rows, self.columns))
-                for i in range(self.rows):
-                    for j in range(self.columns):
-                        value = float(self.entry_widgets[i][j].get())
-                        values[i][j] = value
-
-                self.ax.clear()
-                self.ax.plot_surface(x, y, values, cmap='viridis')
-                self.ax.set_xlabel('X')
-                self.ax.set_ylabel('Y')
-                self.ax.set_zlabel('Value')
-
-                self.ax.set_xticks(np.arange(0, self.columns, 1))
-                self.ax.set_yticks(np.arange(0, self.rows, 1))
-
-                self.canvas.draw()
+            values = self.get_map_array()
+            original = self.get_original_array()
         except ValueError:
             messagebox.showerror("Error", "Please enter valid numbers.")
+            return
+
+        self.heatmap.show(values, original)
+        if self.surface_visible:
+            self.draw_surface(values)
+
+    def draw_surface(self, values):
+        x_default = not self.entry_raw_values(self.entry_x_widgets[0], 'x').any()
+        y_default = not self.entry_raw_values(self.entry_y_widgets, 'y').any()
+
+        x, y = np.meshgrid(np.arange(self.columns), np.arange(self.rows))
+        self.ax.clear()
+        if x_default and y_default:
+            self.ax.plot_surface(x, y, values, cmap='viridis', edgecolor='none')
+            self.ax.set_xticks([])
+            self.ax.set_yticks([])
+        else:
+            self.ax.plot_surface(x, y, values, cmap='viridis')
+            self.ax.set_xticks(np.arange(0, self.columns, 1))
+            self.ax.set_yticks(np.arange(0, self.rows, 1))
+        self.ax.set_xlabel('X')
+        self.ax.set_ylabel('Y')
+        self.ax.set_zlabel('Value')
+
+        self.draw_hit_overlay(values)
+        self.canvas.draw()
+
+    def toggle_surface(self):
+        if self.fig is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            self.fig = Figure()
+            self.ax = self.fig.add_subplot(111, projection='3d')
+            self.canvas = FigureCanvasTkAgg(self.fig, master=self.right_frame)
+            self.canvas_widget = self.canvas.get_tk_widget()
+
+        self.surface_visible = not self.surface_visible
+        if self.surface_visible:
+            self.heatmap.pack_forget()
+            self.canvas_widget.pack(fill="both", expand=True)
+            self.surface_button.config(text="Heatmap")
+            self.update_3d_view()
+        else:
+            self.canvas_widget.pack_forget()
+            self.heatmap.pack(fill="both", expand=True)
+            self.surface_button.config(text="3D Surface")
+
+    def toggle_heatmap_mode(self):
+        if self.heatmap.mode == 'value':
+            self.heatmap.set_mode('delta')
+            self.heatmap_mode_button.config(text="Value View")
+        else:
+            self.heatmap.set_mode('value')
+            self.heatmap_mode_button.config(text="Delta View")
+
+    def refresh_heatmap(self):
+        try:
+            self.heatmap.show(self.get_map_array(), self.get_original_array())
+        except ValueError:
+            pass
+
+    def select_heatmap_cell(self, i, j):
+        self.entry_widgets[i][j].focus_set()
+        self.check_difference_3d(i, j)
+
+    def import_datalog(self):
+        file_path = filedialog.askopenfilename(filetypes=[("Datalogs", "*.csv *.txt *.log"), ("Binary Logs", "*.bin"), ("All Files", "**")])
+        if not file_path:
+            return
+
+        try:
+            if file_path.lower().endswith('.bin'):
+                channels = simpledialog.askinteger("Input", "Float32 channels per record:", minvalue=2)
+                if not channels:
+                    return
+                reader = DatalogReader(file_path, channels)
+            else:
+                reader = DatalogReader(file_path)
+            x_axis = self.entry_raw_values(self.entry_x_widgets[0], 'x').tolist()
+            y_axis = self.entry_raw_values(self.entry_y_widgets, 'y').tolist()
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Error reading datalog: {e}")
+            return
+
+        dialog = DatalogColumnsDialog(self.root, reader.columns)
+        dialog.transient(self.root)
+        dialog.grab_set()
+        self.root.wait_window(dialog)
+        if not dialog.result:
+            return
+
+        self.datalog_button.config(text="Loading...", state=tk.DISABLED)
+        future = self.background.submit(HitTrace.from_log, reader, x_axis, y_axis, *dialog.result,
+                                        x_conversion=self.conversions['x'], y_conversion=self.conversions['y'])
+
+        def poll():
+            if not future.done():
+                self.root.after(100, poll)
+                return
+
+            self.datalog_button.config(text="Datalog", state=tk.NORMAL)
+            if future.exception():
+                messagebox.showerror("Error", f"Error reading datalog: {future.exception()}")
+                return
+            self.hit_trace = future.result()
+            self.show_hit_overlay()
+            self.update_3d_view()
+
+        poll()
+
+    def clear_datalog(self):
+        self.hit_trace = None
+        for row in self.entry_widgets:
+            for entry in row:
+                entry.config(**self.entry_highlight_defaults)
+        self.update_3d_view()
+
+    def show_hit_overlay(self):
+        counts = self.hit_trace.counts
+        intensity = np.log1p(counts) / max(np.log1p(counts.max()), 1)
+        for i in range(min(self.rows, counts.shape[0])):
+            for j in range(min(self.columns, counts.shape[1])):
+                entry = self.entry_widgets[i][j]
+                if counts[i, j]:
+                    level = int(80 + 175 * intensity[i, j])
+                    entry.config(highlightthickness=2, highlightbackground=f"#{level:02x}{level // 2:02x}00", highlightcolor=f"#{level:02x}{level // 2:02x}00")
+                else:
+                    entry.config(**self.entry_highlight_defaults)
+
+    def draw_hit_overlay(self, values):
+        if self.hit_trace is None:
+            return
+
+        counts = self.hit_trace.counts[:self.rows, :self.columns]
+        rows, columns = np.nonzero(counts)
+        if len(rows):
+            sizes = 10 + 90 * counts[rows, columns] / counts.max()
+            self.ax.scatter(columns, rows, values[rows, columns], s=sizes, c='#ff7f0e', depthshade=False)
 
     def paste_data(self):
         try:
             data = self.root.clipboard_get()
+            self.map_source = self.copied_source[1:] if self.copied_source and self.copied_source[0] == data else None
             lines = data.strip().split('\n')
             num_rows = len(lines)
             num_columns = max(len(line.strip().split('\t')) for line in lines)
@@ -937,10 +4192,10 @@ class LinOLS:
                 numbers = line.strip().split('\t')
                 for j, num in enumerate(numbers):
                     if i < self.rows and j < self.columns:
-                        new_value = '{:05d}'.format(int(num))
+                        raw = self.parse_display(num)
                         self.entry_widgets[i][j].delete(0, tk.END)
-                        self.entry_widgets[i][j].insert(0, new_value)
-                        self.original[i][j] = new_value
+                        self.entry_widgets[i][j].insert(0, self.cell_text(raw))
+                        self.original[i][j] = '{:05d}'.format(raw)
                         self.entry_widgets[i][j].config(fg="black")
 
             last_row_values = [entry.get() for entry in self.entry_widgets[-1]]
@@ -968,10 +4223,10 @@ class LinOLS:
 
             for j, num in enumerate(numbers):
                 if j < self.columns:
-                    new_value = '{:05d}'.format(int(num))
+                    raw = self.parse_display(num, 'x')
                     self.entry_x_widgets[0][j].delete(0, tk.END)
-                    self.entry_x_widgets[0][j].insert(0, new_value)
-                    self.original_X[0][j] = new_value
+                    self.entry_x_widgets[0][j].insert(0, self.cell_text(raw, 'x'))
+                    self.original_X[0][j] = '{:05d}'.format(raw)
 
         except tk.TclError:
             messagebox.showerror("Error", "Clipboard operation failed. Please try again.")
@@ -988,12 +4243,13 @@ class LinOLS:
             for i, num in enumerate(numbers):
                 if i < len(self.entry_y_widgets):
                     try:
-                        new_value = '{:05d}'.format(int(num))
+                        raw = self.parse_display(num, 'y')
+                        new_value = self.cell_text(raw, 'y')
                         print(f"Inserting value '{new_value}' into entry widget {i}")
                         self.entry_y_widgets[i].delete(0, tk.END)
                         self.entry_y_widgets[i].insert(0, new_value)
                         if i < len(self.original_Y):
-                            self.original_Y[i] = new_value
+                            self.original_Y[i] = '{:05d}'.format(raw)
                     except ValueError:
                         messagebox.showerror("Error", f"Invalid value '{num}' found in clipboard data.")
                         continue
@@ -1010,11 +4266,12 @@ class LinOLS:
             for j in range(self.columns):
                 entry = self.entry_widgets[i][j]
                 entry.config(bg="white")
+        self.scheduler.mark_dirty('map_selection')
 
     def check_difference(self, event, i, j):
         entry = self.entry_widgets[i][j]
         original_value = int(self.original[i][j])
-        current_value = int(entry.get())
+        current_value = self.raw_value(entry)
         if current_value > original_value:
             entry.config(fg="red")
         elif current_value < original_value:
@@ -1024,11 +4281,12 @@ class LinOLS:
 
         if event is None:
             entry.config(bg="white")
+        self.scheduler.mark_dirty('heatmap', 'map_selection')
 
     def check_difference_x(self, event, j):
         entry = self.entry_x_widgets[0][j]
         original_value = int(self.original_X[0][j])
-        current_value = int(entry.get())
+        current_value = self.raw_value(entry, 'x')
         if current_value > original_value:
             entry.config(fg="red")
         elif current_value < original_value:
@@ -1039,7 +4297,7 @@ class LinOLS:
     def check_difference_y(self, event, i):
         entry = self.entry_y_widgets[i]
         original_value = int(self.original_Y[i])
-        current_value = int(entry.get())
+        current_value = self.raw_value(entry, 'y')
         if current_value > original_value:
             entry.config(fg="red")
         elif current_value < original_value:
@@ -1078,133 +4336,500 @@ class LinOLS:
             self.arrow_keys_enabled = not self.arrow_keys_enabled
 
 
-    def set_arrow_key_state(self, event, state):
-        self.arrow_key_state = state
+    @property
+    def current_offset(self):
+        return self.cursor.offset
 
-    def update_on_arrow_key(self):
-        if self.arrow_key_state in ['left', 'right']:
-            if self.arrow_key_state == 'left':
-                self.navigate_2d_left(None)
-            elif self.arrow_key_state == 'right':
-                self.navigate_2d_right(None)
-
-        self.root.after(50, self.update_on_arrow_key)
+    @current_offset.setter
+    def current_offset(self, offset):
+        self.cursor.offset = offset
 
     def navigate_2d_left(self, event):
-        if self.display_mode in ['hex16', 'dec16_lh', 'dec16_hl']:
-            total_columns = self.num_columns * 16
-            self.current_offset = max(0, self.current_offset - 2)
-            self.handle_navigation_and_highlight()
+        if self.image and self.display_mode in ['hex16', 'dec16_lh', 'dec16_hl']:
+            self.cursor.move(-2)
 
     def navigate_2d_right(self, event):
-        with open(self.file_path, 'rb') as file:
-            file.seek(self.current_offset + 2)
-            data = file.read(2)
+        if self.image and self.display_mode in ['hex16', 'dec16_lh', 'dec16_hl']:
+            self.cursor.move(2)
 
-        if data:
-            self.current_offset += 2
-            self.handle_navigation_and_highlight()
+    def render_cursor(self, offset):
+        if not self.image:
+            return
+
+        value = self.read_value_at(offset)
+        if value is not None and self.canvas_line is not None:
+            self.value_label.config(text=f"Value: {value:05}")
+
+        self.highlight_clicked_value(offset)
+        self.move_marker_line(offset)
+        for minimap in self.minimaps + self.overview_strips:
+            minimap.show_cursor(offset)
+        block = self.overview.block_at(offset) if self.overview else None
+        if block is not None:
+            class_name, entropy, smoothness = block
+            self.block_info_label.config(text=f"Block: {class_name} (entropy {entropy:.2f}, smoothness {smoothness:.0f})")
+        self.scheduler.mark_dirty('buttons')
+
+    def read_value_at(self, offset):
+        values = self.image.read(offset, 1, self.cell_index.value_type)
+        return int(values[0]) if len(values) else None
+
+    def move_marker_line(self, offset):
+        if self.canvas_line is None:
+            return
+        if not self.plot_offset <= offset < self.plot_offset + self.plot_span:
+            self.display_line_plot()
+
+        line_height = self.notebook.winfo_height()
+        x_position = (offset - self.plot_offset) // 2 * self.plot_step
+        self.canvas_line.coords(self.clickable_line, x_position, 0, x_position, line_height)
+        self.canvas_line.tag_raise(self.clickable_line)
 
     def open_file(self):
         file_path = filedialog.askopenfilename(filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
         if file_path:
-            self.file_path = file_path
-            self.current_offset = 0
-            self.display_file()
-            self.display_line_plot()
-            self.update_navigation_buttons()
+            self.open_document(file_path)
+
+    def open_document(self, file_path):
+        document = self.workspace.find(file_path)
+        if document is None:
+            try:
+                document = Document(file_path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Error opening file: {e}")
+                return None
+            document.num_columns = self.num_columns
+            document.display_mode = self.display_mode
+            document.image.listeners.append(lambda offset, length, image=document.image: image is self.image and self.on_image_changed(offset, length))
+            document.image.listeners.append(lambda offset, length, document=document: self.journal_edit(document, offset, length))
+            document.image.listeners.append(lambda offset, length, document=document: self.update_mirrors(document, offset, length))
+            document.image.write_hooks.append(lambda offset, new, document=document: self.propagate_mirrors(document, offset, new))
+            EditJournal.remove_stale_files([os.path.dirname(os.path.abspath(file_path))])
+            document.reference = ReferenceImage.for_image(file_path)
+            if document.reference is not None:
+                document.reference.build_runs(document.image.data)
+            self.workspace.add(document)
+        self.activate_document(document)
+        return document
+
+    def store_document_view(self):
+        document = self.workspace.active
+        if document is None:
+            return
+
+        document.current_offset = self.current_offset
+        document.num_columns = self.num_columns
+        document.display_mode = self.display_mode
+        document.text_view = self.text_widget.yview()[0]
+
+    def activate_document(self, document):
+        if document is self.workspace.active:
+            return
+
+        self.store_document_view()
+        self.workspace.activate(document)
+        self.image = document.image
+        self.file_path = document.path
+        self.num_columns = document.num_columns
+        self.display_mode = document.display_mode
+        self.column_entry.delete(0, tk.END)
+        self.column_entry.insert(0, str(self.num_columns))
+        self.cursor.set_limit(len(self.image) // 2 * 2 - 2)
+        self.cursor.offset = min(document.current_offset, self.cursor.limit)
+        self.plot_span = 0
+        self.block_info_label.config(text="")
+        self.root.title(f"LinOLS - {document.name}")
+
+        self.display_file()
+        self.text_widget.yview_moveto(document.text_view)
+        self.display_line_plot()
+        self.update_navigation_buttons()
+        self.cursor.schedule()
+
+        self.overview = document.cached('overview')
+        for strip in self.overview_strips:
+            if self.overview is None:
+                strip.clear()
+            else:
+                strip.show(self.overview)
+        if self.overview is None:
+            self.compute_overview(document)
+        if document.mirrors is None:
+            self.compute_mirrors(document)
+
+    def update_window_menu(self):
+        self.window_menu.delete(0, tk.END)
+        self.window_menu.add_command(label="Next document", command=lambda: self.cycle_documents(1), accelerator="Ctrl+Tab")
+        self.window_menu.add_command(label="Close document", command=self.close_document, accelerator="Ctrl+W")
+        if not self.workspace.documents:
+            return
+
+        self.window_menu.add_separator()
+        for index, document in enumerate(self.workspace.documents):
+            label = document.name + (" *" if document.image.dirty_pages else "")
+            self.window_menu.add_radiobutton(label=label, variable=self.active_document, value=index,
+                                             command=lambda document=document: self.activate_document(document))
+        self.active_document.set(self.workspace.documents.index(self.workspace.active))
+
+    def cycle_documents(self, step):
+        documents = self.workspace.documents
+        if len(documents) > 1:
+            self.activate_document(documents[(documents.index(self.workspace.active) + step) % len(documents)])
+
+    def close_document(self):
+        document = self.workspace.active
+        if document is None:
+            return
+
+        if document.image.dirty_pages:
+            answer = messagebox.askyesnocancel("Unsaved Changes", f"Save changes to {document.name} before closing?")
+            if answer is None:
+                return
+            if answer and not self.quick_save():
+                return
+
+        document.journal.discard()
+        self.workspace.remove(document)
+        if self.workspace.documents:
+            self.activate_document(max(self.workspace.documents, key=lambda document: document.last_used))
+            return
+
+        self.image = None
+        self.overview = None
+        self.file_path = ""
+        self.root.title("LinOLS")
+        self.text_widget.delete(1.0, tk.END)
+        if self.canvas_line is not None:
+            self.canvas_line.delete("line")
+        self.block_info_label.config(text="")
+        for strip in self.overview_strips + self.minimaps:
+            strip.clear()
+
+    def compute_overview(self, document):
+        future = self.background.submit(StructureOverview.load_or_compute, document.image.data.copy())
+
+        def poll():
+            if not future.done():
+                self.root.after(100, poll)
+            elif document in self.workspace.documents and not future.exception():
+                overview = future.result()
+                document.cache('overview', overview, overview.entropy.nbytes + overview.smoothness.nbytes + overview.classes.nbytes)
+                if document is self.workspace.active:
+                    self.overview = overview
+                    for strip in self.overview_strips:
+                        strip.show(self.overview)
+                self.workspace.enforce_budget()
+
+        poll()
+
+    def compute_mirrors(self, document):
+        version = document.image.version
+        future = self.background.submit(MirrorIndex, document.image.data.copy())
+
+        def poll():
+            if not future.done():
+                self.root.after(100, poll)
+            elif document in self.workspace.documents and not future.exception():
+                document.mirrors = future.result()
+                if document.image.version != version:
+                    document.mirrors.update(document.image.data, 0, len(document.image))
+                else:
+                    document.mirrors.data = document.image.data
+
+        poll()
+
+    def update_mirrors(self, document, offset, length):
+        if document.mirrors is None:
+            return
+        document.mirrors.update(document.image.data, offset, length)
+        if document.mirrors.stale:
+            if self.mirror_refresh is not None:
+                self.root.after_cancel(self.mirror_refresh)
+            self.mirror_refresh = self.root.after(1000, self.refresh_mirrors)
+
+    def refresh_mirrors(self):
+        self.mirror_refresh = None
+        for document in self.workspace.documents:
+            if document.mirrors is not None:
+                document.mirrors.current_groups()
+
+    def propagate_mirrors(self, document, offset, new):
+        if self.propagating or not self.link_mirrors.get() or not document.mirrors:
+            return
+
+        self.propagating = True
+        try:
+            for target, first, last in list(document.mirrors.linked_writes(offset, len(new))):
+                document.image.write(target, new[first:last])
+        finally:
+            self.propagating = False
+
+    def show_mirrors(self):
+        document = self.workspace.active
+        if document is None:
+            messagebox.showwarning("Warning", "No file is currently open. Please open a file first.")
+            return
+        if document.mirrors is None:
+            messagebox.showinfo("Mirrored Maps", "Mirror detection is still running, please try again in a moment.")
+            return
+
+        groups = document.mirrors.current_groups()
+        if not groups:
+            messagebox.showinfo("Mirrored Maps", "No mirrored maps found in this image.")
+            return
+        dialog = MirrorsDialog(self.root, groups, self.image.data, self.jump_to_offset)
+        dialog.transient(self.root)
+
+    def jump_to_next_data(self):
+        if not self.overview:
+            return
+
+        offset = self.overview.find_next(self.current_offset, 'data')
+        if offset is None:
+            messagebox.showinfo("Info", "No further data blocks found.")
+            return
+        self.jump_to_offset(offset)
 
     def show_about_info(self):
         about_text = "LinOLS\nCreated by: Blackdown124\nVersion: 1.0"
+        if self.startup_ms is not None:
+            about_text += f"\nStartup time: {self.startup_ms:.0f} ms"
         messagebox.showinfo("About", about_text)
 
+    def start_recording(self, file_path):
+        self.recorder = EventTrace(self.root, file_path)
+        self.root.title(f"LinOLS - recording to {os.path.basename(file_path)}")
+
+    def toggle_recording(self):
+        if self.recorder is not None:
+            self.recorder.stop()
+            messagebox.showinfo("Trace", f"Session trace saved to {self.recorder.file_path}.")
+            self.recorder = None
+            return
+
+        file_path = filedialog.asksaveasfilename(defaultextension=".jsonl", filetypes=[("Session Traces", "*.jsonl")])
+        if file_path:
+            self.start_recording(file_path)
+
+    def journal_edit(self, document, offset, length):
+        try:
+            document.journal.record(offset, length)
+        except OSError:
+            return
+        if self.journal_flush is None:
+            self.journal_flush = self.root.after(1000, self.flush_journals)
+
+    def flush_journals(self):
+        self.journal_flush = None
+        for document in self.workspace.documents:
+            try:
+                document.journal.flush()
+            except OSError as e:
+                print(f"Could not write recovery journal for {document.name}: {e}")
+
+    def recover_journals(self):
+        EditJournal.remove_stale_files([tempfile.gettempdir(), EditJournal.directory()])
+        for journal_path in EditJournal.pending():
+            try:
+                file_path, patch = EditJournal.recover(journal_path)
+            except (OSError, ValueError) as e:
+                messagebox.showwarning("Recovery", f"Discarding recovery journal: {e}")
+                os.unlink(journal_path)
+                continue
+
+            if not len(patch.offsets) or not messagebox.askyesno(
+                    "Recovery", f"{os.path.basename(file_path)} has {int(patch.lengths.sum())} unsaved bytes from a previous session. Recover them?"):
+                os.unlink(journal_path)
+                continue
+            document = self.open_document(file_path)
+            if document is None:
+                continue
+            recovering = EditJournal.rotate(journal_path)
+            with document.image.transaction():
+                for offset, values in patch.runs():
+                    document.image.write(offset, values)
+            try:
+                document.journal.flush()
+            except OSError as e:
+                messagebox.showwarning("Recovery", f"Recovered, but the new recovery journal could not be written: {e}")
+                continue
+            os.unlink(recovering)
+
+    def report_startup(self, started):
+        self.startup_ms = (time.perf_counter() - started) * 1000
+        print(f"LinOLS ready in {self.startup_ms:.0f} ms")
+
     def display_file(self):
+        self.cell_index.configure(self.display_mode, self.num_columns)
+        if not self.image:
+            return
+
+        self.total_rows = self.cell_index.row_count(len(self.image))
         self.text_widget.delete(1.0, tk.END)
-        self.original_values = {}
-        with open(self.file_path, 'rb') as file:
-            row_index = 0
-            while True:
-                chunk = file.read(self.num_columns * 2)
-                if not chunk:
-                    break
-                if len(chunk) % 2 != 0:
-                    additional_byte = file.read(1)
-                    if not additional_byte:
-                        break
-                    chunk += additional_byte
-
-                if self.display_mode == 'hex8':
-                    line = ' '.join(f"{byte:02X}" for byte in chunk)
-                elif self.display_mode == 'dec8':
-                    line = ' '.join(f"{byte:03}" for byte in chunk)
-                elif self.display_mode == 'hex16':
-                    line = ' '.join(f"{value:04X}" for value in struct.unpack('<' + 'H' * (len(chunk) // 2), chunk))
-                elif self.display_mode == 'dec16_lh':
-                    values = struct.unpack('<' + 'H' * (len(chunk) // 2), chunk)
-                    line = ' '.join(f"{value:05}" for value in values)
-                elif self.display_mode == 'dec16_hl':
-                    values = struct.unpack('>' + 'H' * (len(chunk) // 2), chunk)
-                    line = ' '.join(f"{value:05}" for value in values)
-                else:
-                    messagebox.showerror("Error", "Invalid display mode.")
-                    return
+        self.text_widget.insert(tk.END, '\n' * self.total_rows)
+        self.filled_rows = np.zeros(self.total_rows, dtype=bool)
+        self.highlighted_rows = None
+        self.changed_ranges = []
+        self.invalid_rows.clear()
+        self.scheduler.mark_dirty('fill', 'highlight')
+        self.show_minimaps(self.minimaps)
+
+    def fill_text_rows(self):
+        if not self.image or self.filled_rows.all():
+            return
 
-                self.original_values[row_index] = line.split()
-                self.text_widget.insert(tk.END, f"{line.ljust(6 * self.num_columns)}\n")
-                row_index += 1
+        first_row, last_row = self.visible_rows()
+        rows = first_row + np.flatnonzero(~self.filled_rows[first_row:last_row + 1])
+        if len(rows):
+            self.render_rows(int(rows[0]), int(rows[-1]))
+            self.highlighted_rows = None
+            self.scheduler.mark_dirty('highlight')
+        else:
+            first_row = int(np.argmin(self.filled_rows))
+            self.render_rows(first_row, first_row + self.FILL_ROWS - 1)
+        if not self.filled_rows.all():
+            self.scheduler.mark_dirty('fill')
+
+    def show_minimaps(self, minimaps):
+        value_count = len(self.image) // self.cell_index.value_size
+        for minimap in minimaps:
+            minimap.show(self.image.read(0, value_count, self.cell_index.value_type),
+                         self.read_baseline(0, value_count, self.cell_index.value_type))
+
+    def format_rows(self, first_row, last_row):
+        values_per_row = self.cell_index.values_per_row
+        offset = self.cell_index.cell_to_offset(first_row, 0)
+        values = self.image.read(offset, (last_row - first_row + 1) * values_per_row, self.cell_index.value_type)
+        cells = self.cell_index.format_values(values)
+        return [' '.join(cells[i:i + values_per_row]).ljust(6 * self.num_columns) for i in range(0, len(cells), values_per_row)]
+
+    def render_rows(self, first_row, last_row):
+        last_row = min(last_row, self.total_rows - 1)
+        if last_row < first_row:
+            return
 
-        self.total_rows = row_index
+        self.filled_rows[first_row:last_row + 1] = True
+        insert_index = self.text_widget.index(tk.INSERT)
+        self.text_widget.delete(f"{first_row + 1}.0", f"{last_row + 1}.end")
+        self.text_widget.insert(f"{first_row + 1}.0", '\n'.join(self.format_rows(first_row, last_row)))
+        self.text_widget.mark_set(tk.INSERT, insert_index)
+        if self.highlighted_rows is not None:
+            first_row = max(first_row, self.highlighted_rows[0])
+            last_row = min(last_row, self.highlighted_rows[1])
+            if first_row <= last_row:
+                self.highlight_rows(first_row, last_row)
+
+    def visible_rows(self):
+        first_row = int(self.text_widget.index("@0,0").split('.')[0]) - 1
+        last_row = int(self.text_widget.index(f"@0,{self.text_widget.winfo_height()}").split('.')[0]) - 1
+        return first_row, min(last_row, self.total_rows - 1)
+
+    def highlight_visible_rows(self):
+        if not self.image or not self.total_rows:
+            return
+        rows = self.visible_rows()
+        if rows != self.highlighted_rows and rows[0] <= rows[1]:
+            self.highlighted_rows = rows
+            self.highlight_rows(*rows)
+
+    def highlight_rows(self, first_row, last_row):
+        values_per_row = self.cell_index.values_per_row
+        offset = self.cell_index.cell_to_offset(first_row, 0)
+        count = (last_row - first_row + 1) * values_per_row
+        original_values = self.read_baseline(offset, count, self.cell_index.value_type)
+        current_values = self.image.read(offset, count, self.cell_index.value_type)[:len(original_values)]
+
+        self.text_widget.tag_remove("changed_red", f"{first_row + 1}.0", f"{last_row + 1}.end")
+        self.text_widget.tag_remove("changed_blue", f"{first_row + 1}.0", f"{last_row + 1}.end")
+        for index in np.flatnonzero(current_values != original_values).tolist():
+            row_index, col_index = divmod(index, values_per_row)
+            self.text_widget.highlight_changed_value(first_row + row_index, col_index, int(current_values[index]), int(original_values[index]))
+
+    def on_image_changed(self, offset, length):
+        reference = self.workspace.active.reference
+        if reference is not None:
+            reference.update_runs(self.image.data, offset, length)
+        self.changed_ranges.append((offset, offset + length))
+        self.scheduler.mark_dirty('changes')
+
+    def apply_image_changes(self):
+        ranges, self.changed_ranges = sorted(self.changed_ranges), []
+        if not self.image or not ranges:
+            return
 
-        for row_index, values in self.original_values.items():
-            self.text_widget.set_original_values(row_index, values)
+        row_runs = []
+        for start, end in ranges:
+            first_row, _ = self.cell_index.offset_to_cell(start)
+            last_row, _ = self.cell_index.offset_to_cell(end - 1)
+            if row_runs and first_row <= row_runs[-1][1] + 1:
+                row_runs[-1][1] = max(row_runs[-1][1], last_row)
+            else:
+                row_runs.append([first_row, last_row])
+        for first_row, last_row in row_runs:
+            self.render_rows(first_row, last_row)
+
+        start, end = ranges[0][0], max(end for _, end in ranges)
+        for minimap in self.minimaps:
+            minimap.update_range(start, end - start)
+        if any(start < self.plot_offset + self.plot_span and self.plot_offset < end for start, end in ranges):
+            self.scheduler.mark_dirty('plot_refresh')
+        if any(start <= self.current_offset < end for start, end in ranges):
+            self.cursor.schedule()
+        self.scheduler.mark_dirty('selection')
 
     def set_display_mode(self, mode):
-        if self.file_path and self.is_unsaved_changes():
-            response = messagebox.askyesnocancel("Unsaved Changes",
-                                                 "Do you want to save the file before changing the display mode?")
-
-            if response is True:
-                self.save_file()
-                self.display_line_plot()
-            elif response is False:
-                self.display_mode = mode
-                self.display_file()
-                self.display_line_plot()
-        else:
-            self.display_mode = mode
-            self.display_file()
+        self.display_mode = mode
+        if self.image:
+            self.relayout()
 
-    def is_unsaved_changes(self):
-        return self.text_widget.get(1.0, tk.END) != self.get_original_content()
+    def relayout(self):
+        self.cell_index.configure(self.display_mode, self.num_columns)
+        self.scheduler.mark_dirty('text', 'plot', 'buttons')
 
-    def get_original_content(self):
-        original_content = ""
-        for row_index, values in self.original_values.items():
-            original_content += f"{(' '.join(values)).ljust(6 * self.num_columns)}\n"
-        return original_content
+    def is_unsaved_changes(self):
+        return self.image is not None and bool(self.image.dirty_pages)
 
     def check_value_changes(self, event):
-        first_visible_row = int(self.text_widget.yview()[0] * self.total_rows)
-        last_visible_row = int(self.text_widget.yview()[1] * self.total_rows)
-
-        total_columns_text_view = 0
+        if not self.image:
+            return
 
-        if self.total_rows > 0 and 0 in self.text_widget.original_values:
-            total_columns_text_view = len(self.text_widget.original_values[0])
+        row_index = int(self.text_widget.index(tk.INSERT).split('.')[0]) - 1
+        self.restore_invalid_rows(keep=row_index)
+        self.sync_text_rows(row_index, row_index)
 
-        for row_index in range(first_visible_row, last_visible_row + 1):
-            changes = []
-            for col_index in range(total_columns_text_view):
-                try:
-                    current_value = int(self.text_widget.get(f"{row_index + 1}.{col_index * 6}",
-                                                             f"{row_index + 1}.{col_index * 6 + 5}").strip())
-                    original_value = int(self.text_widget.original_values[row_index][col_index])
-                    changes.append((current_value, original_value, row_index, col_index))
-                except (IndexError, ValueError):
-                    pass
+    def sync_text_rows(self, first_row, last_row):
+        value_type = self.cell_index.value_type
+        limit = np.iinfo(value_type).max
 
-            self.text_widget.batch_highlight_changed_values(changes)
+        with self.image.transaction():
+            for row_index in range(first_row, min(last_row, self.total_rows - 1) + 1):
+                if not self.filled_rows[row_index]:
+                    continue
+                offset = self.cell_index.cell_to_offset(row_index, 0)
+                current_values = self.image.read(offset, self.cell_index.values_per_row, value_type)
+                cells = self.text_widget.get(f"{row_index + 1}.0", f"{row_index + 1}.end").split()
 
+                try:
+                    if len(cells) != len(current_values) or any(len(cell) != self.cell_index.cell_width for cell in cells):
+                        raise ValueError
+                    values = [self.cell_index.parse_value(cell) for cell in cells]
+                    if max(values) > limit:
+                        raise ValueError
+                except ValueError:
+                    self.invalid_rows.add(row_index)
+                    self.text_widget.tag_add("invalid", f"{row_index + 1}.0", f"{row_index + 1}.end")
+                    continue
+
+                if row_index in self.invalid_rows:
+                    self.invalid_rows.discard(row_index)
+                    self.text_widget.tag_remove("invalid", f"{row_index + 1}.0", f"{row_index + 1}.end")
+                if values != current_values.tolist():
+                    self.image.write(offset, values, value_type)
+
+    def restore_invalid_rows(self, keep=None):
+        for row_index in sorted(self.invalid_rows - {keep}):
+            self.invalid_rows.discard(row_index)
+            self.render_rows(row_index, row_index)
 
     def update_color(self, start_index, end_index, color):
         self.text_widget.tag_remove("changed", start_index, end_index)
@@ -1217,10 +4842,8 @@ class LinOLS:
             new_columns = int(self.column_entry.get())
             if new_columns > 0:
                 self.num_columns = new_columns
-                self.update_2d_canvas_size()
-                self.display_file()
-                self.display_line_plot()
-                self.update_navigation_buttons()
+                self.scheduler.mark_dirty('plot_size')
+                self.relayout()
             else:
                 raise ValueError("Number of columns should be a positive integer.")
         except ValueError as e:
@@ -1231,9 +4854,7 @@ class LinOLS:
             new_columns = int(self.column_entry.get())
             if new_columns > 0:
                 self.num_columns = new_columns
-                self.display_file()
-                self.display_line_plot()
-                self.update_navigation_buttons()
+                self.relayout()
             else:
                 raise ValueError("Number of columns should be a positive integer.")
 
@@ -1247,9 +4868,7 @@ class LinOLS:
                 self.num_columns = new_columns
                 self.column_entry.delete(0, tk.END)
                 self.column_entry.insert(0, str(self.num_columns))
-                self.display_file()
-                self.display_line_plot()
-                self.update_navigation_buttons()
+                self.relayout()
             else:
                 raise ValueError("Number of columns should be a positive integer.")
         except ValueError as e:
@@ -1259,17 +4878,20 @@ class LinOLS:
         if not self.file_path:
             messagebox.showwarning("Warning", "No file is currently open. Please open a file first.")
             return
+        self.restore_invalid_rows()
 
-        manufacturer = simpledialog.askstring("Input", "Enter Manufacturer:")
-        model = simpledialog.askstring("Input", "Enter Model:")
-        modification = simpledialog.askstring("Input", "Enter Modification:")
+        vehicle = {}
+        if not file_name and self.name_from_vehicle.get():
+            manufacturer = simpledialog.askstring("Input", "Enter Manufacturer:")
+            model = simpledialog.askstring("Input", "Enter Model:")
+            modification = simpledialog.askstring("Input", "Enter Modification:")
+            vehicle = {'manufacturer': manufacturer, 'model': model, 'modification': modification}
 
-        if not (manufacturer and model and modification):
-            messagebox.showwarning("Warning", "Manufacturer, Model, and Modification are required.")
-            return
+            if manufacturer and model and modification:
+                file_name = f"LinOLS_{manufacturer}_{model}_{modification}.bin"
 
         if not file_name:
-            file_name = f"LinOLS_{manufacturer}_{model}_{modification}.bin"
+            file_name = os.path.basename(self.file_path)
 
         try:
             initial_dir = os.path.expanduser('~')
@@ -1281,133 +4903,162 @@ class LinOLS:
                 messagebox.showinfo("Info", "File save canceled.")
                 return
 
-            with open(file_path, 'wb') as file:
-                file.write(
-                    b''.join([struct.pack('<H', int(value)) for value in self.text_widget.get(1.0, tk.END).split()]))
+            old_path = self.image.file_path
+            self.image.save(file_path, atomic=True)
+            digest = TunePatch.digest(self.image.data)
+            self.workspace.active.journal.reset(old_path, digest)
+            self.file_path = file_path
+            if self.workspace.active.reference is not None:
+                self.workspace.active.reference.remember(file_path)
+            self.catalog_save(file_path, digest.hex(), vehicle)
+            self.root.title(f"LinOLS - {os.path.basename(file_path)}")
 
             messagebox.showinfo("Success", f"File saved successfully at {file_path}.")
         except Exception as e:
             messagebox.showerror("Error", f"Error saving file: {e}")
 
+    def quick_save(self):
+        if not self.image:
+            messagebox.showwarning("Warning", "No file is currently open. Please open a file first.")
+            return False
+        self.restore_invalid_rows()
+
+        start_time = time.perf_counter()
+        try:
+            self.image.save(atomic=self.atomic_save.get())
+            digest = TunePatch.digest(self.image.data)
+            self.workspace.active.journal.reset(digest=digest)
+        except OSError as e:
+            messagebox.showerror("Error", f"Error saving file: {e}")
+            return False
+        elapsed = (time.perf_counter() - start_time) * 1000
+        self.root.title(f"LinOLS - {os.path.basename(self.file_path)} (saved in {elapsed:.1f} ms)")
+        self.catalog_save(self.file_path, digest.hex())
+        return True
+
+    def catalog_save(self, file_path, digest, vehicle=None):
+        document = self.workspace.active
+        stock_digest = os.path.splitext(os.path.basename(document.reference.path))[0] if document.reference else None
+        vehicle = {key: value for key, value in (vehicle or {}).items() if value}
+
+        def record():
+            catalog = TuneCatalog()
+            try:
+                return catalog.record(file_path, document.image.data, parent_digest=document.parent_digest, stock_digest=stock_digest,
+                                      digest=digest, **vehicle)
+            finally:
+                catalog.close()
+
+        future = self.background.submit(record)
+
+        def poll():
+            if not future.done():
+                self.root.after(100, poll)
+            elif isinstance(future.exception(), sqlite3.Error):
+                messagebox.showwarning("Catalog", f"Saved, but the tune catalog could not be updated: {future.exception()}")
+            elif future.exception() is None:
+                duplicates = future.result()[1]
+                if duplicates and digest not in self.catalog_notified:
+                    self.catalog_notified.add(digest)
+                    messagebox.showinfo("Catalog", f"This image is identical to {len(duplicates)} catalogued file(s), e.g. {duplicates[0]}.")
+
+        poll()
+
+    def open_catalog(self):
+        catalog = TuneCatalog()
+        catalog.prune()
+        dialog = CatalogDialog(self.root, catalog, self.open_document)
+        dialog.transient(self.root)
+        dialog.bind("<Destroy>", lambda event: event.widget is dialog and catalog.close())
+
     def navigate_previous(self):
         while True:
             self.current_offset = max(0, self.current_offset - self.num_columns * 16 * 2)
-            self.display_line_plot()
-            if not self.check_all_zero_values():
+            if not self.check_all_zero_values() or self.current_offset == 0:
                 break
-        self.update_navigation_buttons()
+        self.scheduler.mark_dirty('plot', 'buttons')
 
     def navigate_next(self):
-        while True:
-            with open(self.file_path, 'rb') as file:
-                file.seek(self.current_offset + self.num_columns * 16 * 2)
-                data = file.read(self.num_columns * 16 * 2)
-
-            if data or self.current_offset == 0:
-                self.current_offset += self.num_columns * 16 * 2
-                self.display_line_plot()
-                if not self.check_all_zero_values():
-                    break
-            else:
+        page_size = self.num_columns * 16 * 2
+        while self.current_offset + page_size < len(self.image):
+            self.current_offset += page_size
+            if not self.check_all_zero_values():
                 break
-        self.update_navigation_buttons()
+        self.scheduler.mark_dirty('plot', 'buttons')
 
     def check_all_zero_values(self):
-        with open(self.file_path, 'rb') as file:
-            file.seek(self.current_offset)
-            data = file.read(self.num_columns * 16 * 2)
-
-        values = struct.unpack('<' + 'H' * (len(data) // 2), data)
-        return all(value == 0 for value in values)
+        data = self.image.data[self.current_offset:self.current_offset + self.num_columns * 16 * 2]
+        return not data.any()
 
     def update_2d_canvas_size(self):
+        if self.canvas_line is None:
+            return
         canvas_width = self.canvas_line.master.winfo_width()
         canvas_height = self.canvas_line.master.winfo_height()
         self.canvas_line.config(width=canvas_width, height=canvas_height)
         self.canvas_line.coords(self.clickable_line, 0, 0, 0, canvas_height)
-        self.display_line_plot()
+        self.scheduler.mark_dirty('plot')
+
+    def display_line_plot(self, offset=None):
+        if not self.image or self.canvas_line is None:
+            return
 
-    def display_line_plot(self):
         canvas_width = self.notebook.winfo_width() - 70
         canvas_height = self.notebook.winfo_height() - 70
 
         total_columns = canvas_width // 20
 
-        if not self.file_path:
+        if self.display_mode == 'dec16_lh':
+            byte_order = '<'
+        elif self.display_mode == 'dec16_hl':
+            byte_order = '>'
+        else:
             return
 
-        with open(self.file_path, 'rb') as file:
-            file.seek(self.current_offset)
-            data = file.read(total_columns * 16 * 2)
+        words = self.image.words(byte_order)
+        start = (self.current_offset if offset is None else offset) // 2
+        y_values = words[start:start + total_columns * 16].astype(np.float64)
+        if len(y_values) < 2:
+            return
 
-        if data:
-            if self.display_mode == 'dec16_lh':
-                numbers = struct.unpack('<' + 'H' * (len(data) // 2), data)
-            elif self.display_mode == 'dec16_hl':
-                numbers = struct.unpack('>' + 'H' * (len(data) // 2), data)
-            else:
-                return
+        reference = self.workspace.active.reference
+        reference_values = None
+        if reference is not None:
+            reference_values = reference.read(start * 2, len(y_values), byte_order + 'u2').astype(np.float64)
 
-            x_values = np.arange(len(numbers))
-            y_values = np.array(numbers)
-            y_scaled = canvas_height * (y_values / max(y_values))
+        peak = max(y_values.max(), reference_values.max() if reference_values is not None and len(reference_values) else 0) or 1
+        step = canvas_width / len(y_values)
 
-            self.canvas_line.delete("line")
+        self.canvas_line.delete("line")
+        if reference_values is not None and len(reference_values) > 1:
+            reference_coords = np.empty(len(reference_values) * 2)
+            reference_coords[0::2] = np.arange(len(reference_values)) * step
+            reference_coords[1::2] = canvas_height - canvas_height * (reference_values / peak)
+            self.canvas_line.create_line(*reference_coords.tolist(), fill="#5a7fb0", dash=(3, 2), tags="line")
 
-            for i in range(len(x_values) - 1):
-                x1 = i * (canvas_width / len(x_values))
-                y1 = canvas_height - y_scaled[i]
-                x2 = (i + 1) * (canvas_width / len(x_values))
-                y2 = canvas_height - y_scaled[i + 1]
+        coords = np.empty(len(y_values) * 2)
+        coords[0::2] = np.arange(len(y_values)) * step
+        coords[1::2] = canvas_height - canvas_height * (y_values / peak)
+        self.canvas_line.create_line(*coords.tolist(), fill="#bababa", tags="line")
 
-                self.canvas_line.create_line(x1, y1, x2, y2, fill="#bababa", tags="line")
+        self.plot_offset = start * 2
+        self.plot_span = len(y_values) * 2
+        self.plot_step = step
 
     def update_navigation_buttons(self):
-        with open(self.file_path, 'rb') as file:
-            file.seek(self.current_offset + self.num_columns * 16 * 2)
-            data = file.read(self.num_columns * 16 * 2)
+        if not self.image or self.canvas_line is None:
+            return
 
+        page_size = self.num_columns * 16 * 2
         self.button_previous["state"] = tk.NORMAL if self.current_offset > 0 else tk.DISABLED
-        self.button_next["state"] = tk.NORMAL if data else tk.DISABLED
-
-    def highlight_clicked_value(self, value_index):
-        content = self.text_widget.get(1.0, tk.END)
-        lines = content.split("\n")
-
-        total_columns_text_view = len(lines[0].split())
-
-        row_index = value_index // total_columns_text_view
-        column_index = value_index % total_columns_text_view
-
-        if 0 <= row_index < len(lines):
-            current_value = lines[row_index].strip().split()[column_index]
+        self.button_next["state"] = tk.NORMAL if self.current_offset + page_size < len(self.image) else tk.DISABLED
 
-            start_index = f"{row_index + 1}.{column_index * 6}"
-            end_index = f"{row_index + 1}.{column_index * 6 + 5}"
+    def highlight_clicked_value(self, offset):
+        start_index, end_index = self.cell_index.offset_to_index(offset)
 
-            if f"{start_index}-{end_index}" not in self.text_widget.tag_ranges("highlight"):
-                prev_start_index = f"{row_index + 1}.{column_index * 6}"
-                prev_end_index = f"{row_index + 1}.{column_index * 6 + 5}"
-
-                prev_highlighted_value = self.text_widget.get(prev_start_index, prev_end_index).strip()
-
-                if prev_highlighted_value != current_value:
-                    self.text_widget.tag_remove("highlight", "1.0", tk.END)
-
-                self.text_widget.tag_add("highlight", start_index, end_index)
-                self.text_widget.tag_configure("highlight", background="gold2")
-
-                self.text_widget.see(start_index)
-
-    def reset_highlight(self):
-        self.canvas_line.delete("clicked_line")
         self.text_widget.tag_remove("highlight", "1.0", tk.END)
-        self.update_highlight()
-
-    def update_highlight(self):
-        total_columns = self.num_columns * 16
-        value_index = self.current_offset // 2
-        self.highlight_clicked_value(value_index)
+        self.text_widget.tag_add("highlight", start_index, end_index)
+        self.text_widget.see(start_index)
 
     def start_auto_skip_previous(self, event):
         self.auto_skip_start_time_previous = time.time()
@@ -1443,17 +5094,13 @@ class LinOLS:
     def check_auto_skip(self):
         elapsed_time = time.time() - self.auto_skip_start_time
         if elapsed_time >= 0.5 and self.auto_skip_running:
-            with open(self.file_path, 'rb') as file:
-                file_size = os.path.getsize(self.file_path)
-                next_offset = self.current_offset + self.num_columns * 16 * 2
-                while next_offset >= file_size:
-                    next_offset -= self.num_columns * 16 * 2
-                    self.auto_skip_running = False
-                    break
+            next_offset = self.current_offset + self.num_columns * 16 * 2
+            if next_offset >= len(self.image):
+                next_offset -= self.num_columns * 16 * 2
+                self.auto_skip_running = False
 
-                self.current_offset = next_offset
-                self.display_line_plot()
-                self.update_navigation_buttons()
+            self.current_offset = next_offset
+            self.scheduler.mark_dirty('plot', 'buttons')
 
             if self.auto_skip_running:
                 self.check_auto_skip_id = self.root.after(self.auto_skip_interval, self.check_auto_skip)
@@ -1462,23 +5109,15 @@ class LinOLS:
                 self.check_auto_skip_id = self.root.after(20, self.check_auto_skip)
 
     def copy_values(self, event):
-        selected_text = self.text_widget.selection_get()
-        if not selected_text:
+        if not self.image or not self.text_widget.tag_ranges("sel"):
             messagebox.showwarning("Nothing Selected", "No values are selected to copy.")
             return
 
-        selected_values = selected_text.strip().split()
-
-        num_rows = len(selected_values) // self.num_columns
-        if len(selected_values) % self.num_columns != 0:
-            num_rows += 1
-
-        copied_content = ""
-        for i in range(num_rows):
-            start_index = i * self.num_columns
-            end_index = min((i + 1) * self.num_columns, len(selected_values))
-            row_values = selected_values[start_index:end_index]
-            copied_content += "\t".join(row_values) + "\n"
+        values = self.read_selected_values()
+        cells = self.cell_index.format_values(values)
+        values_per_row = self.cell_index.values_per_row
+        copied_content = ''.join("\t".join(cells[i:i + values_per_row]) + "\n" for i in range(0, len(cells), values_per_row))
+        self.copied_source = (copied_content, self.selected_range()[0], values_per_row, self.cell_index.value_type)
 
         try:
             self.root.clipboard_clear()
@@ -1486,159 +5125,133 @@ class LinOLS:
         except Exception as e:
             messagebox.showerror("Copy Error", f"An error occurred while copying: {e}")
 
-    def paste_values(self, event):
-        selected_text = self.root.clipboard_get()
-        cleaned_values = selected_text.strip().split()
-
-        cursor_index = self.text_widget.index(tk.INSERT)
-        cursor_row, cursor_col = map(int, cursor_index.split('.'))
+    def selected_range(self):
+        start = self.cell_index.index_to_offset(self.text_widget.index("sel.first"))
+        end = self.cell_index.index_to_offset(self.text_widget.index("sel.last - 1c")) + self.cell_index.value_size
+        return start, max(start, end)
 
-        current_content = self.text_widget.get(1.0, tk.END)
-        current_lines = current_content.strip().split('\n')
+    def read_selected_values(self):
+        start, end = self.selected_range()
+        return self.image.read(start, (end - start) // self.cell_index.value_size, self.cell_index.value_type)
 
-        row_index = cursor_row - 1
-        col_index = cursor_col // 6
+    def paste_offset(self):
+        if self.text_widget.tag_ranges("sel"):
+            return self.selected_range()[0]
+        return self.cell_index.index_to_offset(self.text_widget.index(tk.INSERT))
 
-        differences = []
+    def parse_values(self, text):
+        tokens = text.split()
+        base = self.cell_index.base
+        if re.search(r'[a-fA-FxX]', text):
+            base = 16
 
-        for value in cleaned_values:
-            if row_index >= len(current_lines):
-                break
+        values = np.fromiter((int(token, base) for token in tokens), dtype=np.int64, count=len(tokens))
+        limit = np.iinfo(self.cell_index.value_type).max
+        if len(values) and (values.min() < 0 or values.max() > limit):
+            raise ValueError(f"Values must be between 0 and {limit}.")
+        return values
 
-            current_line = current_lines[row_index]
-            values = current_line.split()
+    def paste_values(self, event):
+        if not self.image:
+            return
 
-            if col_index >= len(values):
-                row_index += 1
-                col_index = 0
-                if row_index >= len(current_lines):
-                    break
-                current_line = current_lines[row_index]
-                values = current_line.split()
+        try:
+            values = self.parse_values(self.root.clipboard_get())
+        except tk.TclError:
+            messagebox.showerror("Error", "Clipboard operation failed. Please try again.")
+            return
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid clipboard data: {e}")
+            return
 
-            if values[col_index] != value:
-                differences.append((values[col_index], value, row_index, col_index))
+        self.image.write(self.paste_offset(), values, self.cell_index.value_type)
 
-            values[col_index] = value
+    def copy_binary(self):
+        if not self.image or not self.text_widget.tag_ranges("sel"):
+            messagebox.showwarning("Nothing Selected", "No values are selected to copy.")
+            return
 
-            current_lines[row_index] = ' '.join(values)
+        file_path = filedialog.asksaveasfilename(defaultextension=".bin", filetypes=[("Binary Files", "*.bin")])
+        if file_path:
+            start, end = self.selected_range()
+            self.image.data[start:end].tofile(file_path)
 
-            col_index += 1
+    def paste_binary(self):
+        if not self.image:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
 
-        updated_content = '\n'.join(current_lines)
-        self.text_widget.delete(1.0, tk.END)
-        self.text_widget.insert(tk.END, updated_content)
+        file_path = filedialog.askopenfilename(filetypes=[("Binary Files", "*.bin"), ("All Files", "**")])
+        if file_path:
+            self.image.write(self.paste_offset(), np.fromfile(file_path, dtype=np.uint8))
 
-        self.check_value_changes(differences)
+    def open_script_console(self):
+        if not self.image:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
+        ScriptConsole(self.root, self.run_script)
 
-    def navigate_2d(self, event):
-        if self.display_mode in ['hex16', 'dec16_lh', 'dec16_hl']:
-            total_columns = self.num_columns * 16
+    def run_script_file(self):
+        if not self.image:
+            messagebox.showerror('Error', 'File is not opened!')
+            return
 
-            if event.keysym == 'Left':
-                self.current_offset = max(0, self.current_offset - 2)
-            elif event.keysym == 'Right':
-                self.current_offset = min((self.total_rows * total_columns * 2) - 2, self.current_offset + 2)
+        file_path = filedialog.askopenfilename(filetypes=[("Python Scripts", "*.py"), ("All Files", "**")])
+        if file_path:
+            with open(file_path, 'r') as script_file:
+                ScriptConsole(self.root, self.run_script).run(script_file.read(), file_path)
+
+    def run_script(self, source, filename='<console>'):
+        document = self.workspace.active
+        if document is None:
+            return "No file is open.\n"
+
+        if document.script is None:
+            document.script = ScriptSession(document)
+        selection = self.selected_range() if self.text_widget.tag_ranges("sel") else None
+        start_time = time.perf_counter()
+        output, changed = document.script.run(source, filename, selection)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        return output + f"[{os.path.basename(filename)}: {changed} bytes changed in {elapsed:.1f} ms]\n"
 
+    def navigate_2d(self, event):
+        if event.keysym == 'Left':
+            self.navigate_2d_left(event)
+        elif event.keysym == 'Right':
+            self.navigate_2d_right(event)
+
+    def jump_to_offset(self, offset):
+        if self.image:
+            self.current_offset = offset
             self.handle_navigation_and_highlight()
 
     def handle_navigation_and_highlight(self):
-        total_columns = self.num_columns * 16
-        total_bytes_per_row = total_columns * 2
-
-        line_height = self.notebook.winfo_height()
-        x_position = 0
-
-        self.canvas_line.coords(self.clickable_line, x_position, 0, x_position, line_height)
-
-        with open(self.file_path, 'rb') as file:
-            file.seek(self.current_offset)
-            data = file.read(2)
-
-            if len(data) < 2:
-                return
-
-            clicked_value = struct.unpack('<H', data)[0]
-
-        try:
-            content = self.text_widget.get(1.0, tk.END)
-            lines = content.split("\n")
-            row_index = self.current_offset // (total_columns * 2)
-            col_index = (self.current_offset % (total_columns * 2)) // 2
-            clicked_value = int(lines[row_index].split()[col_index], 10)
-        except (IndexError, ValueError):
-            pass
-
-        self.value_label.config(text=f"Value: {clicked_value:05}")
-
-        line_width = 1
-        self.clicked_line = self.canvas_line.create_line(
-            x_position, 0, x_position, line_height, fill="black", width=line_width, tags="clicked_line"
-        )
-
-        self.highlight_clicked_value(self.current_offset // 2)
-
-        self.display_line_plot()
-        self.update_navigation_buttons()
-        self.reset_highlight()
+        if self.image:
+            self.cursor.jump(self.current_offset - self.current_offset % self.cell_index.value_size)
 
     def skip_to_percentage(self, percentage):
+        if not self.image:
+            return
+
         if percentage == 100:
-            with open(self.file_path, 'rb') as file:
-                file_size = os.path.getsize(self.file_path)
-                self.current_offset = file_size - (self.num_columns * 16 * 2)
+            self.current_offset = max(0, len(self.image) - (self.num_columns * 16 * 2))
         else:
-            with open(self.file_path, 'rb') as file:
-                file_size = os.path.getsize(self.file_path)
-                self.current_offset = int(file_size * (percentage / 100))
+            self.current_offset = int(len(self.image) * (percentage / 100))
 
         self.handle_navigation_and_highlight()
-        self.update_navigation_buttons()
 
     def load_and_update(self):
         if self.is_unsaved_changes():
-            temp_file_path = tempfile.mktemp(suffix=".bin", prefix="LinOLS_temp_")
-            with open(temp_file_path, 'wb') as temp_file:
-                temp_file.write(
-                    b''.join([struct.pack('<H', int(value)) for value in self.text_widget.get(1.0, tk.END).split()]))
-
-            self.file_path = temp_file_path
             self.update_2d_mode()
-            self.navigate_2d_right(None)
-            self.navigate_2d_left(None)
-            self.update_navigation_buttons()
 
         else:
             file_path = filedialog.askopenfilename(filetypes=[("Binary Files", "*.bin")])
-            if file_path:
-                self.file_path = file_path
+            if file_path and self.open_document(file_path):
                 self.update_2d_mode()
-                self.navigate_2d_right(None)
-                self.navigate_2d_left(None)
-                self.update_navigation_buttons()
 
     def update_2d_mode(self):
-        total_columns = self.num_columns * 16
-
-        with open(self.file_path, 'rb') as file:
-            file.seek(self.current_offset)
-            data = file.read(total_columns * 2)
-
-        if data:
-            numbers = struct.unpack('<' + 'H' * (len(data) // 2), data)
-
-            self.canvas_line.delete("line")
-            x_values = np.arange(len(numbers))
-            y_values = np.array(numbers)
-            y_scaled = self.notebook.winfo_height() * (y_values / max(y_values))
-
-            for i in range(len(x_values) - 1):
-                x1 = i * (self.notebook.winfo_width() / len(x_values))
-                y1 = self.notebook.winfo_height() - y_scaled[i]
-                x2 = (i + 1) * (self.notebook.winfo_width() / len(x_values))
-                y2 = self.notebook.winfo_height() - y_scaled[i + 1]
-
-                self.canvas_line.create_line(x1, y1, x2, y2, fill="#bababa", tags="line")
+        self.scheduler.mark_dirty('plot')
+        self.handle_navigation_and_highlight()
 
     def apply_theme(self, theme):
         self.root.config(bg=theme['bg'])
@@ -1656,25 +5269,29 @@ class LinOLS:
                 widget.config(bg=theme['canvas_bg'])
 
     def undo(self):
-        self.text_widget.edit_undo()
-        self.check_value_changes(None)
+        if self.image:
+            self.image.undo()
 
     def redo(self):
-        self.text_widget.edit_redo()
-        self.check_value_changes(None)
+        if self.image:
+            self.image.redo()
 
     def sync_2d_to_text(self):
-        cursor_pos = self.text_widget.index(tk.INSERT)
-
-        row, col = map(int, cursor_pos.split('.'))
-
-        total_columns_text_view = self.num_columns
-        current_offset = ((row - 1) * total_columns_text_view + (col // 6)) * 2
-
-        self.current_offset = current_offset
+        self.current_offset = self.cell_index.index_to_offset(self.text_widget.index(tk.INSERT))
         self.handle_navigation_and_highlight()
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ['patch']:
+        sys.exit(TunePatch.main(sys.argv[2:]))
+    if sys.argv[1:2] == ['replay']:
+        sys.exit(TraceReplayer.main(sys.argv[2:]))
+    if sys.argv[1:2] == ['serve']:
+        sys.exit(EngineServer.main(sys.argv[2:]))
+
+    started = time.perf_counter()
     root = tk.Tk(className='LinOLS')
     LinOLS = LinOLS(root)
+    if sys.argv[1:2] == ['--record'] and len(sys.argv) > 2:
+        LinOLS.start_recording(sys.argv[2])
+    root.after_idle(LinOLS.report_startup, started)
     root.mainloop()
\ No newline at end of file
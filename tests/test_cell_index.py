@@ -0,0 +1,54 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class CellIndexTest(unittest.TestCase):
+    def test_sixteen_bit_mapping(self):
+        index = linols.CellIndex('dec16_lh', 15)
+        self.assertEqual(index.values_per_row, 15)
+        self.assertEqual(index.offset_to_cell(0), (0, 0))
+        self.assertEqual(index.offset_to_cell(31), (1, 0))
+        self.assertEqual(index.offset_to_cell(34), (1, 2))
+        self.assertEqual(index.cell_to_offset(1, 2), 34)
+        self.assertEqual(index.cell_to_index(1, 2), ('2.12', '2.17'))
+        self.assertEqual(index.index_to_offset('2.14'), 34)
+        self.assertEqual(index.index_to_cell('1.500'), (0, 14))
+        self.assertEqual(index.row_count(60), 2)
+        self.assertEqual(index.row_count(61), 2)
+        self.assertEqual(index.row_count(62), 3)
+
+    def test_eight_bit_mapping(self):
+        index = linols.CellIndex('hex8', 15)
+        self.assertEqual(index.values_per_row, 30)
+        self.assertEqual(index.offset_to_cell(31), (1, 1))
+        self.assertEqual(index.cell_to_offset(1, 1), 31)
+        self.assertEqual(index.cell_to_index(1, 1), ('2.3', '2.5'))
+        self.assertEqual(index.index_to_offset('2.4'), 31)
+        self.assertEqual(index.row_count(61), 3)
+
+    def test_reconfigure_switches_width(self):
+        index = linols.CellIndex('dec8', 4)
+        self.assertEqual((index.cell_width, index.values_per_row), (3, 8))
+        index.configure('hex16', 4)
+        self.assertEqual((index.cell_width, index.values_per_row), (4, 4))
+        self.assertEqual(index.cell_to_offset(2, 3), 22)
+
+    def test_format_and_parse_round_trip(self):
+        for mode, values in (('hex8', [0, 10, 255]), ('dec8', [0, 10, 255]), ('hex16', [0, 4660, 65535]),
+                             ('dec16_lh', [0, 42, 65535]), ('dec16_hl', [0, 42, 65535])):
+            index = linols.CellIndex(mode, 15)
+            cells = index.format_values(np.array(values, dtype=index.value_type))
+            self.assertTrue(all(len(cell) == index.cell_width for cell in cells))
+            self.assertEqual([index.parse_value(cell) for cell in cells], values)
+        self.assertEqual(linols.CellIndex('hex16', 15).format_values(np.array([4660], dtype='<u2')), ['1234'])
+        self.assertEqual(linols.CellIndex('dec8', 15).format_values(np.array([7], dtype='u1')), ['007'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class EditJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.home = linols.LINOLS_HOME
+        linols.LINOLS_HOME = os.path.join(self.directory.name, 'home')
+        self.addCleanup(setattr, linols, 'LINOLS_HOME', self.home)
+        self.path = os.path.join(self.directory.name, 'image.bin')
+        np.random.default_rng(7).integers(0, 256, 65536, dtype=np.uint8).tofile(self.path)
+
+    def open(self):
+        document = linols.Document(self.path)
+        document.image.listeners.append(lambda offset, length: document.journal.record(offset, length))
+        return document
+
+    def recovered(self, journal_path):
+        file_path, patch = linols.EditJournal.recover(journal_path)
+        self.assertEqual(file_path, os.path.abspath(self.path))
+        data = np.fromfile(self.path, dtype=np.uint8)
+        for offset, values in patch.runs():
+            data[offset:offset + len(values)] = values
+        return data
+
+    def test_replays_unsaved_edits_after_crash(self):
+        document = self.open()
+        document.image.write(100, [1, 2, 3])
+        document.image.write(40000, np.arange(50, dtype=np.uint8))
+        document.image.write(101, [9])
+        document.journal.flush()
+
+        self.assertEqual(linols.EditJournal.pending(), [document.journal.path])
+        self.assertTrue(np.array_equal(self.recovered(document.journal.path), document.image.data))
+
+    def test_rejects_journal_for_modified_file(self):
+        document = self.open()
+        document.image.write(10, [1])
+        document.journal.flush()
+        data = np.fromfile(self.path, dtype=np.uint8)
+        data[0] ^= 0xFF
+        data.tofile(self.path)
+        with self.assertRaises(ValueError):
+            linols.EditJournal.recover(document.journal.path)
+
+    def test_existing_journal_is_kept(self):
+        first = self.open()
+        first.image.write(10, [1, 2])
+        first.journal.flush()
+        first_edits = first.image.data.copy()
+
+        second = self.open()
+        second.image.write(5000, [3])
+        second.journal.flush()
+
+        pending = linols.EditJournal.pending()
+        self.assertEqual(len(pending), 2)
+        recovered = [self.recovered(path) for path in pending]
+        self.assertTrue(any(np.array_equal(data, first_edits) for data in recovered))
+        self.assertTrue(any(np.array_equal(data, second.image.data) for data in recovered))
+
+    def test_reset_removes_journal(self):
+        document = self.open()
+        document.image.write(10, [1])
+        document.journal.flush()
+        document.image.save()
+        document.journal.reset()
+        self.assertEqual(linols.EditJournal.pending(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
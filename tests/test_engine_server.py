@@ -0,0 +1,62 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class EngineServerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.socket_path = os.path.join(self.directory.name, 'engine.sock')
+        self.server = linols.EngineServer(self.socket_path, workers=2)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.01)
+
+    def connect(self):
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.settimeout(5)
+        client.connect(self.socket_path)
+        self.addCleanup(client.close)
+        return client, client.makefile('rwb')
+
+    def request(self, stream, request_id, method, params=None):
+        stream.write(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': method, 'params': params or {}}).encode() + b'\n')
+        stream.flush()
+        return json.loads(stream.readline())
+
+    def test_idle_connections_do_not_starve_workers(self):
+        clients = [self.connect() for _ in range(3)]
+        for request_id, (client, stream) in enumerate(clients):
+            response = self.request(stream, request_id, 'status')
+            self.assertEqual(response['id'], request_id)
+            self.assertEqual(response['result']['documents'], [])
+
+    def test_half_closed_client_gets_every_response(self):
+        for _ in range(30):
+            client, stream = self.connect()
+            for request_id in range(4):
+                stream.write(json.dumps({'jsonrpc': '2.0', 'id': request_id, 'method': 'status'}).encode() + b'\n')
+            stream.flush()
+            client.shutdown(socket.SHUT_WR)
+            responses = [json.loads(line) for line in stream]
+            self.assertEqual(sorted(response['id'] for response in responses), [0, 1, 2, 3])
+
+    def test_connection_serves_several_requests(self):
+        client, stream = self.connect()
+        self.assertEqual(self.request(stream, 1, 'status')['id'], 1)
+        self.assertEqual(self.request(stream, 2, 'missing')['error']['code'], -32601)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+BLOCK = linols.FingerprintIndex.BLOCK_SIZE
+
+
+class FingerprintIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.index = linols.FingerprintIndex(os.path.join(self.directory.name, 'db', 'fingerprints.sqlite'))
+        self.addCleanup(self.index.close)
+
+        rng = np.random.default_rng(5)
+        self.images = {}
+        for name, identifier in (('first.bin', b'0261S0A123'), ('second.bin', b'1037393216')):
+            data = rng.integers(0, 256, 8 * BLOCK, dtype=np.uint8)
+            data[99:101 + len(identifier)] = np.frombuffer(b'\0' + identifier + b'\0', dtype=np.uint8)
+            path = os.path.join(self.directory.name, name)
+            data.tofile(path)
+            self.images[name] = (os.path.abspath(path), data)
+        self.assertEqual(self.index.index_directory(self.directory.name), (2, 0))
+
+    def test_identify_ranks_the_closest_image_first(self):
+        path, data = self.images['first.bin']
+        modified = data.copy()
+        modified[3 * BLOCK + 7] ^= 0xFF
+        modified[5 * BLOCK + 7] ^= 0xFF
+        matches = self.index.identify(modified)
+        self.assertEqual(len(matches), 1)
+        self.assertEqual(matches[0]['path'], path)
+        self.assertEqual(matches[0]['shared_blocks'], 6)
+        self.assertAlmostEqual(matches[0]['score'], 6 / 8)
+        self.assertEqual(matches[0]['identifiers'], ['0261S0A123'])
+
+    def test_identifiers_match_without_shared_blocks(self):
+        path, _ = self.images['second.bin']
+        data = np.zeros(2 * BLOCK, dtype=np.uint8)
+        data[10:20] = np.frombuffer(b'1037393216', dtype=np.uint8)
+        matches = self.index.identify(data)
+        self.assertEqual([(match['path'], match['shared_blocks'], match['identifiers']) for match in matches], [(path, 0, ['1037393216'])])
+
+    def test_constant_blocks_are_not_hashed(self):
+        data = np.concatenate([np.zeros(BLOCK, dtype=np.uint8), np.full(BLOCK, 0xFF, dtype=np.uint8), self.images['first.bin'][1][:BLOCK]])
+        self.assertEqual(len(linols.FingerprintIndex.block_hashes(data)), 1)
+
+    def test_reindex_skips_unchanged_and_forgets_removed_files(self):
+        self.assertEqual(self.index.index_directory(self.directory.name), (0, 2))
+        os.remove(self.images['second.bin'][0])
+        self.assertEqual(self.index.index_directory(self.directory.name), (0, 1))
+        self.assertEqual([match['path'] for match in self.index.identify(self.images['second.bin'][1])], [])
+
+    def test_maps_round_trip(self):
+        path, _ = self.images['first.bin']
+        self.index.store_maps(path, {'fuel': linols.MapDefinition('fuel', 0x100, 4, 8, '>u2')})
+        maps = self.index.load_maps(path)
+        self.assertEqual(list(maps), ['fuel'])
+        self.assertEqual((maps['fuel'].offset, maps['fuel'].rows, maps['fuel'].columns, maps['fuel'].dtype), (0x100, 4, 8, np.dtype('>u2')))
+        with self.assertRaises(ValueError):
+            self.index.store_maps(os.path.join(self.directory.name, 'missing.bin'), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class HitTraceTest(unittest.TestCase):
+    def test_bins_to_nearest_breakpoint(self):
+        trace = linols.HitTrace([0, 10, 20], [0, 100])
+        trace.add(np.array([1.0, 9.0, 19.0, 50.0]), np.array([10.0, 90.0, 60.0, -5.0]), np.array([1.0, 2.0, 3.0, 4.0]))
+        self.assertEqual(trace.counts.tolist(), [[1, 0, 1], [0, 1, 1]])
+        self.assertEqual(trace.samples, 4)
+        self.assertEqual(trace.mean()[1, 2], 3.0)
+
+    def test_physical_samples_against_converted_axes(self):
+        rpm = linols.UnitConversion.parse("raw * 0.25 [rpm]")
+        load = linols.UnitConversion.parse("raw / 100 - 10 [%]")
+        x_raw = np.array([4000, 8000, 12000, 16000])
+        y_raw = np.array([1000, 3000, 5000])
+
+        trace = linols.HitTrace(x_raw, y_raw, rpm, load)
+        self.assertEqual(trace.x_axis.tolist(), [1000, 2000, 3000, 4000])
+        self.assertEqual(trace.y_axis.tolist(), [0, 20, 40])
+
+        trace.add(np.array([1050.0, 2900.0, 3950.0]), np.array([19.0, 41.0, 1.0]))
+        self.assertEqual(np.argwhere(trace.counts).tolist(), [[0, 3], [1, 0], [2, 2]])
+
+
+if __name__ == '__main__':
+    unittest.main()
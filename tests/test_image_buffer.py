@@ -0,0 +1,42 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class AtomicSaveTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'image.bin')
+        np.arange(256, dtype=np.uint8).tofile(self.path)
+        self.image = linols.ImageBuffer(self.path)
+        self.image.write(0, [1, 2, 3])
+
+    def mode(self, path):
+        return stat.S_IMODE(os.stat(path).st_mode)
+
+    def test_keeps_mode_of_replaced_file(self):
+        os.chmod(self.path, 0o640)
+        self.image.save(atomic=True)
+        self.assertEqual(self.mode(self.path), 0o640)
+        self.assertEqual(np.fromfile(self.path, dtype=np.uint8)[:3].tolist(), [1, 2, 3])
+
+    def test_new_file_follows_umask(self):
+        umask = os.umask(0o022)
+        try:
+            target = os.path.join(self.directory.name, 'copy.bin')
+            self.image.save(target, atomic=True)
+        finally:
+            os.umask(umask)
+        self.assertEqual(self.mode(target), 0o644)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class LayoutAnalyzerTest(unittest.TestCase):
+    def setUp(self):
+        rows, columns = np.mgrid[0:20, 0:16]
+        self.map = 800 + 40 * rows + 25 * columns + 0.8 * rows * columns
+
+    def best(self, data):
+        candidates = linols.LayoutAnalyzer.analyze(data)
+        self.assertTrue(candidates)
+        return candidates[0]['mode'], candidates[0]['columns']
+
+    def test_little_endian_words(self):
+        self.assertEqual(self.best(self.map.astype('<u2').view(np.uint8).ravel()), ('dec16_lh', 16))
+
+    def test_big_endian_words(self):
+        self.assertEqual(self.best(self.map.astype('>u2').view(np.uint8).ravel()), ('dec16_hl', 16))
+
+    def test_bytes(self):
+        rows, columns = np.mgrid[0:12, 0:10]
+        data = (9 * rows + 5 * columns).astype(np.uint8).ravel()
+        self.assertEqual(self.best(data)[0], 'dec8')
+
+    def test_flat_data_has_no_stride(self):
+        self.assertEqual(linols.LayoutAnalyzer.analyze(np.zeros(100, dtype=np.uint8)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class ResampleTest(unittest.TestCase):
+    def test_rejects_default_axes(self):
+        values = np.arange(16, dtype=np.float64).reshape(4, 4) * 100
+        with self.assertRaises(ValueError):
+            linols.MapMath.resample(values, [0] * 4, [0] * 4, [0] * 4, [0] * 4)
+
+    def test_rejects_repeated_breakpoints(self):
+        values = np.ones((2, 3))
+        with self.assertRaises(ValueError):
+            linols.MapMath.resample(values, [0, 10, 10], [0, 1], [0, 5, 10], [0, 1])
+
+    def test_identity_and_reversed_axes(self):
+        values = np.arange(16, dtype=np.float64).reshape(4, 4) * 100
+        axis = [0, 10, 20, 30]
+        self.assertTrue(np.array_equal(linols.MapMath.resample(values, axis, axis, axis, axis), values))
+        self.assertTrue(np.array_equal(linols.MapMath.resample(values, axis, axis, axis, axis[::-1]), values[::-1]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import types
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class MirrorTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        data = rng.integers(0, 256, 1 << 20, dtype=np.uint8)
+        self.map = rng.integers(0, 4000, (16, 16)).astype('<u2').view(np.uint8).ravel()
+        self.copies = [12345, 400003, 900001]
+        for offset in self.copies:
+            data[offset:offset + len(self.map)] = self.map
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'image.bin')
+        data.tofile(self.path)
+
+        self.document = linols.Document(self.path)
+        self.document.mirrors = linols.MirrorIndex(self.document.image.data.copy())
+        self.document.mirrors.data = self.document.image.data
+        self.app = types.SimpleNamespace(propagating=False, link_mirrors=types.SimpleNamespace(get=lambda: True))
+        self.document.image.write_hooks.append(
+            lambda offset, new: linols.LinOLS.propagate_mirrors(self.app, self.document, offset, new))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_detects_unaligned_copies(self):
+        self.assertEqual(self.document.mirrors.groups, [(self.copies, len(self.map))])
+
+    def test_write_updates_all_copies_in_one_undo_entry(self):
+        image = self.document.image
+        with image.transaction():
+            image.write(self.copies[0] + 10, np.array([7, 7, 7], dtype=np.uint8))
+            image.write(self.copies[1] + 100, np.array([9], dtype=np.uint8))
+
+        for offset in self.copies:
+            self.assertEqual(image.data[offset + 10:offset + 13].tolist(), [7, 7, 7])
+            self.assertEqual(image.data[offset + 100], 9)
+        self.assertEqual(len(image.undo_stack), 1)
+
+        image.undo()
+        for offset in self.copies:
+            self.assertTrue(np.array_equal(image.data[offset:offset + len(self.map)], self.map))
+
+    def test_links_across_a_differing_byte(self):
+        data = self.document.image.data.copy()
+        data[self.copies[1] + 40] ^= 0xFF
+        mirrors = linols.MirrorIndex(data)
+        self.assertEqual(mirrors.groups, [(self.copies, len(self.map))])
+        linked = sorted(target for target, first, last in mirrors.linked_writes(self.copies[0] + 10, 1))
+        self.assertEqual(linked, [self.copies[1] + 10, self.copies[2] + 10])
+
+    def test_unlinked_write_changes_one_copy(self):
+        self.app.link_mirrors = types.SimpleNamespace(get=lambda: False)
+        self.document.image.write(self.copies[0], np.array([1], dtype=np.uint8))
+        self.assertEqual(self.document.image.data[self.copies[0]], 1)
+        self.assertEqual(self.document.image.data[self.copies[1]], self.map[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import os
+import sys
+import tempfile
+import unittest
+import tkinter as tk
+from tkinter import filedialog, messagebox, simpledialog
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+APP_CLASS = linols.LinOLS
+
+
+class ReplayTest(unittest.TestCase):
+    def setUp(self):
+        try:
+            tk.Tk().destroy()
+        except tk.TclError:
+            self.skipTest("needs an X display")
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.home = linols.LINOLS_HOME
+        linols.LINOLS_HOME = os.path.join(self.directory.name, 'home')
+        self.addCleanup(setattr, linols, 'LINOLS_HOME', self.home)
+        self.addCleanup(setattr, linols, 'LinOLS', APP_CLASS)
+
+        self.dialogs = {(module, name): getattr(module, name) for module, names in linols.EventTrace.DIALOGS for name in names}
+        self.addCleanup(lambda: [setattr(module, name, original) for (module, name), original in self.dialogs.items()])
+
+        self.input_path = os.path.join(self.directory.name, 'input.bin')
+        self.output_path = os.path.join(self.directory.name, 'output.bin')
+        self.trace_path = os.path.join(self.directory.name, 'trace.jsonl')
+        np.random.default_rng(3).integers(0, 256, 4096, dtype=np.uint8).tofile(self.input_path)
+
+    def start(self):
+        root = tk.Tk(className='LinOLS')
+        app = APP_CLASS(root)
+        linols.LinOLS = app
+        root.update()
+        return root, app
+
+    def generate(self, root, widget, sequence, **options):
+        widget.event_generate(sequence, **options)
+        root.update()
+        root.update_idletasks()
+
+    def type_key(self, root, widget, keysym, state=0):
+        self.generate(root, widget, '<KeyPress>', keysym=keysym, state=state)
+        self.generate(root, widget, '<KeyRelease>', keysym=keysym, state=state)
+
+    def click(self, root, widget, index):
+        x, y, width, height = widget.bbox(index)
+        self.generate(root, widget, '<ButtonPress>', button=1, x=x + 1, y=y + 1)
+        self.generate(root, widget, '<ButtonRelease>', button=1, x=x + 1, y=y + 1)
+
+    def invoke(self, root, menu, label):
+        for index in range(menu.index('end') + 1):
+            if menu.type(index) == 'command' and menu.entrycget(index, 'label') == label:
+                menu.invoke(index)
+                root.update()
+                return
+        self.fail(label)
+
+    def record_session(self):
+        filedialog.askopenfilename = lambda *args, **kwargs: self.input_path
+        filedialog.asksaveasfilename = lambda *args, **kwargs: self.output_path
+        simpledialog.askstring = lambda *args, **kwargs: None
+        for name in ('showinfo', 'showwarning', 'showerror'):
+            setattr(messagebox, name, lambda *args, **kwargs: 'ok')
+
+        root, app = self.start()
+        app.start_recording(self.trace_path)
+        menu_bar = root.nametowidget(root['menu'])
+        file_menu = menu_bar.nametowidget(menu_bar.entrycget('File', 'menu'))
+        text = app.text_widget
+
+        self.invoke(root, file_menu, 'Open')
+        text.focus_force()
+        root.update()
+
+        self.click(root, text, '1.0')
+        for _ in range(app.cell_index.cell_width):
+            self.type_key(root, text, 'Right', state=1)
+        for digit in '00042':
+            self.type_key(root, text, digit)
+
+        root.clipboard_clear()
+        root.clipboard_append('1 2 3')
+        self.click(root, text, '2.0')
+        self.type_key(root, text, 'v', state=4)
+
+        self.invoke(root, file_menu, 'Save As')
+        app.recorder.stop()
+        root.destroy()
+        linols.LinOLS = APP_CLASS
+
+        for (module, name), original in self.dialogs.items():
+            setattr(module, name, original)
+        with open(self.output_path, 'rb') as output_file:
+            return output_file.read()
+
+    def test_replay_reproduces_open_edit_paste_save(self):
+        recorded = self.record_session()
+        original = np.fromfile(self.input_path, dtype='<u2')
+        saved = np.frombuffer(recorded, dtype='<u2')
+        self.assertEqual(saved[0], 42)
+        self.assertEqual(saved[15:18].tolist(), [1, 2, 3])
+        self.assertEqual(saved[1:15].tolist(), original[1:15].tolist())
+        os.remove(self.output_path)
+
+        root, app = self.start()
+        root.clipboard_clear()
+        results = linols.TraceReplayer(root, app, self.trace_path).replay()
+        root.destroy()
+
+        self.assertTrue(results)
+        self.assertFalse([result for result in results if result['ms'] is None])
+        self.assertIn('Open', [result['detail'] for result in results if result['type'] == 'command'])
+        with open(self.output_path, 'rb') as output_file:
+            self.assertEqual(output_file.read(), recorded)
+
+
+if __name__ == '__main__':
+    unittest.main()
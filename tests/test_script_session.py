@@ -0,0 +1,47 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class ScriptSessionTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        path = os.path.join(self.directory.name, 'image.bin')
+        np.zeros(1024, dtype=np.uint8).tofile(path)
+        self.document = linols.Document(path)
+        self.session = linols.ScriptSession(self.document)
+
+    def test_commits_changes_as_one_undo_entry(self):
+        output, changed = self.session.run("u8[10:14] = 7\n")
+        self.assertEqual(changed, 4)
+        self.assertEqual(self.document.image.data[10:14].tolist(), [7] * 4)
+        self.assertEqual(len(self.document.image.undo_stack), 1)
+
+    def test_exit_fails_the_script_without_changes(self):
+        output, changed = self.session.run("u8[0] = 1\nexit()\n")
+        self.assertEqual(changed, 0)
+        self.assertIn("Script failed", output)
+        self.assertEqual(self.document.image.data[0], 0)
+
+    def test_image_is_read_only(self):
+        output, changed = self.session.run("original[0] = 5\n")
+        self.assertIn("Script failed", output)
+        self.assertEqual(self.document.image.original[0], 0)
+        self.assertNotIn('image', self.session.namespace)
+
+    def test_maps_defined_by_failing_script_are_dropped(self):
+        self.session.run("define_map('bad', 0, 2, 2)\nraise ValueError\n")
+        self.assertNotIn('bad', self.document.maps)
+        self.session.run("define_map('good', 0, 2, 2)\n")
+        self.assertIn('good', self.document.maps)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class BlockAtTest(unittest.TestCase):
+    def test_empty_image_has_no_block(self):
+        overview = linols.StructureOverview.compute(np.zeros(0, dtype=np.uint8))
+        self.assertIsNone(overview.block_at(0))
+
+    def test_offset_past_end_uses_last_block(self):
+        data = np.zeros(3 * linols.StructureOverview.BLOCK_SIZE, dtype=np.uint8)
+        overview = linols.StructureOverview.compute(data)
+        self.assertEqual(overview.block_at(len(data) * 2), overview.block_at(len(data) - 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
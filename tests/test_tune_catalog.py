@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class TuneCatalogTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.catalog = linols.TuneCatalog(os.path.join(self.directory.name, 'db', 'catalog.sqlite'))
+        self.addCleanup(self.catalog.close)
+
+    def path(self, name, data=b''):
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'wb') as output_file:
+            output_file.write(data)
+        return path
+
+    def test_record_reports_duplicates_and_keeps_metadata(self):
+        stock_digest, duplicates = self.catalog.record(self.path('stock.bin'), b'stock', 'Audi', 'A4 B8', 'Stock')
+        self.assertEqual(stock_digest, linols.TuneCatalog.digest(b'stock'))
+        self.assertEqual(duplicates, [])
+
+        copy_path = self.path('copy.bin')
+        _, duplicates = self.catalog.record(copy_path, b'stock')
+        self.assertEqual(duplicates, [os.path.abspath(self.path('stock.bin'))])
+
+        tune_path = self.path('stage1.bin')
+        tune_digest, _ = self.catalog.record(tune_path, b'tuned', 'Audi', 'A4 B8', 'Stage 1', parent_digest=stock_digest, stock_digest=stock_digest)
+        self.catalog.record(tune_path, b'tuned more')
+        entry, = self.catalog.search(modification='stage')
+        self.assertEqual(entry['digest'], linols.TuneCatalog.digest(b'tuned more'))
+        self.assertEqual((entry['manufacturer'], entry['model'], entry['parent_digest'], entry['stock_digest']), ('Audi', 'A4 B8', stock_digest, stock_digest))
+        self.assertEqual(entry['size'], len(b'tuned more'))
+        self.assertNotEqual(entry['digest'], tune_digest)
+
+    def test_self_parent_is_dropped(self):
+        digest = linols.TuneCatalog.digest(b'image')
+        self.catalog.record(self.path('image.bin'), b'image', parent_digest=digest)
+        self.assertIsNone(self.catalog.search()[0]['parent_digest'])
+
+    def test_search_filters_and_groups_paths_by_digest(self):
+        stock_digest, _ = self.catalog.record(self.path('stock.bin'), b'stock', 'Audi', 'A4 B8', 'Stock')
+        self.catalog.record(self.path('stock copy.bin'), b'stock', 'Audi', 'A4 B8', 'Stock')
+        self.catalog.record(self.path('golf.bin'), b'golf', 'VW', 'Golf 7', 'Stage 2', stock_digest=stock_digest)
+
+        grouped, = self.catalog.search(vehicle='audi a4')
+        self.assertEqual(sorted(map(os.path.basename, grouped['paths'])), ['stock copy.bin', 'stock.bin'])
+        self.assertEqual([entry['model'] for entry in self.catalog.search(vehicle='golf')], ['Golf 7'])
+        self.assertEqual(len(self.catalog.search(digest=stock_digest[:8].upper())), 2)
+        self.assertEqual(self.catalog.search(vehicle='bmw'), [])
+        self.assertEqual(len(self.catalog.search(limit=1)), 1)
+
+    def test_prune_removes_missing_files_and_orphan_images(self):
+        kept = self.path('kept.bin')
+        removed = self.path('removed.bin')
+        self.catalog.record(kept, b'kept')
+        self.catalog.record(removed, b'removed')
+        os.remove(removed)
+        self.catalog.prune()
+        self.assertEqual([entry['paths'] for entry in self.catalog.search()], [[os.path.abspath(kept)]])
+        self.assertEqual(self.catalog.connection.execute("SELECT COUNT(*) FROM images").fetchone(), (1,))
+
+
+if __name__ == '__main__':
+    unittest.main()
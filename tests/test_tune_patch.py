@@ -0,0 +1,66 @@
+import io
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class TunePatchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        rng = np.random.default_rng(5)
+        self.stock = rng.integers(0, 256, 8192, dtype=np.uint8)
+        self.modified = self.stock.copy()
+        self.modified[100:110] += 1
+        self.modified[5000] ^= 0xFF
+        self.modified[5004] ^= 0x0F
+        self.patch_path = os.path.join(self.directory.name, 'tune.lpatch')
+        linols.TunePatch.create(self.stock, self.modified).save(self.patch_path)
+
+    def test_round_trip(self):
+        patch = linols.TunePatch.load(self.patch_path)
+        self.assertEqual(patch.offsets.tolist(), [100, 5000])
+        self.assertEqual(patch.changed_bytes, 12)
+        self.assertTrue(np.array_equal(patch.apply(self.stock), self.modified))
+        with self.assertRaises(ValueError):
+            patch.apply(self.modified)
+
+    def test_corrupt_files_are_rejected(self):
+        with open(self.patch_path, 'rb') as patch_file:
+            data = patch_file.read()
+        for corrupt in (data[:20], data[:-5], data[:60] + bytes(len(data) - 60), b'LOPATCH2' + data[8:]):
+            with self.assertRaises((ValueError, linols.zlib.error)):
+                linols.TunePatch.from_bytes(corrupt)
+
+    def test_cli_reports_corrupt_patch(self):
+        with open(self.patch_path, 'rb') as patch_file:
+            data = patch_file.read()
+        with open(self.patch_path, 'wb') as patch_file:
+            patch_file.write(data[:-5])
+        image_path = os.path.join(self.directory.name, 'stock.bin')
+        self.stock.tofile(image_path)
+
+        errors = io.StringIO()
+        with redirect_stderr(errors):
+            self.assertEqual(linols.TunePatch.main(['apply', self.patch_path, image_path]), 1)
+        self.assertIn("cannot read patch", errors.getvalue())
+
+    def test_cli_writes_patched_copy(self):
+        image_path = os.path.join(self.directory.name, 'stock.bin')
+        self.stock.tofile(image_path)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(linols.TunePatch.main(['apply', self.patch_path, image_path]), 0)
+        patched = np.fromfile(os.path.join(self.directory.name, 'stock_patched.bin'), dtype=np.uint8)
+        self.assertTrue(np.array_equal(patched, self.modified))
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'stock_patched.bin.tmp')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+class UnitConversionTest(unittest.TestCase):
+    def test_shorthand_linear(self):
+        conversion = linols.UnitConversion.parse("raw * 0.75 - 48 [°C]")
+        self.assertEqual((conversion.kind, conversion.parameters, conversion.unit), ('linear', (0.75, -48.0), '°C'))
+        self.assertEqual(conversion.spec, "raw * 0.75 - 48 [°C]")
+        self.assertEqual(conversion.to_physical([64, 100]).tolist(), [0.0, 27.0])
+        self.assertEqual(conversion.to_raw([0.0, 27.2]).tolist(), [64, 100])
+        self.assertEqual(conversion.format([100]), ['27.00'])
+
+        divided = linols.UnitConversion.parse("raw/10")
+        self.assertEqual(divided.unit, "")
+        self.assertAlmostEqual(float(divided.to_physical(125)), 12.5)
+        self.assertEqual(int(divided.to_raw(12.5)), 125)
+
+    def test_raw_means_no_conversion(self):
+        self.assertIsNone(linols.UnitConversion.parse(" raw "))
+        self.assertIsNone(linols.UnitConversion.parse("raw [rpm]"))
+        self.assertIsNone(linols.UnitConversion.parse(""))
+
+    def test_explicit_linear_and_rational(self):
+        linear = linols.UnitConversion.parse("linear: 0.01, 1 [bar]")
+        self.assertEqual(linear.to_raw(linear.to_physical(np.arange(0, 65536, 4097))).tolist(), list(range(0, 65536, 4097)))
+
+        rational = linols.UnitConversion.parse("rational: 1, 0, 1, 100")
+        self.assertEqual(rational.to_physical(100), 0.5)
+        self.assertEqual(int(rational.to_raw(0.5)), 100)
+
+    def test_descending_table(self):
+        conversion = linols.UnitConversion.parse("table: 100=0; 0=100 [%]")
+        self.assertEqual(conversion.unit, '%')
+        self.assertEqual(conversion.to_physical([0, 25, 100, 200]).tolist(), [100.0, 75.0, 0.0, 0.0])
+        self.assertEqual(conversion.to_raw([75.0, 10.0]).tolist(), [25, 90])
+
+    def test_invalid_specs_raise(self):
+        for text in ("linear: 0, 1", "rational: 1, 2, 2, 4", "table: 0=1; 10=1", "table: 0=1; 10", "table: 5=1",
+                     "linear: 1", "polynomial: 1, 2"):
+            with self.subTest(text=text), self.assertRaises(ValueError):
+                linols.UnitConversion.parse(text)
+
+    def test_cache_is_bounded(self):
+        conversion = linols.UnitConversion.parse("raw * 2")
+        for raw in range(conversion.CACHE_SIZE + 5):
+            self.assertEqual(float(conversion.to_physical(raw)), raw * 2)
+        self.assertEqual(len(conversion.cache), conversion.CACHE_SIZE)
+        self.assertIs(conversion.to_physical(conversion.CACHE_SIZE + 4), conversion.to_physical(conversion.CACHE_SIZE + 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
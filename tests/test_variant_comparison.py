@@ -0,0 +1,64 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import LinOLS as linols
+
+
+def image(values):
+    return np.array(values, dtype='<u2').view(np.uint8)
+
+
+class VariantComparisonTest(unittest.TestCase):
+    def setUp(self):
+        stock = np.zeros(20, dtype='<u2')
+        stock[10] = 100
+        first = stock.copy()
+        first[2:4] = [10, 5]
+        first[10] = 90
+        second = stock.copy()
+        second[3] = 7
+        second[15] = 1
+        self.comparison = linols.VariantComparison(image(stock), [image(first), image(second)], ['first', 'second'])
+
+    def test_runs_group_adjacent_changes_across_variants(self):
+        comparison = self.comparison
+        self.assertEqual(comparison.run_offsets.tolist(), [4, 20, 30])
+        self.assertEqual(comparison.run_lengths.tolist(), [2, 1, 1])
+        self.assertEqual(comparison.run_variants.tolist(), [[True, True, False], [True, False, True]])
+        self.assertEqual(comparison.run_max.tolist(), [[10, 10, 0], [7, 0, 1]])
+        self.assertEqual(comparison.run_mean.tolist(), [[7.5, -10.0, 0.0], [7.0, 0.0, 1.0]])
+
+    def test_variant_stats(self):
+        first, second = self.comparison.variant_stats
+        self.assertEqual({key: first[key] for key in ('changed', 'runs', 'increased', 'decreased', 'max_delta')},
+                         {'changed': 3, 'runs': 2, 'increased': 2, 'decreased': 1, 'max_delta': 10})
+        self.assertAlmostEqual(first['mean_delta'], 5 / 3)
+        self.assertEqual(second, {'changed': 2, 'runs': 2, 'increased': 2, 'decreased': 0, 'max_delta': 7, 'mean_delta': 4.0})
+
+    def test_identical_images_have_no_runs(self):
+        stock = image(np.arange(8))
+        comparison = linols.VariantComparison(stock, [stock.copy()], ['same'])
+        self.assertEqual(len(comparison.run_offsets), 0)
+        self.assertEqual(comparison.run_variants.shape, (1, 0))
+        self.assertEqual(comparison.variant_stats[0]['changed'], 0)
+        self.assertEqual(comparison.variant_stats[0]['max_delta'], 0)
+
+    def test_shorter_variant_is_zero_padded(self):
+        stock = image([1, 2, 3, 4])
+        comparison = linols.VariantComparison(stock, [stock[:4].copy()], ['short'])
+        self.assertEqual(comparison.run_offsets.tolist(), [4])
+        self.assertEqual(comparison.run_lengths.tolist(), [2])
+        self.assertEqual(comparison.variant_stats[0]['decreased'], 2)
+
+    def test_eight_bit_dtype(self):
+        comparison = linols.VariantComparison(np.array([1, 2, 3], dtype=np.uint8), [np.array([1, 9, 3], dtype=np.uint8)], ['byte'], dtype='u1')
+        self.assertEqual(comparison.run_offsets.tolist(), [1])
+        self.assertEqual(comparison.run_max.tolist(), [[7]])
+
+
+if __name__ == '__main__':
+    unittest.main()